@@ -0,0 +1,474 @@
+#!/usr/bin/python
+#
+#  Local stand-in for the AMX Administrator, answers the SOAP and
+#  JSON calls of amxStatus, appStatus, appRemove, appAPIStatus and
+#  serviceisation_bpm_app_status with a synthetic enterprise
+#
+#  Point amxctrl.py at it, for the default port
+#
+#	ADMINBASEURL="http://localhost:8180"
+#	AMXADMINURL="http://localhost:8180/amxadministrator"
+#
+#  TIBCO Software France 2026
+#
+#  19/10/2026 1.00  Created
+#  19/10/2026 1.01  Added --capacity
+#  19/10/2026 1.02  Added --expire
+#
+import sys
+import os
+import re
+import getopt
+import base64
+import random
+import time
+import logging
+import threading
+import json
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+try:
+	from urlparse import parse_qs
+except ImportError:
+	from urllib.parse import parse_qs
+from includes import includeFunctions
+from includes import stubServer
+import genBPMLog
+#
+#################################################################
+# Display help message
+#################################################################
+def doHelp():
+	print
+	print(SCRIPTNAME + " version " + VERSION)
+	print
+	print("Local AMX Administrator stand-in with a synthetic enterprise")
+	print
+	print(SCRIPTNAME + " [ options ]")
+	print
+	print("--port -p <port>         Port to listen on, default 8180")
+	print("--applications -a <n>    Number of applications, default 100")
+	print("--folders -f <n>         Number of application folders, default 10")
+	print("--nodes -n <n>           Number of BPM nodes, default 2")
+	print("--unused -u <n>          Number of unused DAAs, default 10")
+	print("--stopped -S <rate>      Fraction of applications not running, default 0")
+	print("--latency -l <dist>      Latency of each call in ms, fixed:<ms>, exp:<mean> or")
+	print("                         lognormal:<median>:<sigma>, default fixed:0")
+	print("--per-kb -k <ms>         Extra latency for each KB of response, default 0")
+	print("--errors -e <rate>       Fraction of calls answered with a SOAP fault, default 0")
+	print("--capacity -C <n>        Calls served at the same time, more wait, default no limit")
+	print("--user -U <user>         Admin user, default root")
+	print("--password -P <password> Admin password, default t")
+	print("--no-csrf -c             No csrfToken in admin.jsp, like a server before 4.3")
+	print("--expire -x <seconds>    Sessions expire this long after the login, default never")
+	print("--seed -s <seed>         Random seed, default 1")
+	print
+
+#################################################################
+# Namespaces of the admin responses
+#################################################################
+SOAPENV="http://schemas.xmlsoap.org/soap/envelope/"
+TYPES="http://types.core.api.admin.amf.tibco.com/xsd"
+NAMESPACES={
+	"t":TYPES,
+	"r":"http://reference.api.admin.amf.tibco.com/xsd",
+	"h":"http://host.amx.api.admin.amf.tibco.com/xsd",
+	"n":"http://node.amx.api.admin.amf.tibco.com/xsd",
+	"a":"http://application.amx.api.admin.amf.tibco.com/xsd",
+	"c":"http://component.amx.api.admin.amf.tibco.com/xsd",
+	"u":"http://ui.application.amx.api.admin.amf.tibco.com/xsd",
+	"d":"http://daa.amx.api.admin.amf.tibco.com/xsd",
+}
+SERVICES={
+	"EnvService":"http://env.amx.api.admin.amf.tibco.com",
+	"HostService":"http://host.amx.api.admin.amf.tibco.com",
+	"NodeService":"http://node.amx.api.admin.amf.tibco.com",
+	"ApplicationService":"http://application.amx.api.admin.amf.tibco.com",
+	"ApplicationUIService":"http://ui.application.amx.api.admin.amf.tibco.com",
+	"DAAService":"http://daa.amx.api.admin.amf.tibco.com",
+}
+XMLNS=" ".join('xmlns:%s="%s"' % (prefix,NAMESPACES[prefix]) for prefix in sorted(NAMESPACES))
+# Components of amx.bpm.app on each node
+BPMCOMPONENTS=["BRM","BPMPresentation","BusinessDataServices","ClientApplicationManagement","DirectoryEngine",
+	"EventCollector","OpenspaceGateway","PageFlow","ProcessManager","UserApplication","WorkManager","WorkPresentation"]
+VERSIONS="3.4.0.024"
+LOGINPAGE="<html><head><title>Login</title></head><body><form action='j_security_check' method='post'></form></body></html>"
+
+#################################################################
+# Build the synthetic enterprise
+#################################################################
+def getEnterprise(applications=100,folders=10,nodes=2,unused=10,stopped=0.0,seed=1):
+	rnd=random.Random(seed)
+	ent={"envs":[{"id":"1","name":"BPMEnvironment","description":"BPM Environment"},{"id":"2","name":"SystemEnvironment","description":"System Environment"}]}
+	ent["hosts"]=[{"id":str(10 + i),"name":"TibcoHost%d" % i,"machine":"bpmserver%d" % i} for i in range(1,max(nodes,1) + 1)]
+	ent["nodes"]=[{"id":"100","name":"SystemNode","env":"2","host":ent["hosts"][0]}]
+	for i in range(1,nodes + 1):
+		ent["nodes"].append({"id":str(100 + i),"name":"BPMNode" if i == 1 else "BPMNode%d" % i,"env":"1","host":ent["hosts"][i - 1]})
+	# Folders are a tree, five in each folder
+	ent["folders"]=[]
+	ent["folderById"]={}
+	for i in range(1,folders + 1):
+		parent=ent["folders"][(i - 1) // 5 - 1] if i > 5 else None
+		folder={"id":str(1000 + i),"name":"Folder%03d" % i,"parent":parent}
+		folder["path"]=(parent["path"] if parent else "") + "/" + folder["name"]
+		ent["folders"].append(folder)
+		ent["folderById"][folder["id"]]=folder
+	ent["apps"]=[
+		{"id":"201","name":"com.tibco.amx.platform","version":VERSIONS,"env":"2","folder":None,"state":"RUNNING"},
+		{"id":"202","name":"amx.bpm.apacheds","version":VERSIONS,"env":"1","folder":None,"state":"RUNNING"},
+		{"id":"203","name":"amx.bpm.app","version":VERSIONS,"env":"1","folder":None,"state":"RUNNING"},
+	]
+	for i in range(applications):
+		folder=ent["folders"][i % (folders + 1) - 1] if folders and i % (folders + 1) else None
+		state="STOPPED" if rnd.random() < stopped else "RUNNING"
+		ent["apps"].append({"id":str(10000 + i),"name":"com.example.bpm.process%05d" % i,"version":"1.0.%d.%d" % (rnd.randrange(10),rnd.randrange(100)),"env":"1","folder":folder,"state":state})
+	ent["appById"]=dict((app["id"],app) for app in ent["apps"])
+	ent["daas"]=[{"id":str(50000 + i),"file":app["name"] + ".daa","used":"true","template":app["name"] + ":" + app["version"]} for i,app in enumerate(ent["apps"][3:])]
+	ent["daas"]+=[{"id":str(90000 + i),"file":"com.example.bpm.old%05d.daa" % i,"used":"false","template":None} for i in range(unused)]
+	return ent
+
+#################################################################
+# XML helpers
+#################################################################
+def getLocalName(tag):
+	return tag.split("}")[-1]
+
+def getElement(tag,value):
+	if value is None:
+		return "<%s/>" % tag
+	return "<%s>%s</%s>" % (tag,escape(str(value)),tag)
+
+def getId(tag,thisId,name):
+	return "<%s>%s%s</%s>" % (tag,getElement("t:id",thisId),getElement("t:name",name),tag)
+
+def getEnvelope(endpoint,operation,content):
+	return '<?xml version="1.0" encoding="UTF-8"?><soapenv:Envelope xmlns:soapenv="%s"><soapenv:Body><ns:%sResponse xmlns:ns="%s" %s>%s</ns:%sResponse></soapenv:Body></soapenv:Envelope>' % (SOAPENV,operation,SERVICES.get(endpoint,""),XMLNS,content,operation)
+
+def getFaultBody(message):
+	return '<?xml version="1.0" encoding="UTF-8"?><soapenv:Envelope xmlns:soapenv="%s"><soapenv:Body><soapenv:Fault><faultcode>soapenv:Server</faultcode><faultstring>%s</faultstring></soapenv:Fault></soapenv:Body></soapenv:Envelope>' % (SOAPENV,escape(message))
+
+#
+# Operation and parameters of a SOAP request, a parameter is the id
+# inside it if it has one, else its text
+#
+def getOperation(body,soapAction):
+	operation=None
+	params={}
+	if body.strip():
+		try:
+			root=ET.fromstring(body)
+		except Exception:
+			root=None
+		soapBody=root.find("{%s}Body" % SOAPENV) if root is not None else None
+		if soapBody is not None and len(soapBody):
+			operation=getLocalName(soapBody[0].tag)
+			for param in soapBody[0]:
+				thisId=param.find("{%s}id" % TYPES)
+				params[getLocalName(param.tag)]=(thisId.text if thisId is not None else param.text or "").strip()
+	if operation is None:
+		# An empty body, the operation is only in the SOAPAction
+		operation=soapAction.strip('"').replace("urn:","").strip(":")
+	return operation,params
+
+#################################################################
+# Admin responses
+#################################################################
+def getAppState(app):
+	return "<a:runtimeStateEnum>%s</a:runtimeStateEnum><a:synchronization>IN_SYNC</a:synchronization><a:templateVersion>%s</a:templateVersion>" % (app["state"],app["version"])
+
+def getAllEnv(ent,params):
+	return "".join("<ns:return>%s%s%s</ns:return>" % (getElement("t:id",env["id"]),getElement("t:name",env["name"]),getElement("r:description",env["description"])) for env in ent["envs"])
+
+def getHostsOnMachine(ent,params):
+	return "".join("<ns:return>%s%s<h:singletonHost><h:status>RUNNING</h:status>%s%s<h:synchronized>true</h:synchronized></h:singletonHost></ns:return>" %
+		(getElement("t:id",host["id"]),getElement("t:name",host["name"]),getElement("h:hpaFeatureVersion",VERSIONS),getElement("h:machineName",host["machine"])) for host in ent["hosts"])
+
+def getNodesInEnvironment(ent,params):
+	envId=params.get("envIdentifier")
+	envName=dict((env["id"],env["name"]) for env in ent["envs"]).get(envId)
+	nodes=[node for node in ent["nodes"] if node["env"] == envId]
+	content=["<ns:return>"]
+	for node in nodes:
+		content.append("<n:nodeSummary>%s%s%s%s%s<n:state>Running</n:state>%s<n:synchronized>true</n:synchronized></n:nodeSummary>" %
+			(getElement("t:id",node["id"]),getElement("t:name",node["name"]),getId("n:environment",envId,envName),getElement("n:hostName",node["host"]["name"]),getElement("n:machine",node["host"]["machine"]),getElement("n:nodeTypeVersion",VERSIONS)))
+	content.append("<n:pagination><t:itemsPerPage>999</t:itemsPerPage><t:requestedPage>1</t:requestedPage><t:totalItems>%d</t:totalItems></n:pagination></ns:return>" % len(nodes))
+	return "".join(content)
+
+def getApplicationViewDetails(ent,params):
+	envId=params.get("envId")
+	content=["<ns:return>"]
+	for folder in ent["folders"]:
+		if envId == "1" and folder["parent"] is None:
+			content.append(getId("a:appFolderDesc",folder["id"],folder["name"]))
+	for app in ent["apps"]:
+		if app["env"] == envId and app["folder"] is None:
+			content.append("<a:appDesc>%s%s%s</a:appDesc>" % (getElement("t:id",app["id"]),getElement("t:name",app["name"]),getAppState(app)))
+	content.append("</ns:return>")
+	return "".join(content)
+
+def getAppFolderView(ent,params):
+	folder=ent["folderById"].get(params.get("folderId"))
+	content=["<ns:return>"]
+	for child in ent["folders"]:
+		if folder is not None and child["parent"] is folder:
+			content.append("<u:folders>%s%s%s</u:folders>" % (getElement("t:id",child["id"]),getElement("t:name",child["name"]),getElement("t:path",child["path"])))
+	for app in ent["apps"]:
+		if folder is not None and app["folder"] is folder:
+			content.append("<u:applications>%s%s%s</u:applications>" % (getElement("t:id",app["id"]),getElement("t:name",app["name"]),getAppState(app)))
+	content.append("</ns:return>")
+	return "".join(content)
+
+def getBPMNodes(ent):
+	return [node for node in ent["nodes"] if node["env"] == "1"]
+
+def getApplicationsMappedToNode(ent,params):
+	node=dict((node["id"],node) for node in ent["nodes"]).get(params.get("nodeId"))
+	if node is None:
+		return ""
+	return "".join("<ns:return>%s%s</ns:return>" % (getElement("t:id",app["id"]),getElement("t:name",app["name"])) for app in ent["apps"] if app["env"] == node["env"])
+
+def getApplicationSummaryById(ent,params):
+	app=ent["appById"].get(params.get("applicationId"))
+	if app is None:
+		return None
+	folder=app["folder"] or {"id":None,"name":None}
+	details="".join("<a:runtimeStateDetails>%s%s</a:runtimeStateDetails>" % (getElement("a:node",node["name"]),getElement("a:state",app["state"])) for node in ent["nodes"] if node["env"] == app["env"])
+	return "<ns:return>%s%s%s%s%s</ns:return>" % (getElement("t:id",app["id"]),getElement("t:name",app["name"]),getAppState(app),getId("a:folder",folder["id"],folder["name"]),details)
+
+def getApplicationRollupDetails(ent,params):
+	app=ent["appById"].get(params.get("applicationIds"))
+	if app is None:
+		return None
+	components=BPMCOMPONENTS if app["name"] == "amx.bpm.app" else ["process"]
+	state="Running" if app["state"] == "RUNNING" else "Stopped"
+	content=["<ns:return>"]
+	for node in ent["nodes"]:
+		if node["env"] == app["env"]:
+			for component in components:
+				content.append("<a:componentRollupDetails><c:actionStatus>Deployed</c:actionStatus>%s%s%s%s</a:componentRollupDetails>" %
+					(getId("c:nodeId",node["id"],node["name"]),getElement("c:componentPath",app["name"] + "/" + component),getElement("c:state",state),getElement("c:componentVersion",app["version"])))
+	content.append("</ns:return>")
+	return "".join(content)
+
+def getAllUploadedDAA(ent,params):
+	return "".join("<ns:return>%s%s%s%s</ns:return>" % (getElement("d:daaId",daa["id"]),getElement("d:daaFileName",daa["file"]),getElement("d:used",daa["used"]),getElement("d:applicationTemplateIdVersion",daa["template"])) for daa in ent["daas"])
+
+def deleteDAAS(ent,params):
+	daaId=params.get("daaIds")
+	with LOCK:
+		daas=[daa for daa in ent["daas"] if daa["id"] == daaId and daa["used"] == "false"]
+		for daa in daas:
+			ent["daas"].remove(daa)
+			CACHE.pop(("DAAService","getAllUploadedDAA",""),None)
+	if not daas:
+		return None
+	return "<ns:return>%s</ns:return>" % getElement("t:summary","DAA " + daas[0]["file"] + " deleted")
+
+# Operations answered, with the parameter the response depends on
+OPERATIONS={
+	("EnvService","getAllEnv"):(getAllEnv,None),
+	("HostService","getHostsOnMachine"):(getHostsOnMachine,None),
+	("NodeService","getNodesInEnvironment"):(getNodesInEnvironment,"envIdentifier"),
+	("ApplicationService","getApplicationViewDetails"):(getApplicationViewDetails,"envId"),
+	("ApplicationService","getApplicationsMappedToNode"):(getApplicationsMappedToNode,"nodeId"),
+	("ApplicationService","getApplicationSummaryById"):(getApplicationSummaryById,"applicationId"),
+	("ApplicationService","getApplicationRollupDetails"):(getApplicationRollupDetails,"applicationIds"),
+	("ApplicationUIService","getAppFolderView"):(getAppFolderView,"folderId"),
+	("DAAService","getAllUploadedDAA"):(getAllUploadedDAA,None),
+	("DAAService","deleteDAAS"):(deleteDAAS,False),
+}
+
+#
+# SOAP response, the enterprise does not change apart from deleted
+# DAAs so responses are built once for each parameter
+#
+def getSOAPResponse(endpoint,operation,params):
+	function,param=OPERATIONS[(endpoint,operation)]
+	if param is False:
+		content=function(ENTERPRISE,params)
+	else:
+		key=(endpoint,operation,params.get(param,"") if param else "")
+		content=CACHE.get(key)
+		if content is None:
+			content=function(ENTERPRISE,params)
+			CACHE[key]=content
+	if content is None:
+		return None
+	return getEnvelope(endpoint,operation,content)
+
+#################################################################
+# JSON responses of searchservice.jsp and viewstatusservice.jsp
+#################################################################
+def getEnterpriseOverview():
+	return {"result":{"enterpriseName":"Stub Enterprise","adminVersion":VERSIONS,"hostsInEnterprise":len(ENTERPRISE["hosts"]),"nodesInEnterprise":len(ENTERPRISE["nodes"]),
+		"machinesInEnterprise":len(ENTERPRISE["hosts"]),"riInEnterprise":0,"applicationsInEnterprise":len(ENTERPRISE["apps"]),"environmentsInEnterprise":len(ENTERPRISE["envs"])}}
+
+def getApplications():
+	envNames=dict((env["id"],env["name"]) for env in ENTERPRISE["envs"])
+	return {"result":[{"id":app["id"],"name":app["name"],"appTemplateVersion":app["version"],"environmentName":envNames[app["env"]],"appFolderName":app["folder"]["name"] if app["folder"] else "",
+		"lastDeployedOn":"2026-10-19 08:00:00","synchronization":"IN_SYNC","stateEnum":app["state"]} for app in ENTERPRISE["apps"]]}
+
+JSONMETHODS={"getEnterpriseOverview":getEnterpriseOverview,"getApplications":getApplications}
+
+#################################################################
+# Request handler
+#################################################################
+class AdminHandler(stubServer.StubHandler):
+
+	def getFault(self,endpoint,action):
+		if endpoint in ("j_security_check","admin.jsp"):
+			return None
+		return (500,getFaultBody("Injected error"),"text/xml; charset=UTF-8")
+
+	#
+	# csrfToken of the session of the SSO_ID cookie, None when there is
+	# none or it expired
+	#
+	def getSession(self):
+		cookie=re.search("SSO_ID=([^;]+)",self.getHeader("Cookie"))
+		session=SESSIONS.get(cookie.group(1)) if cookie else None
+		if session is None:
+			return None
+		if EXPIRE and time.time() - session[1] > EXPIRE:
+			return None
+		return session[0]
+
+	def getResponse(self,body):
+		path=self.path.split("?")[0]
+		if path.endswith("/j_security_check"):
+			return self.doLogin(body)
+		if path.endswith("/admin.jsp"):
+			session=self.getSession()
+			if session is None:
+				return ("admin.jsp","",200,LOGINPAGE,"text/html",[])
+			page="<html><head><script>var csrfToken='%s';</script></head><body></body></html>" % session if CSRF else "<html><body></body></html>"
+			return ("admin.jsp","",200,page,"text/html",[])
+		if path.endswith("/searchservice.jsp") or path.endswith("/viewstatusservice.jsp"):
+			return self.doJSON(path.split("/")[-1].replace(".jsp",""),body)
+		if "/services/" in path:
+			return self.doSOAP(path,body)
+		return (path,"",404,"Not found","text/plain",[])
+
+	def doLogin(self,body):
+		form=parse_qs(body.decode("utf-8"))
+		if form.get("j_username",[""])[0] != ADMINUSER or form.get("j_password",[""])[0] != ADMINPASSWD:
+			return ("j_security_check","",200,LOGINPAGE,"text/html",[])
+		token="%032x" % random.getrandbits(128)
+		with LOCK:
+			SESSIONS[token]=("%016x" % random.getrandbits(64),time.time())
+		return ("j_security_check","",200,"<html><body>Logged in</body></html>","text/html",[("Set-Cookie","SSO_ID=" + token + "; Path=/")])
+
+	def doJSON(self,endpoint,body):
+		form=parse_qs(body.decode("utf-8"))
+		method=form.get("methodName",[""])[0]
+		session=self.getSession()
+		if session is None:
+			return (endpoint,method,200,LOGINPAGE,"text/html",[])
+		if form.get("xsrfToken",[""])[0] != session:
+			return (endpoint,method,403,"Invalid xsrfToken","text/plain",[])
+		function=JSONMETHODS.get(method)
+		result=function() if function is not None else {"result":[]}
+		return (endpoint,method,200,json.dumps(result),"application/json",[])
+
+	def doSOAP(self,path,body):
+		endpoint=path.split("/services/")[1].strip("/")
+		operation,params=getOperation(body,self.getHeader("SOAPAction"))
+		if ".httpbasic/" in path:
+			auth=self.getHeader("Authorization")
+			expected="Basic " + base64.b64encode((ADMINUSER + ":" + ADMINPASSWD).encode("utf-8")).decode("ascii")
+			if auth != expected:
+				return (endpoint,operation,401,"Unauthorized","text/plain",[("WWW-Authenticate",'Basic realm="amxadministrator"')])
+		else:
+			session=self.getSession()
+			if session is None:
+				return (endpoint,operation,200,LOGINPAGE,"text/html",[])
+			if CSRF and self.getHeader("xsrfToken") != session:
+				return (endpoint,operation,403,"Invalid xsrfToken","text/plain",[])
+		if (endpoint,operation) not in OPERATIONS:
+			return (endpoint,operation,500,getFaultBody("Unknown operation " + operation),"text/xml; charset=UTF-8",[])
+		response=getSOAPResponse(endpoint,operation,params)
+		if response is None:
+			return (endpoint,operation,500,getFaultBody("Not found " + json.dumps(params)),"text/xml; charset=UTF-8",[])
+		return (endpoint,operation,200,response,"text/xml; charset=UTF-8",[])
+
+#################################################################
+# START HERE
+#################################################################
+VERSION="1.02"
+#
+SCRIPTNAME=os.path.basename(__file__)
+DIRNAME=os.path.dirname(__file__)
+#
+ENTERPRISE=None
+CACHE={}
+SESSIONS={}
+LOCK=threading.Lock()
+ADMINUSER="root"
+ADMINPASSWD="t"
+CSRF=True
+EXPIRE=0
+#
+if __name__ == '__main__':
+
+	port=8180
+	applications=100
+	folders=10
+	nodes=2
+	unused=10
+	stopped=0.0
+	latency="fixed:0"
+	perKB=0.0
+	errorRate=0.0
+	capacity=0
+	seed=1
+
+	argv=sys.argv[1:]
+	try:
+		opts,args=getopt.getopt(argv,"hp:a:f:n:u:S:l:k:e:C:U:P:cx:s:",["port=","applications=","folders=","nodes=","unused=","stopped=","latency=","per-kb=","errors=","capacity=","user=","password=","no-csrf","expire=","seed="])
+	except:
+		doHelp()
+		exit(1)
+	for opt, arg in opts:
+		if opt == '-h':
+			doHelp()
+			sys.exit()
+		elif opt in ("-p","--port"):
+			port=int(arg)
+		elif opt in ("-a","--applications"):
+			applications=int(float(arg))
+		elif opt in ("-f","--folders"):
+			folders=int(arg)
+		elif opt in ("-n","--nodes"):
+			nodes=int(arg)
+		elif opt in ("-u","--unused"):
+			unused=int(arg)
+		elif opt in ("-S","--stopped"):
+			stopped=float(arg)
+		elif opt in ("-l","--latency"):
+			latency=arg
+		elif opt in ("-k","--per-kb"):
+			perKB=float(arg)
+		elif opt in ("-e","--errors"):
+			errorRate=float(arg)
+		elif opt in ("-C","--capacity"):
+			capacity=int(arg)
+		elif opt in ("-U","--user"):
+			ADMINUSER=arg
+		elif opt in ("-P","--password"):
+			ADMINPASSWD=arg
+		elif opt in ("-c","--no-csrf"):
+			CSRF=False
+		elif opt in ("-x","--expire"):
+			EXPIRE=float(arg)
+		elif opt in ("-s","--seed"):
+			seed=int(arg)
+
+	thisLogger=includeFunctions.logSetup(SCRIPTNAME,logging.INFO,isConsole=True,logDir=".")
+	includeFunctions.logToggle(SCRIPTNAME)
+	ENTERPRISE=getEnterprise(applications,folders,nodes,unused,stopped,seed)
+	rnd=random.Random(seed)
+	server=stubServer.StubServer(("",port),AdminHandler,thisLogger,genBPMLog.getLatency(rnd,latency),perKB,errorRate,seed,capacity)
+	includeFunctions.logHeader(SCRIPTNAME + " " + VERSION + " listening on port " + str(port))
+	thisLogger.info("%d applications in %d folders, %d BPM nodes, %d DAAs of which %d unused" % (len(ENTERPRISE["apps"]),folders,nodes,len(ENTERPRISE["daas"]),unused))
+	thisLogger.info("AMXADMINURL=\"http://localhost:%d/amxadministrator\"" % port)
+	stubServer.serve(server)
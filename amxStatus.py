@@ -11,21 +11,33 @@
 #################################################################
 # 20/05/2021	1.1 	Created (copied from appStatus.py)
 # 				1.2		Including all fixes and updates
+# 19/10/2026	1.3		Queued logging, output is written off the collection loop
+# 19/10/2026	1.4		Raw payloads go to capture files instead of the debug log
+# 19/10/2026	1.5		Latency and size of each admin call, summary after each run
+# 19/10/2026	1.6		Added --profile
+# 19/10/2026	1.7		Responses parsed with the xmlExtract records
+# 19/10/2026	1.8		Parsed with lxml when it is installed
+# 19/10/2026	1.9		Hosts, nodes and applications kept as amxRecords records
+# 19/10/2026	1.10	Calls through adminClient, timeouts from httpConnectionTimeout, added --deadline
 #################################################################
 from calendar import THURSDAY
 import json
 from time import time
 import time
-import requests
 import sys
 import os
 import getopt
 import signal
 import datetime
 import logging
-import re
-import xml.etree.ElementTree as ET
 from includes import includeFunctions
+from includes import payloadCapture
+from includes.callStats import CallStats
+from includes import profiler
+from includes import xmlExtract
+from includes import amxRecords
+from includes import adminClient
+from includes import runDeadline
 #################################################################
 # Functions
 #################################################################
@@ -59,127 +71,49 @@ def doHelp():
 	print("--summary -s         Display Nodes and App status")
 	print("--test -t            Test mode, wait for admin connection and loop")
 	print("--help -h            This Page")
+	for line in profiler.HELP + runDeadline.HELP:
+		print(line)
 
 #################################################################
 # Do a SOAP call to the admin server
 #################################################################
 def doCall(endpoint,action,body,content="text/xml"):
 
-	url=AMXADMINURL + "/services/" + endpoint
-	headers={'content-type': content,"Connection":"keep-alive","pragma":"no-cache","Cache-Control":"no-cache","xsrfToken":XSRFTOKEN,"SOAPAction":"urn:"+action}
-	try:
-		thisLogger.debug("Calling " + url)
-		thisLogger.debug(body)
-		response=SESSION.post(url,data=body,headers=headers)
-		if response.status_code == 200 or response.status_code == 204:
-			thisLogger.debug("Call OK")
-			if "<html>" in response.content:
-				thisLogger.error("Invalid response from server")
-				return None
-			else:
-				return response.content 
-		else:
-			thisLogger.error("Response " + str(response.status_code) + " connecting to " + url)
-	except Exception as rex:
-		thisLogger.error("Error calling " + url + " " + str(rex))
-	#
-	return None 
+	thisLogger.debug(body)
+	return CLIENT.call(endpoint,action,body,content)
 
 #################################################################
 # Simulate amx admin login form to get SSO_ID cookie
 # in the session
 #################################################################
 def getToken(loop=False):
-	
-	global XSRFTOKEN
-	url=AMXADMINURL + "/j_security_check"
-	headers={'User-agent':USER_AGENT,"Connection":"keep-alive","pragma":"no-cache","Cache-Control":"no-cache","Referer":AMXADMINURL}
-	data={"j_username" : AMXADMINUSER,"j_password":AMXADMINPASSWD}
-	while 1 == 1:
-		try:
-			thisSession=requests.Session()
-			response=thisSession.post(url,data=data,headers=headers)
-			if response.status_code == 200:
-				if "SSO_ID" in thisSession.cookies:
-					thisLogger.debug("Got SSO_ID cookie")
-					# AMX BPM 4.3 requires a csrfToken thats in admin.jsp
-					response=thisSession.post(AMXADMINURL + "/admin.jsp",data=data,headers=headers)
-					if "csrfToken" in response.content:
-						p = re.compile("csrfToken.*;")
-						res=p.search(response.content)
-						XSRFTOKEN=res.group(0).split("'")[1].strip("'")
-						thisLogger.info("Response contains csrfToken, AMX BPM 4.3.x server")
-					else:
-						XSRFTOKEN=""
 
-					return thisSession
-
-			else:
-				thisLogger.info("Response " + str(response.status_code) + " connecting to " + url)
-		except Exception as rex:
-			thisLogger.error("Error calling " + url + " " + str(rex))
-		
-		if loop:
-			time.sleep(LOOPSLEEP)
-		else:
-			break
-	#
-	return None
+	return CLIENT.login(loop,LOOPSLEEP)
 
 ################################################################# 
 # Call searchstatus service on admin server
 # This only works for 4.3.x and above
 ################################################################# 
-def getSearchStatus(data,content="application/x-www-form-urlencoded; charset=UTF-8"):
-    
-	body = data + "&xsrfToken="+XSRFTOKEN
-	url= AMXADMINURL + "/amx/viewstatus/search/searchservice.jsp"
- 
-	headers={'content-type': content,"Connection":"keep-alive","pragma":"no-cache","Cache-Control":"no-cache","xsrfToken":XSRFTOKEN}
-	
-	try:
-		thisLogger.debug("Calling " + url)
-		thisLogger.debug(body)
-		response=SESSION.post(url,data=body,headers=headers)
-		if response.status_code == 200 or response.status_code == 204:
-			thisLogger.debug("Call OK")
-			if "<html>" in response.content:
-				thisLogger.error("Invalid response from server")
-				return None
-			else:
-				return response.json()
-		else:
-			thisLogger.error("Response " + str(response.status_code) + " connecting to " + url)
-	except Exception as rex:
-		thisLogger.error("Error calling " + url + " " + str(rex))
+def getSearchStatus(data):
+
+	thisLogger.debug(data)
+	response=CLIENT.callPage("/amx/viewstatus/search/searchservice.jsp","searchservice",data.split("&")[0],data)
+	if response is not None:
+		return json.loads(response)
+	return None
 
 ################################################################# 
 # Call viewstatus service on admin server
 # This only works for 4.3.x and above
 ################################################################# 
-def getViewStatus(data,content="application/x-www-form-urlencoded; charset=UTF-8"):
-    
-	body = data + "&xsrfToken="+XSRFTOKEN
-	url= AMXADMINURL + "/amx/amxmonitor/viewstatusservice.jsp"
- 
-	headers={'content-type': content,"Connection":"keep-alive","pragma":"no-cache","Cache-Control":"no-cache","xsrfToken":XSRFTOKEN}
-	
-	try:
-		thisLogger.debug("Calling " + url)
-		thisLogger.debug(body)
-		response=SESSION.post(url,data=body,headers=headers)
-		if response.status_code == 200 or response.status_code == 204:
-			thisLogger.debug("Call OK")
-			if "<html>" in response.content:
-				thisLogger.error("Invalid response from server")
-				return None
-			else:
-				return response.json()
-		else:
-			thisLogger.error("Response " + str(response.status_code) + " connecting to " + url)
-	except Exception as rex:
-		thisLogger.error("Error calling " + url + " " + str(rex))
-    
+def getViewStatus(data):
+
+	thisLogger.debug(data)
+	response=CLIENT.callPage("/amx/amxmonitor/viewstatusservice.jsp","viewstatusservice",data.split("&")[0],data)
+	if response is not None:
+		return json.loads(response)
+	return None
+
 #################################################################
 # Connect to admin server and get the environments
 # If loop is true then wait for admin server to be ready
@@ -194,7 +128,7 @@ def getEnvId(loop=False):
 	while 1 == 1:
 		response=doCall(endpoint,action,body)	
 		if response is not None:
-			thisLogger.debug("Rtn:" + response)
+			thisLogger.debug("Rtn: %d bytes",len(response))
 			break
 		else:
 			thisLogger.warn("Nothing returned")
@@ -216,7 +150,7 @@ def getHosts():
 	
 	response=doCall(endpoint,action,body)	
 	if response is not None:
-		thisLogger.debug("Rtn:" + response)
+		thisLogger.debug("Rtn: %d bytes",len(response))
 	else:
 		thisLogger.warn("Nothing returned")
 
@@ -237,7 +171,7 @@ def getNodes(envList):
 		body='<?xml version="1.0"?><SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/" xmlns:SOAP-ENC="http://schemas.xmlsoap.org/soap/encoding/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:jsx2="http://types.core.api.admin.amf.tibco.com/xsd"><SOAP-ENV:Body><jsx1:getNodesInEnvironment xmlns:jsx1="http://node.amx.api.admin.amf.tibco.com"><jsx1:envIdentifier><jsx2:id xmlns:jsx2="http://types.core.api.admin.amf.tibco.com/xsd">' + 	envId + '</jsx2:id><jsx2:name xmlns:jsx2="http://types.core.api.admin.amf.tibco.com/xsd">BPMEnvironment</jsx2:name></jsx1:envIdentifier><jsx1:input><jsx2:filterCriteria xmlns:jsx2="http://types.core.api.admin.amf.tibco.com/xsd"></jsx2:filterCriteria><jsx2:itemsPerPage xmlns:jsx2="http://types.core.api.admin.amf.tibco.com/xsd">999</jsx2:itemsPerPage><jsx2:requestedPage xmlns:jsx2="http://types.core.api.admin.amf.tibco.com/xsd">1</jsx2:requestedPage></jsx1:input></jsx1:getNodesInEnvironment></SOAP-ENV:Body></SOAP-ENV:Envelope>'
 		response=doCall(endpoint,action,body)	
 		if response is not None:
-			thisLogger.debug("Rtn:" + response)
+			thisLogger.debug("Rtn: %d bytes",len(response))
 		else:
 			thisLogger.warn("Nothing returned")
 		responseList.append(response)
@@ -258,7 +192,7 @@ def getAppComponents(appId):
 	body='<SOAP-ENV:Envelope xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/" xmlns:SOAP-ENC="http://schemas.xmlsoap.org/soap/encoding/" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema" xmlns:jsx2="http://types.core.api.admin.amf.tibco.com/xsd"><SOAP-ENV:Body><jsx1:getApplicationRollupDetails xmlns:jsx1="http://application.amx.api.admin.amf.tibco.com"><jsx1:applicationIds><jsx2:id xmlns:jsx2="http://types.core.api.admin.amf.tibco.com/xsd">' + str(appId) + '</jsx2:id><jsx2:name xmlns:jsx2="http://types.core.api.admin.amf.tibco.com/xsd"></jsx2:name></jsx1:applicationIds></jsx1:getApplicationRollupDetails></SOAP-ENV:Body></SOAP-ENV:Envelope>'
 	response=doCall(endpoint,action,body)	
 	if response is not None:
-		thisLogger.debug("Rtn:" + response)
+		thisLogger.debug("Rtn: %d bytes",len(response))
 	else:
 		thisLogger.warn("Nothing returned")
 	
@@ -274,7 +208,7 @@ def spinning_cursor():
 #################################################################
 # START HERE
 #################################################################
-VERSION="1.2"
+VERSION="1.10"
 #
 SCRIPTNAME=os.path.basename(__file__)
 DIRNAME=os.path.dirname(__file__)
@@ -302,12 +236,13 @@ else:
     AMXADMINPASSWD="t"
  
 #################################################################
-thisLogger=includeFunctions.logSetup(SCRIPTNAME,logging.INFO,isConsole=True,logDir=".")
+thisLogger=includeFunctions.logSetup(SCRIPTNAME,logging.INFO,isConsole=True,logDir=".",queued=True)
 includeFunctions.logToggle(SCRIPTNAME)
+CAPTURE=payloadCapture.captureSetup(SCRIPTNAME,".")
+CALLSTATS=CallStats()
+CALLSTATSFILE=SCRIPTNAME.replace(".py",".calls.json")
+CLIENT=adminClient.AdminClient(AMXADMINURL,AMXADMINUSER,AMXADMINPASSWD,thisLogger,CALLSTATS,CAPTURE,timeouts=runDeadline.getTimeouts(amxctrl if cfgFile else None))
 #################################################################
-SESSION=requests.Session()
-XSRFTOKEN=""
-USER_AGENT="Mozilla/5.0 (compatible; MSIE 9.0; Windows NT 6.1; WOW64; Trident/5.0)"
 LOOPSLEEP=30
 LINEC=95
 LINE=("=" * LINEC)
@@ -318,7 +253,10 @@ if __name__ == '__main__':
 	original_sigint = signal.getsignal(signal.SIGINT)
 	signal.signal(signal.SIGINT, exit_gracefully)
 	#
-	argv=sys.argv[1:]
+	argv,PROFILER=profiler.profileSetup(sys.argv[1:])
+	CALLSTATS.profiler=PROFILER
+	argv,DEADLINE=runDeadline.deadlineSetup(argv,amxctrl if cfgFile else None)
+	CLIENT.deadline=DEADLINE
 	try:	
 		opts,args=getopt.getopt(argv,"htasnl:",["help","test","apps","nodestatus","summary","loop"])
 	except:
@@ -364,32 +302,37 @@ if __name__ == '__main__':
 	#
 	G_apps=[]
 	#
-	SESSION=getToken(testMode)
-	if SESSION is not None:
+	PROFILER.begin("login")
+	session=getToken(testMode)
+	PROFILER.end()
+	if session is not None:
 		thisLogger.debug("Logged In")
 		
-		if XSRFTOKEN is not "" and doSummary is False:
+		if CLIENT.xsrfToken is not "" and doSummary is False:
+			PROFILER.begin("enterprise")
 			result=getSearchStatus("methodName=getEnterpriseOverview")
-			enterpriseName=result["result"]["enterpriseName"]
-			version=result["result"]["adminVersion"]
-			hosts=result["result"]["hostsInEnterprise"]
-			nodes=result["result"]["nodesInEnterprise"]
-			machines=result["result"]["machinesInEnterprise"]
-			ris=result["result"]["riInEnterprise"]
-			applications=result["result"]["applicationsInEnterprise"]
-			envs=result["result"]["environmentsInEnterprise"]
-
-			headerCtrl="%-20s%20s"
-			includeFunctions.logHeader(headerCtrl % ("Enterprise Summary",""))
-			thisLogger.info(headerCtrl % ("Enterprise Name" ,enterpriseName))
-			thisLogger.info(headerCtrl % ("Admin Version ",version))
-			thisLogger.info(headerCtrl % ("Machines",str(machines)))
-			thisLogger.info(headerCtrl % ("Environments",str(envs)))
-			thisLogger.info(headerCtrl % ("Hosts",str(hosts)))
-			thisLogger.info(headerCtrl % ("Nodes",str(nodes)))
-			thisLogger.info(headerCtrl % ("Applications",str(applications)))
-			thisLogger.info(headerCtrl % ("Resource Instances",str(ris)))
+			if result is not None:
+				enterpriseName=result["result"]["enterpriseName"]
+				version=result["result"]["adminVersion"]
+				hosts=result["result"]["hostsInEnterprise"]
+				nodes=result["result"]["nodesInEnterprise"]
+				machines=result["result"]["machinesInEnterprise"]
+				ris=result["result"]["riInEnterprise"]
+				applications=result["result"]["applicationsInEnterprise"]
+				envs=result["result"]["environmentsInEnterprise"]
+
+				headerCtrl="%-20s%20s"
+				includeFunctions.logHeader(headerCtrl % ("Enterprise Summary",""))
+				thisLogger.info(headerCtrl % ("Enterprise Name" ,enterpriseName))
+				thisLogger.info(headerCtrl % ("Admin Version ",version))
+				thisLogger.info(headerCtrl % ("Machines",str(machines)))
+				thisLogger.info(headerCtrl % ("Environments",str(envs)))
+				thisLogger.info(headerCtrl % ("Hosts",str(hosts)))
+				thisLogger.info(headerCtrl % ("Nodes",str(nodes)))
+				thisLogger.info(headerCtrl % ("Applications",str(applications)))
+				thisLogger.info(headerCtrl % ("Resource Instances",str(ris)))
 			thisLogger.info(" ")
+			PROFILER.end()
 
 		# Allow loop on status
 		doLoop=True 
@@ -398,18 +341,19 @@ if __name__ == '__main__':
 			#
 			# Environments 
 			#
+			PROFILER.begin("environments")
 			result=getEnvId()
 			if result is not None:
 				envId=None
 				headerCtrl="%-20s%-40s%10s"
 				if doSummary is False:
 					includeFunctions.logHeader( headerCtrl % ("Environment","Description","Id"))
-				ns_apps={ "soapenv":"http://schemas.xmlsoap.org/soap/envelope/","ns":"http://env.amx.api.admin.amf.tibco.com","ax2102":"http://host.amx.api.admin.amf.tibco.com/xsd","ax2114":"http://resinstance.amx.api.admin.amf.tibco.com/xsd","ax2108":"http://endpoint.amx.api.admin.amf.tibco.com/xsd","ax2110":"http://application.amx.api.admin.amf.tibco.com/xsd","ax278":"http://types.core.api.admin.amf.tibco.com/xsd","ax274":"http://exception.core.api.admin.amf.tibco.com/xsd","ax285":"http://node.amx.api.admin.amf.tibco.com/xsd","ax296":"http://logging.amx.api.admin.amf.tibco.com/xsd","ax275":"http://fixer.core.api.admin.amf.tibco.com/xsd","ax286":"http://reference.api.admin.amf.tibco.com/xsd","ax283":"http://env.amx.api.admin.amf.tibco.com/xsd","ax294":"http://stagingarea.amx.api.admin.amf.tibco.com/xsd","ax290":"http://status.amx.api.admin.amf.tibco.com/xsd","ax280":"http://svars.amx.api.admin.amf.tibco.com/xsd","ax281":"http://reference.api.admin.amf.tibco.com/xsd"}
-				root = ET.fromstring(result)
-				for env in root.findall('./soapenv:Body/ns:getAllEnvResponse/',ns_apps):
-					name = env.find("./ax278:name", ns_apps).text
-					desc= env.find("./ax281:description", ns_apps).text
-					id= env.find("./ax278:id", ns_apps).text
+				with PROFILER.phase("parse"):
+					root = xmlExtract.fromstring(result)
+				for env in xmlExtract.ENVS.records(root):
+					name = env["name"]
+					desc= env["description"]
+					id= env["id"]
 					# Store BPM environment id
 					if name.startswith(BPMENV):
 						envId = id
@@ -419,88 +363,81 @@ if __name__ == '__main__':
 					envList.append({"name":name,"id":id})
 		
 				thisLogger.info(" ")
+				PROFILER.end()
 				#
 				# Hosts
 				#
+				PROFILER.begin("hosts")
 				if doSummary is False:
 					result=getHosts()
 					if result is not None:
 						headerCtrl="%-20s%-10s%-15s%-20s%10s"
-						ns_hosts={"soapenv":"http://schemas.xmlsoap.org/soap/envelope/","ns":"http://host.amx.api.admin.amf.tibco.com","ax2257":"http://resinstance.amx.api.admin.amf.tibco.com/xsd","ax2279":"http://svars.amx.api.admin.amf.tibco.com/xsd","ax2238":"http://exception.core.api.admin.amf.tibco.com/xsd","ax2249":"http://status.amx.api.admin.amf.tibco.com/xsd","ax2239":"http://fixer.core.api.admin.amf.tibco.com/xsd","ax2260":"http://node.amx.api.admin.amf.tibco.com/xsd","ax2272":"http://logging.amx.api.admin.amf.tibco.com/xsd","ax2262":"http://enterprise.amx.api.admin.amf.tibco.com/xsd","ax2263":"http://util.java/xsd","ax2242":"http://host.amx.api.admin.amf.tibco.com/xsd","ax2253":"http://stagingarea.amx.api.admin.amf.tibco.com/xsd","ax2243":"http://reference.api.admin.amf.tibco.com/xsd" ,"ax2276":"http://env.amx.api.admin.amf.tibco.com/xsd", "ax2244":"http://types.core.api.admin.amf.tibco.com/xsd"}
-						hostroot = ET.fromstring(result)
+						with PROFILER.phase("parse"):
+							hostroot = xmlExtract.fromstring(result)
 						includeFunctions.logHeader( headerCtrl % ("Host","Version","State","Machine","In Synch"))
-						for amxhost in hostroot.findall('./soapenv:Body/ns:getHostsOnMachineResponse/',ns_hosts):
-							hostName=amxhost.find("./ax2244:name", ns_hosts).text
-							hostState=amxhost.find("./ax2242:singletonHost/ax2242:status",ns_hosts).text
-							hostVersion=amxhost.find("./ax2242:singletonHost/ax2242:hpaFeatureVersion",ns_hosts).text
-							machine=amxhost.find("./ax2242:singletonHost/ax2242:machineName",ns_hosts).text
-							state=amxhost.find("./ax2242:singletonHost/ax2242:synchronized",ns_hosts).text
-							buffer=headerCtrl % (hostName,hostVersion,hostState,machine,state)
+						for amxhost in xmlExtract.HOSTS.records(hostroot):
+							amxhost=amxRecords.HostRecord(**amxhost)
+							buffer=headerCtrl % (amxhost.name,amxhost.version,amxhost.status,amxhost.machine,amxhost.synchronized)
 							thisLogger.info(buffer) 
       
 		
 				thisLogger.info(" ")
+				PROFILER.end()
 				#
 				# Nodes 
 				#
+				PROFILER.begin("nodes")
 				resultList=getNodes(envList)
 				headerCtrl="%-20s%-20s%-20s%-15s%-10s%10s"
-				ns_nodes={"soapenv":"http://schemas.xmlsoap.org/soap/envelope/","ns":"http://node.amx.api.admin.amf.tibco.com","ax249":"http://application.amx.api.admin.amf.tibco.com/xsd" ,"ax217":"http://types.core.api.admin.amf.tibco.com/xsd" ,"ax228":"http://reference.api.admin.amf.tibco.com/xsd" ,"xsi":"http://www.w3.org/2001/XMLSchema-instance" ,"ax214":"http://fixer.core.api.admin.amf.tibco.com/xsd" ,"ax226":"http://host.amx.api.admin.amf.tibco.com/xsd" ,"ax237":"http://status.amx.api.admin.amf.tibco.com/xsd" ,"ax213":"http://exception.core.api.admin.amf.tibco.com/xsd" ,"ax235":"http://env.amx.api.admin.amf.tibco.com/xsd" ,"ax222":"http://resinstance.amx.api.admin.amf.tibco.com/xsd" ,"ax233":"http://stagingarea.amx.api.admin.amf.tibco.com/xsd" ,"ax241":"http://logging.amx.api.admin.amf.tibco.com/xsd" ,"ax220":"http://node.amx.api.admin.amf.tibco.com/xsd" ,"ax231":"http://util.java/xsd" ,"ax253":"http://svars.amx.api.admin.amf.tibco.com/xsd" ,"ax262":"http://io.java/xsd"}
 				lastEnv=""
 				nodeList={}
 				for result in resultList:
-					noderoot=ET.fromstring(result)
-					myList=noderoot.findall('./soapenv:Body/ns:getNodesInEnvironmentResponse/ns:return/',ns_nodes)
-					for node in noderoot.findall('./soapenv:Body/ns:getNodesInEnvironmentResponse/ns:return/',ns_nodes):
-						if 'pagination' not in node.tag:
-							env=node.find("./ax220:environment/ax217:name",ns_nodes).text
-							if env != lastEnv:
-								thisLogger.info(" ")
-								thisLogger.info("Environment: " + env)
-								includeFunctions.logHeader(headerCtrl % ("Node","Host","Machine","State","Version","In Synch"))
-								lastEnv=env
+					if result is None:
+						continue
+					with PROFILER.phase("parse"):
+						noderoot=xmlExtract.fromstring(result)
+					for node in xmlExtract.NODES.records(noderoot):
+						node=amxRecords.NodeRecord(**node)
+						if node.environment != lastEnv:
+							thisLogger.info(" ")
+							thisLogger.info("Environment: " + node.environment)
+							includeFunctions.logHeader(headerCtrl % ("Node","Host","Machine","State","Version","In Synch"))
+							lastEnv=node.environment
 		
-							name=node.find("./ax217:name",ns_nodes).text
-							nodeId=node.find("./ax217:id",ns_nodes).text
-							nodeList[str(nodeId)]=name
-							host=node.find("./ax220:hostName",ns_nodes).text
-							machine=node.find("./ax220:machine",ns_nodes).text
-							state=node.find("./ax220:state",ns_nodes).text
-							version=node.find("./ax220:nodeTypeVersion",ns_nodes).text
-							sync=node.find("./ax220:synchronized",ns_nodes).text
-							thisLogger.info(headerCtrl % (name,host,machine,state,version,sync))
+						nodeList[str(node.id)]=node.name
+						thisLogger.info(headerCtrl % (node.name,node.hostName,node.machine,node.status,node.version,node.synchronized))
 				
+			PROFILER.end()
 			thisLogger.info(" ")
 
-			if XSRFTOKEN is not "":
+			PROFILER.begin("applications")
+			if CLIENT.xsrfToken is not "":
 				# Get all the app details
-				summCnt={}
+				G_apps=[]
 				amxVersion="n/a"
 				amxState="n/a"
+				amxId=None
 				result=getViewStatus("methodName=getApplications")
 				headerCtrl="%-40s%-25s%-20s%-20s%-17s%7s%10s"
 				if doSummary is False and doApps is True:
 					includeFunctions.logHeader(headerCtrl % ("Application","Version","Environment","Folder","Deployed On","In Sync","State"))
-				for jsonApp in result["result"]:
+				for jsonApp in (result["result"] if result is not None else []):
+					app=amxRecords.AppRecord(jsonApp["id"],jsonApp["name"],jsonApp["appTemplateVersion"],jsonApp["stateEnum"],jsonApp["synchronization"],
+						folder=jsonApp["appFolderName"],environment=jsonApp["environmentName"],deployed=jsonApp["lastDeployedOn"])
+					G_apps.append(app)
 					
 					if doSummary is False and doApps is True:
-						thisLogger.info(headerCtrl % (jsonApp["name"],jsonApp["appTemplateVersion"],jsonApp["environmentName"],jsonApp["appFolderName"],jsonApp["lastDeployedOn"],jsonApp["synchronization"],jsonApp["stateEnum"]))
+						thisLogger.info(headerCtrl % (app.name,app.version,app.environment,app.folder,app.deployed,app.syncName,app.status))
 					
-					if "amx.bpm.app" == jsonApp["name"]:
-						amxVersion=jsonApp["appTemplateVersion"]
-						amxState=jsonApp["stateEnum"]
-						amxId=jsonApp["id"]
-
-
-					if jsonApp["stateEnum"] in summCnt:
-						summCnt[jsonApp["stateEnum"]]+=1
-					else:
-						summCnt[jsonApp["stateEnum"]]=1
+					if "amx.bpm.app" == app.name:
+						amxVersion=app.version
+						amxState=app.status
+						amxId=app.id
 
 				thisLogger.info("")
 				includeFunctions.logHeader("%-30s" % "App Status Summary")
-				for summ in summCnt:
-					thisLogger.info("%-20s%10d" % (summ,summCnt[summ]))
+				for summ,count in amxRecords.STATES.count(app.state for app in G_apps):
+					thisLogger.info("%-20s%10d" % (summ,count))
 
 				thisLogger.info("")
 				thisLogger.info("AMX.BPM.APP version : " + amxVersion + " state : " + amxState )
@@ -509,38 +446,27 @@ if __name__ == '__main__':
 				# Get the amx.bpm.app component status to see
 				# whether each node is ok
 				#
+				PROFILER.end()
+				PROFILER.begin("components")
 				nodeSummary={}
-				if doNodeStatus:
+				if doNodeStatus and amxId is not None:
 					headerCtrl="%-80s%-25s%-20s%-20s"
 					if not doSummary:
 						includeFunctions.logHeader(headerCtrl % ("Component Path","Node","State","Status"))
 					result=getAppComponents(amxId)
-					ns_apps={"soapenv":"http://schemas.xmlsoap.org/soap/envelope/","ns":"http://application.amx.api.admin.amf.tibco.com","ax2169":"http://stagingarea.amx.api.admin.amf.tibco.com/xsd" ,"ax2159":"http://types.core.api.admin.amf.tibco.com/xsd" ,"ax2171":"http://permission.common.amx.api.admin.amf.tibco.com/xsd" ,"ax2161":"http://application.amx.api.admin.amf.tibco.com/xsd" ,"ax2173":"http://resinstance.amx.api.admin.amf.tibco.com/xsd" ,"ax2184":"http://component.amx.api.admin.amf.tibco.com/xsd" ,"ax2165":"http://status.amx.api.admin.amf.tibco.com/xsd" ,"ax2176":"http://svars.amx.api.admin.amf.tibco.com/xsd" ,"ax2155":"http://exception.core.api.admin.amf.tibco.com/xsd" ,"ax2188":"http://binding.amx.api.admin.amf.tibco.com/xsd" ,"ax2156":"http://fixer.core.api.admin.amf.tibco.com/xsd" ,"ax2178":"http://logging.amx.api.admin.amf.tibco.com/xsd","ax2183":"http://component.amx.api.admin.amf.tibco.com/xsd"}		
-					comproot=ET.fromstring(result)
-					components=comproot.findall('./soapenv:Body/ns:getApplicationRollupDetailsResponse/ns:return/ax2161:componentRollupDetails',ns_apps)
-					for component in components:
-						status=component.find("./ax2183:actionStatus",ns_apps).text
-						nodeName=component.find('./ax2183:nodeId/ax2159:name',ns_apps).text
-						componentPath=component.find("./ax2183:componentPath",ns_apps).text
-						state=component.find("./ax2183:state",ns_apps).text
-						version=component.find("./ax2183:componentVersion",ns_apps).text
-						if not doSummary:
-							thisLogger.info(headerCtrl % (componentPath[:79],nodeName,state,status))
-
-						if nodeName not in nodeSummary:
-							nodeSum={}
-							nodeSummary[nodeName]=nodeSum
-						else:
-							nodeSum=nodeSummary[nodeName]
-
-						if state in nodeSum:
-							nodeSum[state]+=1
-						else:
-							nodeSum[state]=1
-
-						nodeSummary[nodeName]=nodeSum
-						
-						pass
+					if result is not None:
+						with PROFILER.phase("parse"):
+							comproot=xmlExtract.fromstring(result)
+						for component in xmlExtract.COMPONENTS.records(comproot):
+							status=component["actionStatus"]
+							nodeName=component["node"]
+							componentPath=component["componentPath"]
+							state=component["state"]
+							version=component["version"]
+							if not doSummary:
+								thisLogger.info(headerCtrl % (componentPath[:79],nodeName,state,status))
+
+							nodeSummary.setdefault(nodeName,[]).append(amxRecords.NODESTATES.code(state))
 					
 					thisLogger.info("")
 					includeFunctions.logHeader("Node Component Info Summary")
@@ -549,24 +475,34 @@ if __name__ == '__main__':
 						thisLogger.info("")
 						includeFunctions.logHeader("Node: " + nodeName)
 						running=False
-						for states in nodeSummary[nodeName]:
-							thisLogger.info("%-20s%10d" % (states,nodeSummary[nodeName][states]))
+						stateCounts=amxRecords.NODESTATES.count(nodeSummary[nodeName])
+						for states,count in stateCounts:
+							thisLogger.info("%-20s%10d" % (states,count))
 							if states == 'Running':
 								running=True
-						if len(nodeSummary[nodeName]) == 1 and running:
+						if len(stateCounts) == 1 and running:
 							thisLogger.info("")
 							thisLogger.info("This node is Running OK")
 							
 
+			PROFILER.end()
+			if DEADLINE.getMark():
+				thisLogger.info("")
+				includeFunctions.logHeader(DEADLINE.getMark().strip())
+			CALLSTATS.logSummary(thisLogger,CALLSTATSFILE)
+			CLIENT.logLimits(thisLogger)
 			if testMode is False:
 				doLoop=False
 			else:
 				includeFunctions.logHeader("Sleeping " + str(LOOPSLEEP) + " seconds")
-				time.sleep(LOOPSLEEP)
+				with PROFILER.phase("sleep"):
+					time.sleep(LOOPSLEEP)
+				DEADLINE.start()
     
 			# End of while loop
 	else:
 		thisLogger.error("Cannot connect to admin server")
   
+	PROFILER.logSummary(thisLogger)
 	thisLogger.info("")
 	includeFunctions.logHeader("The End")
\ No newline at end of file
@@ -7,6 +7,10 @@ AMXADMINUSER="root"
 # Encrypted
 AMXADMINPASSWD="dA=="
 httpConnectionTimeout=360000
+# ms to wait for a response when not httpConnectionTimeout
+#httpReadTimeout=360000
+# Seconds a run can take, --deadline overrides it
+#runDeadline=600
 #
 BPMUSER="tibco-admin"
 # Encrypted
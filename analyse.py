@@ -6,14 +6,32 @@
 #
 #  24/06/2020 1.00  Created
 #  30/06/2020 1.20  Added monitor mode and signal handling
+#  19/10/2026 1.30  Added latency percentiles and per-minute time series
+#  19/10/2026 1.31  Added top N mode
+#  19/10/2026 1.32  Transactions kept in a compact column store
+#  19/10/2026 1.33  Single compiled line classifier in readFile
+#  19/10/2026 1.34  Added per operation breakdown
+#  19/10/2026 1.35  Added mmap scanning mode
+#  19/10/2026 1.36  Monitor mode follows the log with 1, 5 and 15 minute windows
+#  19/10/2026 1.37  Added ingest into and queries on a SQLite database
 #
 import sys
 import os
 import getopt
 import time
 import signal
+import calendar
+import heapq
+import re
+import mmap
+import hashlib
+from collections import deque
+from itertools import chain
 from sys import argv
 from datetime import datetime
+from includes.latencyHistogram import LatencyHistogram, TimeSeries, RollingWindow
+from includes.transactionStore import TransactionStore, formatMicros
+from includes.transactionDB import TransactionDB
 #
 #################################################################
 # Handle interrupt
@@ -43,10 +61,23 @@ def doHelp():
 	print(SCRIPTNAME + " [ options ]")
 	print
 	print("--file -f                Log file name, default BPM.log")
-	print("--monitor -m             Monitor mode, run every 30 seconds")
+	print("--monitor -m             Monitor mode, follow the log and show 1, 5 and 15 minute windows")
+	print("--interval -i <seconds>  Monitor mode refresh, default 30 seconds")
 	print("--reset -r               Only display transactions with reset errors ")
 	print("--seconds -s <seconds>   Only display transactios with more elseapsed seconds")
+	print("--timeseries -t          Display per minute counts, errors and percentiles")
+	print("--top -n <N>             Only keep the N slowest transactions and N latest resets")
+	print("--operations -o          Display count, errors and percentiles by operation")
+	print("--mmap -z                Scan the mapped file for markers, skipping payload lines")
 	print
+	print("--ingest -I <db>         Add the transactions and resets of the log to a SQLite database,")
+	print("                         only what was added since the last ingest is read")
+	print("--query -Q <db>          Summary of the transactions in a SQLite database")
+	print("  --from <time>          Only query from this time, YYYY-mm-dd HH:MM")
+	print("  --to <time>            Only query up to this time, YYYY-mm-dd HH:MM")
+	print("  --top -n <N>           Show the N slowest transactions")
+	print("  --hourly               Show count, error rate and resets by hour")
+	print("  --reset -r             Show resets by the operation of the transaction")
 	print
 
 #################################################################
@@ -57,60 +88,482 @@ def getDateTime(inStr):
 	return datetime_object
 
 #################################################################
-# Read log file and parse transactions and errors
-#################################################################
-def readFile(fileName="BPM.log"):
-	linenum=0
-	logLines=[]
-	current=[]
-	responses={}
-	resets={}
-	firstStamp=None
-	outMess=False
-	inMess=False
-	with open(fileName,"r") as f:
-		for thisLine in f:
-			linenum=+1
-			if "LoggingInInterceptor" in thisLine:
-				timestamp=getDateTime(thisLine.split("[")[0])
+# Convert log timestamp to epoch microseconds
+#################################################################
+def getEpochMicros(inStr):
+	stamp=getDateTime(inStr)
+	return calendar.timegm(stamp.timetuple()) * 1000000 + stamp.microsecond
+
+#################################################################
+# Classify a log line in one pass. Interceptor lines give the
+# timestamp split in its parts and In or Out, ID and Response-Code
+# lines give their value, m.lastgroup says which kind matched.
+# Address, Http-Method and a SOAPAction header give the operation.
+# Anything else (payload, encoding...) fails on the first character.
+#################################################################
+LINEMATCH=re.compile(r"(?P<day>\d+ \w+ \d+) (?P<hh>\d+):(?P<mm>\d+):(?P<ss>\d+),(?P<frac>\d+) [^\n]*?Logging(?P<dir>In|Out)Interceptor"
+	r"|ID: (?P<id>\S+)"
+	r"|Response-Code: (?P<code>\S+)"
+	r"|Address: (?P<address>\S+)"
+	r"|Http-Method: (?P<method>\S+)"
+	r"|Headers: [^\n]*?SOAPAction=\[\"?(?P<action>[^\]\",]*)").match
+# Path segments that are ids, numbers or uuids
+IDSEGMENT=re.compile(r"/(?:\d+|[0-9a-fA-F-]{16,}|[^/]*\d[^/]*\d{3,}[^/]*)(?=/|$)")
+# Distinct operations kept, the rest are counted as (other)
+MAXOPERATIONS=1000
+# Header lines read after an interceptor line before giving up
+MAXHEADERLINES=30
+# Header lines scanMapped reads after an interceptor line, up to a
+# Payload line or the next log entry
+MAPPEDHEADERS=re.compile(("(?:(?![0-9]|Payload:)[^\n]*(?:\n|\\Z)){0,%d}" % (MAXHEADERLINES - 1)).encode("ascii"))
+# Python 3 maps bytes, the classifier works on str
+DECODE=bytes is not str
+# Epoch seconds for each day seen, so strptime runs once a day
+DAYCACHE={}
+
+#################################################################
+# Epoch microseconds from the parts of an interceptor line
+#################################################################
+def getStampMicros(m):
+	day=m.group("day")
+	dayStart=DAYCACHE.get(day)
+	if dayStart is None:
+		dayStart=calendar.timegm(datetime.strptime(day,"%d %b %Y").timetuple())
+		DAYCACHE[day]=dayStart
+	# Same as %f, the fraction is right padded to microseconds
+	frac=m.group("frac")
+	return (dayStart + int(m.group("hh")) * 3600 + int(m.group("mm")) * 60 + int(m.group("ss"))) * 1000000 + int((frac + "00000")[:6])
+
+#################################################################
+# Operation key of a transaction, method plus the address path
+# with ids replaced, SOAP calls also get their SOAPAction
+#################################################################
+def getOperation(itm):
+	address=itm.get("address","")
+	path=address.split("?")[0]
+	if "://" in path:
+		path="/" + path.split("://",1)[1].partition("/")[2]
+	path=IDSEGMENT.sub("/{id}",path)
+	op=itm.get("method","") + " " + path
+	action=itm.get("action")
+	if action:
+		op+=" " + action
+	return op.strip()
+
+#################################################################
+# Yield only the lines of a mapped file that readFile needs, in
+# file order, as (offset,lines) for each block of them. The raw
+# bytes are searched for the next interceptor line or reset error,
+# the header lines of an interceptor block are matched up to its
+# Payload line and the payload itself is skipped without being
+# copied or decoded.
+# With scan set only complete lines from scan["offset"] are read
+# and scan is updated with where to carry on from next time.
+#################################################################
+def scanBlocks(f,scan=None):
+	size=os.fstat(f.fileno()).st_size
+	pos=0
+	inHeaders=False
+	if scan is not None:
+		pos=scan["offset"]
+		inHeaders=scan["inHeaders"]
+	if size <= pos:
+		return
+	mm=mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ)
+	try:
+		if scan is not None:
+			# Nothing to read until the line being written is complete
+			size=mm.rfind(b"\n",pos,size) + 1
+			if size <= pos:
+				return
+		find=mm.find
+		# Next of each marker from pos, each search carries on from the
+		# last one so the map is read once
+		nextBlock=nextReset=-1
+		while pos < size:
+			start=pos
+			if not inHeaders:
+				if nextBlock < pos:
+					nextBlock=find(b"Interceptor",pos,size)
+					if nextBlock < 0:
+						nextBlock=size
+				if nextReset < pos:
+					nextReset=find(b"reset ",pos,size)
+					if nextReset < 0:
+						nextReset=size
+				hit=min(nextBlock,nextReset)
+				if hit >= size:
+					pos=size
+					break
+				start=mm.rfind(b"\n",pos,hit) + 1 or pos
+				pos=find(b"\n",hit,size) + 1 or size
+				inHeaders=nextBlock < pos
+			if inHeaders:
+				pos=MAPPEDHEADERS.match(mm,pos,size).end()
+				# A block cut by the end of what is mapped carries on next time
+				inHeaders=pos >= size
+			lines=mm[start:pos].split(b"\n")
+			if lines[-1] == b"":
+				lines.pop()
+			yield (start,lines)
+		if scan is not None:
+			scan["offset"]=max(scan["offset"],min(pos,size))
+			scan["inHeaders"]=inHeaders
+	finally:
+		mm.close()
+
+#################################################################
+# The lines of scanBlocks one by one. Without scan they are chained
+# block by block, with it scan["lineAt"] is the offset of the line
+# last yielded.
+#################################################################
+def scanMapped(f,scan=None):
+	blocks=scanBlocks(f,scan)
+	if scan is None:
+		if DECODE:
+			return chain.from_iterable([line.decode("utf-8","replace") for line in lines] for start,lines in blocks)
+		return chain.from_iterable(lines for start,lines in blocks)
+	return scanLines(blocks,scan)
+
+def scanLines(blocks,scan):
+	for start,lines in blocks:
+		for line in lines:
+			scan["lineAt"]=start
+			start+=len(line) + 1
+			if DECODE:
+				line=line.decode("utf-8","replace")
+			yield line
+
+#################################################################
+# Format microseconds as seconds.millis
+#################################################################
+def formatElapsed(micros):
+	return "%d.%03d" % (micros // 1000000,(micros % 1000000) // 1000)
+
+#################################################################
+# Add a completed transaction to the histograms, anything that is
+# not a 2xx/3xx response is counted as an error. In top N mode only
+# the N slowest transactions are kept in a min-heap.
+#################################################################
+def recordTransaction(itm,responseCode,stats):
+	itm["response"]=responseCode
+	elapsed=itm["elapsed"]
+	error=not (responseCode[:1] in ("2","3"))
+	stats["latency"].record(elapsed)
+	stats["minutes"].record(itm["out"] // 1000000,elapsed,error)
+	stats["window"].record(itm["out"] // 1000000,elapsed,error)
+	operations=stats["operations"]
+	op=getOperation(itm)
+	opStats=operations.get(op)
+	if opStats is None:
+		if len(operations) >= MAXOPERATIONS:
+			op="(other)"
+			opStats=operations.get(op)
+		if opStats is None:
+			opStats={"count":0,"errors":0,"latency":LatencyHistogram()}
+			operations[op]=opStats
+	opStats["count"]+=1
+	if error:
+		opStats["errors"]+=1
+	opStats["latency"].record(elapsed)
+	topN=stats["topN"]
+	if topN > 0:
+		slowest=stats["slowest"]
+		# seq stops ties comparing the dicts
+		stats["seq"]+=1
+		if len(slowest) < topN:
+			heapq.heappush(slowest,(elapsed,stats["seq"],itm))
+		elif elapsed > slowest[0][0]:
+			heapq.heapreplace(slowest,(elapsed,stats["seq"],itm))
+	elif stats["transactions"] is not None:
+		stats["transactions"].add(itm["id"],itm["in"],itm["out"],responseCode)
+	if stats["sink"] is not None:
+		stats["sink"](itm,responseCode,op)
+
+#################################################################
+# New parser state, this is everything readFile needs to carry on
+# where it stopped when a file is being followed.
+# If topN is set only the N slowest transactions and N most recent
+# resets are kept, with keep False no transaction is kept at all.
+# stats["sink"] and stats["resetSink"] when set are called with
+# each completed transaction and each reset.
+#################################################################
+def newState(topN=0,keep=True):
+	if topN > 0:
+		resets=deque(maxlen=topN)
+	elif not keep:
+		# The monitor shows the last few resets
+		resets=deque(maxlen=10)
+	else:
+		resets={}
+	if keep:
+		store=TransactionStore()
+	else:
+		store=None
+	stats={"latency":LatencyHistogram(),"minutes":TimeSeries(60),"window":RollingWindow(),"topN":topN,"slowest":[],"seq":0,"transactions":store,"operations":{},"sink":None,"resetSink":None}
+	# current holds in flight transactions by id, lastIn is the inbound
+	# transaction whose header lines are being read and pending the
+	# completed one waiting for its Response-Code line, inAt is the
+	# offset of the last inbound interceptor line when it is known
+	return {"stats":stats,"current":{},"lastIn":None,"pending":None,"id":None,"elapsed":None,"timestamp":None,"inMess":False,"outMess":False,"inAt":None,
+		"resets":resets,"resetCount":0,"first":None,"last":None,"lines":0,"scan":{"offset":0,"inHeaders":False}}
+
+#################################################################
+# Parse lines into the state
+#################################################################
+def parseLines(lines,state):
+	stats=state["stats"]
+	current=state["current"]
+	lastIn=state["lastIn"]
+	pending=state["pending"]
+	id=state["id"]
+	elapsed=state["elapsed"]
+	timestamp=state["timestamp"]
+	inMess=state["inMess"]
+	outMess=state["outMess"]
+	resets=state["resets"]
+	boundedResets=isinstance(resets,deque)
+	resetCount=state["resetCount"]
+	firstStamp=state["first"]
+	lastStamp=state["last"]
+	window=stats["window"]
+	resetSink=stats["resetSink"]
+	scan=state["scan"]
+	inAt=state["inAt"]
+	linenum=state["lines"]
+	lineMatch=LINEMATCH
+	for thisLine in lines:
+		linenum+=1
+		m=lineMatch(thisLine)
+		if m is None:
+			if "reset " in thisLine:
+				resetCount+=1
+				if boundedResets:
+					resets.append((id,elapsed))
+				else:
+					resets[id]=elapsed
+				if timestamp is not None:
+					window.recordReset(timestamp // 1000000)
+				if resetSink is not None:
+					resetSink(scan.get("lineAt"),timestamp,id)
+			continue
+		kind=m.lastgroup
+		if kind == "dir":
+			if pending is not None:
+				recordTransaction(pending,"",stats)
+				pending=None
+			timestamp=getStampMicros(m)
+			lastIn=None
+			if m.group("dir") == "In":
 				inMess=True
+				inAt=scan.get("lineAt")
 				if firstStamp is None:
 					firstStamp=timestamp
-			elif "LoggingOutInterceptor" in thisLine:
-				timestamp=getDateTime(thisLine.split("[")[0])
+			else:
 				outMess=True
 				lastStamp=timestamp
-			elif "ID:" in thisLine:
-				id=thisLine.split(" ")[1].rstrip()
-				if outMess:
-					outMess=False
-					oldcurrent=current
-					current=[]
-					for itm in oldcurrent:
-						if  itm["id"]==id:
-							itm["out"] = timestamp
-							elapsed=timestamp - itm["in"]
-							itm["elapsed"] = timestamp - itm["in"] 
-							logLines.append(itm)
-						else:
-							current.append(itm)	
-				        	
-				if inMess:
-					logObj={"id":id,"in":timestamp,"out":"","elspased":"","response":""}
-					current.append(logObj)	
-					inMess=False
-			elif "Response-Code:" in thisLine:
-					responseCode=thisLine.split(" ")[1].rstrip()
-					responses[id]=responseCode
-			elif "reset " in thisLine:
-				resets[id]=elapsed
-		# End of for
-	return ({"transactions":logLines,"resets":resets,"responses":responses,"first":firstStamp,"last":lastStamp})
+		elif kind == "id":
+			id=m.group("id")
+			if outMess:
+				outMess=False
+				itm=current.pop(id,None)
+				if itm is not None:
+					itm["out"] = timestamp
+					elapsed=timestamp - itm["in"]
+					itm["elapsed"] = elapsed
+					pending=itm
+			if inMess:
+				lastIn={"id":id,"in":timestamp,"out":"","elapsed":"","response":"","at":inAt}
+				current[id]=lastIn
+				inMess=False
+		elif kind == "code":
+			if pending is not None:
+				recordTransaction(pending,m.group("code"),stats)
+				pending=None
+		elif lastIn is not None:
+			lastIn[kind]=m.group(kind)
+	# End of for
+	state.update({"lastIn":lastIn,"pending":pending,"id":id,"elapsed":elapsed,"timestamp":timestamp,"inMess":inMess,"outMess":outMess,"inAt":inAt,
+		"resetCount":resetCount,"first":firstStamp,"last":lastStamp,"lines":linenum})
+
+#################################################################
+# Results of a parse as returned by readFile
+#################################################################
+def getResults(state):
+	stats=state["stats"]
+	slowest=[itm for el,seq,itm in sorted(stats["slowest"],reverse=True)]
+	return ({"lines":state["lines"],"transactions":stats["transactions"],"slowest":slowest,"resets":state["resets"],"resetCount":state["resetCount"],"first":state["first"],"last":state["last"],
+		"latency":stats["latency"],"minutes":stats["minutes"],"operations":stats["operations"],"window":stats["window"],"inFlight":len(state["current"])})
+
+#################################################################
+# Read log file and parse transactions and errors, times are held
+# as epoch microseconds
+# If topN is set only the N slowest transactions and N most recent
+# resets are kept, everything else only goes into the aggregates
+# If useMmap is set only lines with a marker are read, lines is
+# then the number of those lines
+#################################################################
+def readFile(fileName="BPM.log",topN=0,useMmap=False):
+	state=newState(topN)
+	startT=time.time()
+	with open(fileName,"rb" if useMmap else "r") as f:
+		if useMmap:
+			parseLines(scanMapped(f),state)
+		else:
+			parseLines(f,state)
+	if state["pending"] is not None:
+		recordTransaction(state["pending"],"",state["stats"])
+		state["pending"]=None
+	results=getResults(state)
+	results["parseTime"]=time.time() - startT
+	results["bytes"]=os.path.getsize(fileName)
+	return results
+
+#################################################################
+# Parse what has been added to the log since the last call, the
+# state is started again if the file has been rotated
+#################################################################
+def followFile(fileName,state):
+	if os.path.getsize(fileName) < state["scan"]["offset"]:
+		state=newState(keep=False)
+	with open(fileName,"rb") as f:
+		parseLines(scanMapped(f,state["scan"]),state)
+	return state
+
+#################################################################
+# Key of a log file in the database, the path plus a hash of its
+# first line so a rotated log starts again from the beginning
+#################################################################
+def getFileKey(fileName):
+	with open(fileName,"rb") as f:
+		first=f.readline(1024)
+	return os.path.abspath(fileName) + "#" + hashlib.sha1(first).hexdigest()[:12]
+
+#################################################################
+# Add what was logged since the last ingest to the database. The
+# next ingest starts again from the oldest transaction still in
+# flight, rows already stored are then skipped on their offset.
+# Transactions started more than INGESTWAIT before the end of the
+# log are taken to never complete and do not hold the start back.
+#################################################################
+INGESTWAIT=600 * 1000000
+def ingestFile(fileName,db):
+	fileKey=getFileKey(fileName)
+	state=newState(keep=False)
+	offset=db.getResume(fileKey)
+	if offset > os.path.getsize(fileName):
+		offset=0
+	state["scan"]["offset"]=offset
+	stats=state["stats"]
+	stats["sink"]=lambda itm,responseCode,op: db.addTransaction(fileKey,itm["at"],itm["id"],itm["in"],itm["out"],responseCode,op)
+	stats["resetSink"]=lambda at,stamp,id: db.addReset(fileKey,at,stamp,id)
+	before=db.inserted
+	with open(fileName,"rb") as f:
+		parseLines(scanMapped(f,state["scan"]),state)
+	resume=state["scan"]["offset"]
+	waiting=list(state["current"].values())
+	if state["pending"] is not None:
+		waiting.append(state["pending"])
+	for itm in waiting:
+		if itm["at"] is not None and itm["at"] < resume and (state["timestamp"] is None or itm["in"] >= state["timestamp"] - INGESTWAIT):
+			resume=itm["at"]
+	db.setResume(fileKey,os.path.abspath(fileName),resume)
+	return (db.inserted - before,state["lines"])
+
+#################################################################
+# Epoch microseconds from a --from or --to option
+#################################################################
+def getOptionMicros(inStr):
+	return calendar.timegm(datetime.strptime(inStr,"%Y-%m-%d %H:%M").timetuple()) * 1000000
+
+#################################################################
+# Print the summary and the reports asked for from the database
+#################################################################
+def printQuery(dbName,start,end,topN,hourly,onlyResets):
+	db=TransactionDB(dbName)
+	count,errors,average,high,first,last=db.summary(start,end)
+	print(LINE)
+	print("Transactions   : "),
+	print("%10d" % count)
+	if count == 0:
+		print(LINE)
+		db.close()
+		return
+	print("Errors         : "),
+	print("%10d" % errors)
+	print("Avg Trans      : "),
+	print("%10.3f" % (average / 1000000.0))
+	print("Max Trans      : "),
+	print("%10.3f" % (high / 1000000.0))
+	print("First          : " + formatMicros(first))
+	print("Last           : " + formatMicros(last))
+	print(LINE)
+	if topN > 0:
+		print("Slowest " + str(topN) + " transactions")
+		print(LINE)
+		print("ID          Start                       End                        Response    Elapsed  Operation")
+		print(LINE)
+		for id,inT,outT,response,elapsed,op in db.slowest(topN,start,end):
+			print("%-10s %27s %27s %8.8s %10.10s  %s" % (id,formatMicros(inT),formatMicros(outT),str(response) if response else "",formatElapsed(elapsed),op))
+		print(LINE)
+	if hourly:
+		print("%-16s %10s %10s %8s %10s %10s %8s" % ("Hour","Count","Errors","Err %","Avg ms","Max ms","Resets"))
+		print(LINE)
+		for hour,hourCount,hourErrors,hourAverage,hourHigh,resets in db.hourly(start,end):
+			print("%-16s %10d %10d %8.2f %10.3f %10.3f %8d" % (datetime.utcfromtimestamp(hour // 1000000).strftime("%Y-%m-%d %H:%M"),hourCount,hourErrors,hourErrors * 100.0 / hourCount,hourAverage / 1000.0,hourHigh / 1000.0,resets))
+		print(LINE)
+	if onlyResets:
+		print("%-50s %8s %10s %10s %8s" % ("Operation","Resets","Avg ms","Count","Reset %"))
+		print(LINE)
+		for op,resets,opAverage,opCount in db.resetCorrelation(start,end):
+			print("%-50.50s %8d %10.3f %10d %8.3f" % (op,resets,opAverage / 1000.0,opCount,resets * 100.0 / opCount))
+		print(LINE)
+	db.close()
+
+#################################################################
+# Redraw the monitor summary in place
+#################################################################
+def printDashboard(fileName,state,interval):
+	results=getResults(state)
+	window=results["window"]
+	# Home the cursor and clear the screen
+	sys.stdout.write("\033[H\033[J")
+	print(LINE)
+	logTime="n/a"
+	if window.latest > 0:
+		logTime=datetime.utcfromtimestamp(window.latest).strftime("%Y-%m-%d %H:%M:%S")
+	print("%s %s Logfile %s  log time %s  refresh %ds" % (SCRIPTNAME,VERSION,fileName,logTime,interval))
+	print(LINE)
+	print("%-8s %10s %10s %10s %10s %10s %10s %10s %10s" % ("Window","Trans","Rate/s","Errors","Resets","p50 ms","p90 ms","p99 ms","max ms"))
+	print(LINE)
+	for label,seconds in (("1 min",60),("5 min",300),("15 min",900)):
+		summ=window.summary(seconds)
+		hist=summ["latency"]
+		p50,p90,p99=hist.percentiles([50,90,99])
+		print("%-8s %10d %10.2f %10d %10d %10.3f %10.3f %10.3f %10.3f" % (label,summ["count"],summ["rate"],summ["errors"],summ["resets"],p50/1000.0,p90/1000.0,p99/1000.0,hist.max/1000.0))
+	print(LINE)
+	print("In flight %d  Total transactions %d  Total resets %d" % (results["inFlight"],results["latency"].count,results["resetCount"]))
+	sys.stdout.flush()
+
+#################################################################
+# Print one transaction line
+#################################################################
+def printTransaction(res,reset):
+	elString=formatElapsed(res["elapsed"])
+	print("%-10s" % res["id"]),
+	print("%27s" % formatMicros(res["in"])),
+	print("%27s" % formatMicros(res["out"])),
+	print("%8.8s" % str(res["response"])),
+	print("%10.10s" % elString),
+	if reset:
+		print (" *reset*")
+	else:
+		print
 
 #################################################################
 # START HERE	
 #################################################################
-VERSION="1.20"
+VERSION="1.37"
 #
 SCRIPTNAME=os.path.basename(__file__)
 DIRNAME=os.path.dirname(__file__)
@@ -127,10 +580,20 @@ if __name__ == '__main__':
 	filterSeconds=0
 	onlyResets=False
 	monitorMode=False
+	showMinutes=False
+	showOperations=False
+	useMmap=False
+	topN=0
+	interval=30
+	ingestDB=None
+	queryDB=None
+	fromTime=None
+	toTime=None
+	showHourly=False
 
 	argv=sys.argv[1:]
 	try:
-			opts,args=getopt.getopt(argv,"hf:rs:m",["file=","reset","seconds=","monitor"])
+			opts,args=getopt.getopt(argv,"hf:rs:mtn:ozi:I:Q:",["file=","reset","seconds=","monitor","timeseries","top=","operations","mmap","interval=","ingest=","query=","from=","to=","hourly"])
 	except:
 			doHelp()
 			exit(1)
@@ -146,6 +609,33 @@ if __name__ == '__main__':
 				onlyResets=True
 		elif opt in ("-m","--monitor"):
 			monitorMode=True
+		elif opt in ("-t","--timeseries"):
+			showMinutes=True
+		elif opt in ("-n","--top"):
+			topN=int(arg)
+		elif opt in ("-o","--operations"):
+			showOperations=True
+		elif opt in ("-z","--mmap"):
+			useMmap=True
+		elif opt in ("-i","--interval"):
+			interval=int(arg)
+		elif opt in ("-I","--ingest"):
+			ingestDB=arg
+		elif opt in ("-Q","--query"):
+			queryDB=arg
+		elif opt == "--from":
+			fromTime=getOptionMicros(arg)
+		elif opt == "--to":
+			toTime=getOptionMicros(arg)
+		elif opt == "--hourly":
+			showHourly=True
+
+	if queryDB is not None:
+		print(LINE)
+		print(SCRIPTNAME + " " + VERSION + " Database " + queryDB)
+		printQuery(queryDB,fromTime,toTime,topN,showHourly,onlyResets)
+		print
+		sys.exit()
 
 	if os.path.exists(inputFile):
 		pass
@@ -160,81 +650,134 @@ if __name__ == '__main__':
 		print(" minumum seconds " + str(filterSeconds)),
 	if onlyResets:
 		print(" only show reset errors"),
+	if topN > 0:
+		print(" top " + str(topN)),
 	print
 
-	doLoop=True
-	while doLoop:
+	if ingestDB is not None:
+		db=TransactionDB(ingestDB)
+		inserted,lines=ingestFile(inputFile,db)
+		db.close()
+		print(LINE)
+		print("Read " + str(lines) + " lines, added " + str(inserted) + " transactions to " + ingestDB)
+		print(LINE)
+		sys.exit()
+
+	# Monitor mode only reads what has been added since the last
+	# refresh, so its cost follows the logging rate
+	if monitorMode:
+		state=newState(keep=False)
+		while True:
+			state=followFile(inputFile,state)
+			printDashboard(inputFile,state,interval)
+			time.sleep(interval)
 
-		# Get the parsed log file
-		results=readFile(inputFile)
-		#
-		transactions=results["transactions"]
-		resets=results["resets"]
-		responses=results["responses"]
-		timeSpan=results["last"]-results["first"]
+	# Get the parsed log file
+	results=readFile(inputFile,topN,useMmap)
+	#
+	resets=results["resets"]
+	latency=results["latency"]
+	if results["first"] is not None and results["last"] is not None:
+		period=(results["last"] - results["first"]) // 1000000
+	else:
+		period=0
 	
+	#
+	# Output the info
+	#
+	LINE="=" * 100
+	numTransactions=latency.count
+	# Every reset line, as the monitor counts them, with or without -n
+	numResets=results["resetCount"]
+	rate=0
+	if period > 0:
+		rate=numTransactions / period
+	#
+	print(LINE)
+	now = datetime.now()
+	ts=now.strftime("%Y-%m-%d %H:%M:%S")
+	print(ts)
+	print(LINE)
+	if topN > 0:
+		print("Slowest " + str(topN) + " transactions")
+		print(LINE)
+		transactions=results["slowest"]
+		resetIds=set([rid for rid,el in resets])
+	else:
+		store=results["transactions"]
+		transactions=(store.row(i) for i in store.select(filterSeconds * 1000000))
+		resetIds=resets
+	print("ID          Start                       End                        Response    Elapsed  Reset Error")
+	print(LINE)
+	for res in transactions:
+		reset=res["id"] in resetIds
+		if onlyResets is False or reset is True:
+			if res["elapsed"] >= filterSeconds * 1000000:
+				printTransaction(res,reset)
 	
-		#
-		# Output the info
-		#
-		LINE="=" * 100
-		numTransactions=len(transactions)
-		numResets=len(resets)
-		period=timeSpan.seconds
-		if period is not None and period > 0:
-			rate=numTransactions / period
-		totalEl=0
-		#
-		print(LINE)
-		now = datetime.now()
-		ts=now.strftime("%Y-%m-%d %H:%M:%S")
-		print(ts)
-		print(LINE)
-		print("ID          Start                       End                        Response    Elapsed  Reset Error")
-		print(LINE)
-		for res in transactions:
-			if id in resets:
-				reset=True
+	# End of for
+	if topN > 0:
+		print(LINE)
+		print("Most recent " + str(topN) + " reset errors")
+		print(LINE)
+		for rid,el in reversed(resets):
+			if el is None:
+				print("%-10s" % rid)
 			else:
-				reset=False
-			elapsed=res["elapsed"] 
-			id=res["id"]
-			elString=str(elapsed.seconds) + "." + str(elapsed.microseconds/1000)	
-			totalEl+=float(elString)
-			if onlyResets is False or reset is True:
-				if elapsed.seconds >= filterSeconds:
-					print("%-10s" % res["id"]),
-					print("%27s" % str(res["in"])),
-					print("%27s" % str(res["out"])),
-					print("%8.8s" % str(responses[res["id"]])),
-					print("%10.10s" % elString),
-					if reset:
-						print (" *reset*")
-					else:
-						print
-		
-		# End of for
-		avTran=totalEl / numTransactions
-		print(LINE)
-		print("Transactions   : "),
-		print("%10s" % str(numTransactions))
-		print("Reset Errors   : "),
-		print("%10s" % str(numResets))
-		print("Avg Trans      : "),
-		print("%10s" % str(round(avTran,3)))
-		print("Log Span mm:ss : "),
-		m, s = divmod(period, 60)
-		periodStr=str(m) +":"+str(s)
-		print("%10s" % periodStr)
-		print("Rate / s       : "),
-		print( "%10s" % str(rate))
+				print("%-10s %10s" % (rid,formatElapsed(el)))
+	avTran=latency.mean() / 1000000.0
+	print(LINE)
+	print("Transactions   : "),
+	print("%10s" % str(numTransactions))
+	print("Reset Errors   : "),
+	print("%10s" % str(numResets))
+	print("Avg Trans      : "),
+	print("%10s" % str(round(avTran,3)))
+	print("Log Span mm:ss : "),
+	m, s = divmod(period, 60)
+	periodStr=str(m) +":"+str(s)
+	print("%10s" % periodStr)
+	print("Rate / s       : "),
+	print( "%10s" % str(rate))
+	if useMmap:
+		print("Parse MB/s     : "),
+	else:
+		print("Parse lines/s  : "),
+	if results["parseTime"] <= 0:
+		print("%10s" % "n/a")
+	elif useMmap:
+		print("%10.1f" % (results["bytes"] / 1048576.0 / results["parseTime"]))
+	else:
+		print("%10d" % (results["lines"] / results["parseTime"]))
+	print(LINE)
+	#
+	# Latency distribution, values are in ms
+	#
+	# The store gives exact values, top N mode only has the histogram
+	if topN > 0:
+		p50,p90,p99=latency.percentiles([50,90,99])
+	else:
+		p50,p90,p99=store.percentiles([50,90,99])
+	print("Latency ms       p50        p90        p99        max")
+	print("              %10.3f %10.3f %10.3f %10.3f" % (p50/1000.0,p90/1000.0,p99/1000.0,latency.max/1000.0))
+	print(LINE)
+	if showMinutes:
+		print("Minute                 Count     Errors        p50        p90        p99        max")
 		print(LINE)
-		print
-
-		# Decide if looping or not
-		if monitorMode:
-			time.sleep(30)
-		else:
-			doLoop=False
-
-	# End of loop
+		for start,bucket in results["minutes"].items():
+			hist=bucket["latency"]
+			p50,p90,p99=hist.percentiles([50,90,99])
+			print("%-16s %10d %10d %10.3f %10.3f %10.3f %10.3f" % (datetime.utcfromtimestamp(start).strftime("%Y-%m-%d %H:%M"),bucket["count"],bucket["errors"],p50/1000.0,p90/1000.0,p99/1000.0,hist.max/1000.0))
+		print(LINE)
+	if showOperations:
+		# Busiest operations first, by total time spent
+		operations=results["operations"]
+		print("%-50s %8s %7s %10s %10s %10s %10s" % ("Operation","Count","Err %","Total s","p50 ms","p99 ms","max ms"))
+		print(LINE)
+		for op in sorted(operations,key=lambda o: operations[o]["latency"].total,reverse=True):
+			opStats=operations[op]
+			hist=opStats["latency"]
+			p50,p99=hist.percentiles([50,99])
+			print("%-50.50s %8d %7.2f %10.1f %10.3f %10.3f %10.3f" % (op,opStats["count"],opStats["errors"] * 100.0 / opStats["count"],hist.total / 1000000.0,p50/1000.0,p99/1000.0,hist.max/1000.0))
+		print(LINE)
+	print
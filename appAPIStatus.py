@@ -17,8 +17,19 @@
 # 19/02/2021    1.40    Added include file and ctrl file handling
 # 07/02/2021	1.50	Added timestamp to loop header
 # 29/11/2021	1.51	Added summary option 
+# 19/10/2026	1.52	Queued logging, output is written off the collection loop
+# 19/10/2026	1.53	Raw payloads can be captured to files
+# 19/10/2026	1.54	Latency and size of each admin call, summary after each run
+# 19/10/2026	1.55	Added --profile
+# 19/10/2026	1.56	Responses parsed with the xmlExtract records
+# 19/10/2026	1.57	Parsed with lxml when it is installed
+# 19/10/2026	1.58	Applications kept as amxRecords.AppRecord
+# 19/10/2026	1.59	Calls through adminClient, application summaries fetched on its pipeline
+# 19/10/2026	1.60	Calls in flight adapt to the admin server, limits shown after each run
+# 19/10/2026	1.61	Call timeouts from httpConnectionTimeout, added --deadline
+# 19/10/2026	1.62	Waits for the admin server with a readiness probe, backs off between retries
+# 19/10/2026	1.63	Applications not collected before the run deadline are left out
 #################################################################
-import requests
 import re
 import sys
 import os
@@ -28,10 +39,16 @@ import time
 import datetime
 import base64
 import logging
-import xml.etree.ElementTree as ET
-from requests.auth import HTTPBasicAuth
-from operator import itemgetter
+from operator import attrgetter
 from includes import includeFunctions
+from includes import payloadCapture
+from includes.callStats import CallStats
+from includes import profiler
+from includes import xmlExtract
+from includes import amxRecords
+from includes import adminClient
+from includes import runDeadline
+from includes import readinessProbe
 #################################################################
 #
 # Functions
@@ -73,6 +90,8 @@ def doHelp():
 	thisLogger.info("--summary -s         Only displays summary of totals by status")
 	thisLogger.info("--test -t            Display app status in loop of 30 seconds, wait for connection")
 	thisLogger.info("--filter -f <filter> Only display application(s) matching name")
+	for line in profiler.HELP + runDeadline.HELP:
+		thisLogger.info(line)
 	thisLogger.info("")
 	thisLogger.info("")
 
@@ -80,18 +99,7 @@ def doHelp():
 # Call amx admin and get response
 #################################################################
 def doCall(endpoint,action,body,content="text/xml"):
-	url=AMXADMINURL + "/amxadministrator.httpbasic/services/" + endpoint 
-	headers={'content-type': content,"SOAPAction":"urn:"+action}
-	try:
-		response=requests.post(url,data=body,headers=headers,auth=HTTPBasicAuth(AMXADMINUSER, AMXADMINPASSWD))
-		if response.status_code == 200:
-			return response.content 
-		else:
-			thisLogger.info("Response " + str(response.status_code) + " connecting to " + url)
-	except Exception as rex:
-		thisLogger.info("Error calling " + url + " " + str(rex))
-	#
-	return None
+	return CLIENT.call(endpoint,action,body,content)
 
 #################################################################
 # Use NodeService
@@ -129,6 +137,21 @@ def spinning_cursor():
         for cursor in '|/-\\':
             yield cursor
 
+#################################################################
+# Get and parse the summary of an application, this runs on a
+# worker of the client pipeline
+#################################################################
+def getApplicationSummary(appId):
+	if appId is None:
+		return None
+	body="<app:getApplicationSummaryById><app:applicationId><xsd:id>"+ appId + "</xsd:id></app:applicationId></app:getApplicationSummaryById>"
+	appInfo=doAppCall("getApplicationSummaryById",body)
+	if appInfo is None:
+		return None
+	with PROFILER.phase("parse"):
+		approot = xmlExtract.fromstring(appInfo)
+	return xmlExtract.APPSUMMARY.first(approot)
+
 #################################################################
 # Display application list
 #################################################################
@@ -138,41 +161,46 @@ def displayApplications(nodeId,sort="name",loop=False,notrunning=False,dofilter=
 	appList=doAppCall("getApplicationsMappedToNode",body)
 	if appList is not None:
 		spinner = spinning_cursor()
-		root=ET.fromstring(appList)
+		with PROFILER.phase("parse"):
+			root=xmlExtract.fromstring(appList)
 		loopCnt=1
 		while doLoop:
 			startT = int(time.time())
 			applications=[]
-			statusList={}
-			for app in root.findall('./soapenv:Body/ns:getApplicationsMappedToNodeResponse/',ns_apps):
+			notCollected=0
+			PROFILER.begin("applications")
+			apps=list(xmlExtract.MAPPEDAPPS.records(root))
+			summaries=CLIENT.pipeline([app["id"] for app in apps],getApplicationSummary)
+			for app in apps:
 				sys.stdout.write((spinner.next()))
 				sys.stdout.flush()
 				sys.stdout.write('\b')
-				appId=app.find("./ax2162:id",ns_apps).text
-				appName=app.find("./ax2162:name",ns_apps).text
+				appId=app["id"]
+				appName=app["name"]
 				#
 				# Get application status
 				#
-				if appId is not None:
-					body="<app:getApplicationSummaryById><app:applicationId><xsd:id>"+ appId + "</xsd:id></app:applicationId></app:getApplicationSummaryById>"
-					appInfo=doAppCall("getApplicationSummaryById",body)
-					if appInfo is not None:
-						approot = ET.fromstring(appInfo)
-						st=approot.find("./soapenv:Body/ns:getApplicationSummaryByIdResponse/ns:return/ax2164:runtimeStateEnum",ns_apps)
-						folder=approot.find("./soapenv:Body/ns:getApplicationSummaryByIdResponse/ns:return/ax2164:folder/ax2162:name",ns_apps).text
-						if folder is None:
-							folder=""
-						version=approot.find("./soapenv:Body/ns:getApplicationSummaryByIdResponse/ns:return/ax2164:templateVersion",ns_apps).text
-						status=st.text
+				summary=next(summaries)
+				if summary is not None:
+					folder=summary["folder"]
+					if folder is None:
+						folder=""
+					version=summary["version"]
+					status=summary["state"]
 
-						sync=approot.find("./soapenv:Body/ns:getApplicationSummaryByIdResponse/ns:return/ax2164:synchronization",ns_apps).text
-					else:
-						status="UNKNOWN"
+					sync=summary["sync"]
+				elif DEADLINE.isExpired():
+					# Not asked for, the server did not say it is UNKNOWN
+					notCollected+=1
+					continue
 				else:
-					status="UNKNOWN"	
+					folder=""
+					version=""
+					status="UNKNOWN"
+					sync=""
 	
 				# Add application to the list
-				appObj={ "id":appId,"name":appName,"version":version,"status":status,"sync":sync}
+				appObj=amxRecords.AppRecord(appId,appName,version,status,sync,folder)
 				# Check options	
 				addApp=True
 				if dofilter: # Only display app(s) in filterString
@@ -187,37 +215,41 @@ def displayApplications(nodeId,sort="name",loop=False,notrunning=False,dofilter=
 				# Add app to the list if ok
 				if addApp:
 					applications.append(appObj)
-					# store status list count
-					if status in statusList:
-						statusList[status] += 1
-					else:
-						statusList[status] = 1
 			#
 			# End of loop application loop
 			#
+			PROFILER.end()
+			PROFILER.begin("output")
 
 			# Sort and display the application list
-			sortedApplications=sorted(applications,key=itemgetter(sort),reverse=False)
+			sortedApplications=sorted(applications,key=attrgetter(sort),reverse=False)
             
 			if doSummary is False:
 				includeFunctions.logHeader("Id       Application                                      Version                  Sync      Status  ",length=LINEC)
 			for app in sortedApplications:
-				buffer="%-8s%-50.50s%-25s%-10.10s%-10s" % (app["id"],app["name"],app["version"],app["sync"],app["status"])
 				if doSummary is False:
-					thisLogger.info(buffer)
+					thisLogger.info(app.getLine())
 
 			elapsed=(time.time() - startT)
 			now = datetime.datetime.now()
-			includeFunctions.logHeader(now.strftime("%Y-%m-%d %H:%M:%S") + " " + str(len(sortedApplications)) + " applications in " + str(int(elapsed)) + " s",length=LINEC)
-			for status in statusList:
-				buffer="%-25s%3s" % (status,statusList[status])
+			collected=str(len(sortedApplications)) + " applications"
+			if notCollected > 0:
+				collected+=", " + str(notCollected) + " not collected,"
+			includeFunctions.logHeader(now.strftime("%Y-%m-%d %H:%M:%S") + " " + collected + " in " + str(int(elapsed)) + " s" + DEADLINE.getMark(),length=LINEC)
+			for status,count in amxRecords.STATES.count(app.state for app in sortedApplications):
+				buffer="%-25s%3s" % (status,count)
 				thisLogger.info(buffer)
 			thisLogger.info(LINE)
+			PROFILER.end()
+			CALLSTATS.logSummary(thisLogger,CALLSTATSFILE)
+			CLIENT.logLimits(thisLogger)
 			# Handle looping
 			if loop:
 				thisLogger.info("Sleeping (" + str(loopCnt) + ")")
 				loopCnt=loopCnt + 1
-				time.sleep(LOOPSLEEP)
+				with PROFILER.phase("sleep"):
+					time.sleep(LOOPSLEEP)
+				DEADLINE.start()
 				thisLogger.info("")
 			else:
 				doLoop=False
@@ -228,22 +260,26 @@ def displayApplications(nodeId,sort="name",loop=False,notrunning=False,dofilter=
 #################################################################
 def getEnvironment(loop=False):
 	envId=None
+	backoff=readinessProbe.Backoff(cap=CONNECTSLEEP)
 	while envId == None:
+		if loop and not CLIENT.waitReady():
+			break
 		envInfo=doEnvCall("getAllEnv","")
 		if envInfo is not None:
-			root = ET.fromstring(envInfo)
-			for env in root.findall("./soapenv:Body/ns:getAllEnvResponse/",ns_env):
-				name=env.find("./ax277:name",ns_env).text
+			with PROFILER.phase("parse"):
+				root = xmlExtract.fromstring(envInfo)
+			for env in xmlExtract.ENVS.records(root):
+				name=env["name"]
 				if "BPM" in name:
-					envId=env.find("./ax277:id",ns_env).text
+					envId=env["id"]
 					thisLogger.info(name + " : " + envId)
 					break
 		else:
 			# if not looping then exit here
-			if loop == False:
+			if loop == False or DEADLINE.isExpired():
 				break
 			else:
-				time.sleep(CONNECTSLEEP)
+				backoff.sleep(DEADLINE)
 	if envId is None:			
 		thisLogger.info("Could not get BPM Env Info")
 
@@ -256,23 +292,25 @@ def getBPMNode(envId):
 	body="<node:getNodesInEnvironment><node:envIdentifier><xsd:id>" + envId + "</xsd:id></node:envIdentifier><node:input><xsd:filterCriteria></xsd:filterCriteria><xsd:itemsPerPage>10</xsd:itemsPerPage><xsd:requestedPage>1</xsd:requestedPage></node:input></node:getNodesInEnvironment>" 
 	nodeInfo=doNodeCall("getNodesInEnvironment",body)
 	if nodeInfo is not None:
-		root= ET.fromstring(nodeInfo)
-		for node in root.findall("./soapenv:Body/ns:getNodesInEnvironmentResponse/ns:return/",ns_node):
-			if "nodeSummary" in node.tag:
-				nodeName=node.find("./ax219:name",ns_node).text
-				nodeId=node.find("./ax219:id",ns_node).text
-				thisLogger.info(nodeName + " : " + nodeId)
-				break
+		with PROFILER.phase("parse"):
+			root= xmlExtract.fromstring(nodeInfo)
+		node=xmlExtract.NODES.first(root)
+		if node is not None:
+			nodeId=node["id"]
+			thisLogger.info(node["name"] + " : " + nodeId)
 
 	return nodeId
 #################################################################
 # START HERE
 #################################################################
-VERSION="1.51"
+VERSION="1.63"
 SCRIPTNAME=os.path.basename(__file__)
 DIRNAME=os.path.dirname(__file__)
-thisLogger=includeFunctions.logSetup(SCRIPTNAME,logging.INFO,isConsole=True,logDir=".")
+thisLogger=includeFunctions.logSetup(SCRIPTNAME,logging.INFO,isConsole=True,logDir=".",queued=True)
 includeFunctions.logToggle(SCRIPTNAME)
+CAPTURE=payloadCapture.captureSetup(SCRIPTNAME,".")
+CALLSTATS=CallStats()
+CALLSTATSFILE=SCRIPTNAME.replace(".py",".calls.json")
 #
 SCRIPTNAME=os.path.basename(__file__)
 DIRNAME=os.path.dirname(__file__)
@@ -289,12 +327,6 @@ else:
 	cfgFile=False
 #
 #################################################################
-# Setup namespace dictionaries
-#################################################################
-ns_apps={"ax2162":"http://types.core.api.admin.amf.tibco.com/xsd","ax2164":"http://application.amx.api.admin.amf.tibco.com/xsd","soapenv":"http://schemas.xmlsoap.org/soap/envelope/","ns":"http://application.amx.api.admin.amf.tibco.com"}
-ns_env={"soapenv":"http://schemas.xmlsoap.org/soap/envelope/","ns":"http://env.amx.api.admin.amf.tibco.com","ax277":"http://types.core.api.admin.amf.tibco.com/xsd"}
-ns_node={"soapenv":"http://schemas.xmlsoap.org/soap/envelope/","ns":"http://node.amx.api.admin.amf.tibco.com","ax219":"http://types.core.api.admin.amf.tibco.com/xsd","ax226":"http://node.amx.api.admin.amf.tibco.com"}
-#################################################################
 if cfgFile:
 	try:
 		AMXADMINURL=amxctrl.ADMINBASEURL
@@ -309,6 +341,8 @@ else:
     AMXADMINUSER="root"
     AMXADMINPASSWD="t"
  
+CLIENT=adminClient.AdminClient(AMXADMINURL + "/amxadministrator",AMXADMINUSER,AMXADMINPASSWD,thisLogger,CALLSTATS,CAPTURE,basicAuth=True,
+	timeouts=runDeadline.getTimeouts(amxctrl if cfgFile else None))
 #################################################################
 CONNECTSLEEP=30
 LOOPSLEEP=10
@@ -327,7 +361,10 @@ if __name__ == '__main__':
 	doSummary=False
 	filterString=""
 	#
-	argv=sys.argv[1:]
+	argv,PROFILER=profiler.profileSetup(sys.argv[1:])
+	CALLSTATS.profiler=PROFILER
+	argv,DEADLINE=runDeadline.deadlineSetup(argv,amxctrl if cfgFile else None)
+	CLIENT.deadline=DEADLINE
 	try:	
 		opts,args=getopt.getopt(argv,"htnasf:",["filter=","test","notrunning","amxbpm","summary"])  
 	except:
@@ -363,11 +400,16 @@ if __name__ == '__main__':
 		thisLogger.info(" refresh every " + str(LOOPSLEEP) + " seconds"),	
 	#
 	thisLogger.info("")
+	PROFILER.begin("environment")
 	envId=getEnvironment(loop)
+	PROFILER.end()
 	if envId is not None:
+		PROFILER.begin("node")
 		nodeId=getBPMNode(envId)
+		PROFILER.end()
 		# display the list of applications
 		if nodeId is not None:
 			displayApplications(nodeId,sort="name",loop=loop,notrunning=notrunning,dofilter=dofilter,filterString=filterString,doSummary=doSummary)
 
 	thisLogger.info("")
+	PROFILER.logSummary(thisLogger)
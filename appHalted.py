@@ -9,6 +9,12 @@
 #################################################################
 # 12/07/2021	1.00	Created
 # 02/02/2023    1.2     Added -i --ignore option
+# 19/10/2026    1.3     Latency and size of each REST call, summary at the end
+# 19/10/2026    1.4     Added --profile
+# 19/10/2026    1.5     Parsing in parseHalted, used by benchAppHalted
+# 19/10/2026    1.6     Response parsed with the xmlExtract HALTED record
+# 19/10/2026    1.7     Parsed with lxml when it is installed
+# 19/10/2026    1.8     Call timeouts from httpConnectionTimeout, added --deadline
 #################################################################
 import requests
 import logging
@@ -20,14 +26,19 @@ import signal
 import getopt
 from requests.auth import HTTPBasicAuth
 from includes import includeFunctions
+from includes.callStats import CallStats
+from includes import profiler
+from includes import xmlExtract
+from includes import runDeadline
 from datetime import datetime,timedelta
-import xml.etree.ElementTree as ET
 #
 SCRIPTNAME=os.path.basename(__file__)
 DIRNAME=os.path.dirname(__file__)
 #
 thisLogger=includeFunctions.logSetup(SCRIPTNAME, logging.INFO,isConsole=True)
 includeFunctions.logToggle(SCRIPTNAME)
+CALLSTATS=CallStats()
+CALLSTATSFILE=SCRIPTNAME.replace(".py",".calls.json")
 #################################################################
 # Functions
 #################################################################
@@ -50,16 +61,22 @@ def loadIgnoreFile(fileName):
 #################################################################
 def doRetry(instance):
 
-
+    if DEADLINE.isExpired():
+        return "not retried, run deadline passed"
     try:
         result="Retry KO"
-        response=requests.put(retyrlUrl + instance,headers=headers,auth=HTTPBasicAuth(BPMUSER, BPMPASSWD))
+        response=CALLSTATS.call("retry","instance",requests.put,retyrlUrl + instance,headers=headers,auth=HTTPBasicAuth(BPMUSER, BPMPASSWD),timeout=DEADLINE.getTimeout(TIMEOUTS))
         if response.status_code == 200 or response.status_code == 204:
             result="Retry OK"
         else:
             result="Retry KO " + str(response.status_code)
+    except runDeadline.DeadlineExceeded:
+        result="not retried, run deadline passed"
     except Exception as rex:
-        result="KO " + str(rex)
+        if DEADLINE.isExpired():
+            result="KO, run deadline passed during the retry"
+        else:
+            result="KO " + str(rex)
 
     return result
 
@@ -70,7 +87,7 @@ def getHalted():
     try:
         halted=None
         includeFunctions.logHeader("Calling " + BPMURL)
-        response=requests.get(fullQuery,headers=headers,auth=HTTPBasicAuth(BPMUSER, BPMPASSWD))
+        response=CALLSTATS.call("query","halted",requests.get,fullQuery,headers=headers,auth=HTTPBasicAuth(BPMUSER, BPMPASSWD),timeout=DEADLINE.getTimeout(TIMEOUTS))
         if response.status_code == 200:
             thisLogger.debug("Query executed OK " + str(response.status_code))
             # Got the halted instances
@@ -83,6 +100,17 @@ def getHalted():
 
     return halted
 
+#################################################################
+# Parse the halted instances, returns (instance id,template) pairs
+#################################################################
+def parseHalted(halted):
+    instances=[]
+    root=xmlExtract.fromstring(halted)
+    for procInstance in xmlExtract.HALTED.records(root):
+        instances.append((procInstance["id"],procInstance["template"]))
+
+    return instances
+
 #################################################################
 # Display help message
 #################################################################
@@ -96,15 +124,15 @@ def doHelp():
 	thisLogger.info("")
 	thisLogger.info("--retry -r      Retry Halted Instances")
 	thisLogger.info("--help -h       This message")
+	for line in profiler.HELP + runDeadline.HELP:
+		thisLogger.info(line)
 	thisLogger.info("")
 	thisLogger.info("")
 
 #################################################################
 # START HERE
 #################################################################
-VERSION="1.2"
-# XMLNS setup
-ns_apps={"proc":"http://www.tibco.com/bx/2009/management/processManagerType"}
+VERSION="1.8"
 # Queries and paths
 query="SELECT%20INSTANCE.ID%2C%20INSTANCE.NAME%2C%20INSTANCE.FAILED_ACTIVITY_NAME%2C%20INSTANCE.START_DATE%2C%20harmonie_case_number%2C%20INSTANCE.ACTIVITY_FAULT_NAME%2C%20INSTANCE.ACTIVITY_FAULT_DATA%20FROM%20process/9999"
 queryPath="/bpm/rest/process/query/halted/instance/"
@@ -142,13 +170,18 @@ fullQuery=BPMURL + queryPath + query
 retyrlUrl= BPMURL + retryPath
 #
 headers={'content-type': "application/json"}
+TIMEOUTS=runDeadline.getTimeouts(amxctrl if cfgFile else None)
+# No deadline unless one is set, --deadline or runDeadline in amxctrl.py
+DEADLINE=runDeadline.Deadline()
 
 if __name__ == '__main__':
     
     #
     # Check options
     #
-    argv=sys.argv[1:]
+    argv,PROFILER=profiler.profileSetup(sys.argv[1:])
+    CALLSTATS.profiler=PROFILER
+    argv,DEADLINE=runDeadline.deadlineSetup(argv,amxctrl if cfgFile else None)
 	
     try:
         opts,args=getopt.getopt(argv,"hri:v",["help","retry","ignore="])
@@ -176,18 +209,17 @@ if __name__ == '__main__':
     includeFunctions.logHeader(SCRIPTNAME + " " + VERSION,thisLevel=logging.INFO)
 
     # Get list of halted instances
-    halted=getHalted()
+    with PROFILER.phase("query"):
+        halted=getHalted()
 
     if halted is not None:
         thisLogger.info("Found halted instances")
-        root=ET.fromstring(halted)
+        with PROFILER.phase("parse"):
+            instances=parseHalted(halted)
         indexNum=0
         procs={}
-        for procInstance in root.findall("./proc:processInstances/proc:processInstance",ns_apps):
+        for processInstance,processTemplate in instances:
             indexNum+=1
-            # Got the instance, extract the info
-            processTemplate=procInstance.find("./proc:processQName/proc:processName",ns_apps).text
-            processInstance=procInstance.find("./proc:id",ns_apps).text
             #
             if processTemplate in procs:
                 procs[processTemplate]  += 1
@@ -203,7 +235,8 @@ if __name__ == '__main__':
                         result="ignored, " + s + " in " + processTemplate
                         break
                 if doThis:
-                    result=doRetry(processInstance)
+                    with PROFILER.phase("retry"):
+                        result=doRetry(processInstance)
                     
             else:
                 result=""
@@ -219,7 +252,10 @@ if __name__ == '__main__':
             thisLogger.info(buffer)
 
         buffer="%-75s %4d" % ("Halted Total", indexNum)
-        includeFunctions.logHeader(buffer)
+        includeFunctions.logHeader(buffer + DEADLINE.getMark())
 
     else:
-        includeFunctions.logHeader("No Halted Instances Found")
+        includeFunctions.logHeader("No Halted Instances Found" + DEADLINE.getMark())
+
+    CALLSTATS.logSummary(thisLogger,CALLSTATSFILE)
+    PROFILER.logSummary(thisLogger)
@@ -11,17 +11,29 @@
 # 02/07/2020	1.01	Completed
 # 03/07/2020	1.20	Tidied messages and code
 # 21/06/2021	1.30	Updated for AMX BPM 4.3
+# 19/10/2026	1.31	Queued logging, output is written off the collection loop
+# 19/10/2026	1.32	Raw payloads go to capture files instead of the debug log
+# 19/10/2026	1.33	Latency and size of each admin call, summary after each run
+# 19/10/2026	1.34	Added --profile
+# 19/10/2026	1.35	Responses parsed with the xmlExtract records
+# 19/10/2026	1.36	Parsed with lxml when it is installed
+# 19/10/2026	1.37	DAAs kept as amxRecords.DaaRecord
+# 19/10/2026	1.38	Calls through adminClient, timeouts from httpConnectionTimeout, added --deadline
 #################################################################
-import requests
 import sys
 import os
 import getopt
 import signal
 import datetime
 import logging
-import re
-import xml.etree.ElementTree as ET
 from includes import includeFunctions
+from includes import payloadCapture
+from includes.callStats import CallStats
+from includes import profiler
+from includes import xmlExtract
+from includes import amxRecords
+from includes import adminClient
+from includes import runDeadline
 #################################################################
 # Functions
 #################################################################
@@ -52,6 +64,8 @@ def doHelp():
 	print
 	print("--remove -r          Remove unused applications")
 	print("--all -a             Show all DAAs")
+	for line in profiler.HELP + runDeadline.HELP:
+		print(line)
 	print
 
 #################################################################
@@ -59,59 +73,16 @@ def doHelp():
 #################################################################
 def doCall(endpoint,action,body,content="text/xml"):
 
-	url=AMXADMINURL + "/services/" + endpoint
-	headers={'content-type': content,"Connection":"keep-alive","pragma":"no-cache","Cache-Control":"no-cache","xsrfToken":XSRFTOKEN,"SOAPAction":"urn:"+action}
-	try:
-		thisLogger.debug("Calling " + url)
-		thisLogger.debug(body)
-		response=SESSION.post(url,data=body,headers=headers)
-		if response.status_code == 200 or response.status_code == 204:
-			thisLogger.debug("Call OK")
-			if "<html>" in response.content:
-				thisLogger.error("Invalid response from server")
-				return None
-			else:
-				return response.content 
-		else:
-			thisLogger.error("Response " + str(response.status_code) + " connecting to " + url)
-	except Exception as rex:
-		thisLogger.error("Error calling " + url + " " + str(rex))
-	#
-	return None 
+	thisLogger.debug(body)
+	return CLIENT.call(endpoint,action,body,content)
 
 #################################################################
 # Simulate amx admin login form to get SSO_ID cookie
 # in the session
 #################################################################
 def getToken():
-	global XSRFTOKEN
-	url=AMXADMINURL + "/j_security_check"
-	headers={'User-agent':USER_AGENT,"Connection":"keep-alive","pragma":"no-cache","Cache-Control":"no-cache","Referer":AMXADMINURL}
-	data={"j_username" : AMXADMINUSER,"j_password":AMXADMINPASSWD}
-	try:
-		thisSession=requests.Session()
-		response=thisSession.post(url,data=data,headers=headers)
-		if response.status_code == 200:
-			if "SSO_ID" in thisSession.cookies:
-				thisLogger.debug("Got SSO_ID cookie")
-				# AMX BPM 4.3 requires a csrfToken thats in admin.jsp
-				response=thisSession.post(AMXADMINURL + "/admin.jsp",data=data,headers=headers)
-				if "csrfToken" in response.content:
-					p = re.compile("csrfToken.*;")
-					res=p.search(response.content)
-					XSRFTOKEN=res.group(0).split("'")[1].strip("'")
-					thisLogger.info("Got csrfToken from content")
-				else:
-					XSRFTOKEN=""
-
-				return thisSession
 
-		else:
-			thisLogger.info("Response " + str(response.status_code) + " connecting to " + url)
-	except Exception as rex:
-		thisLogger.error("Error calling " + url + " " + str(rex))
-	#
-	return None
+	return CLIENT.login()
 
 #################################################################
 # Get list of DAAs
@@ -124,7 +95,7 @@ def doDAA():
 	thisLogger.debug("Call " + endpoint)
 	response=doCall(endpoint,action,body)	
 	if response is not None:
-		thisLogger.debug("Rtn:" + response)
+		thisLogger.debug("Rtn: %d bytes",len(response))
 	else:
 		thisLogger.warn("Nothing returned")
 	return response
@@ -150,7 +121,7 @@ def spinning_cursor():
 #################################################################
 # START HERE
 #################################################################
-VERSION="1.30"
+VERSION="1.38"
 #
 SCRIPTNAME=os.path.basename(__file__)
 DIRNAME=os.path.dirname(__file__)
@@ -165,10 +136,6 @@ else:
 	print("Cannot find amxctrl.py, using defaults")
 	cfgFile=False
 
-#################################################################
-# Setup namespace dictionaries
-#################################################################
-ns_apps={"soapenv":"http://schemas.xmlsoap.org/soap/envelope/","ns":"http://daa.amx.api.admin.amf.tibco.com","ax2128":"http://daa.amx.api.admin.amf.tibco.com/xsd","ax2133":"http://types.core.api.admin.amf.tibco.com/xsd"}
 #################################################################
 if cfgFile:
     AMXADMINURL=amxctrl.AMXADMINURL
@@ -180,12 +147,13 @@ else:
     AMXADMINPASSWD="t"
  
 #################################################################
-thisLogger=includeFunctions.logSetup(SCRIPTNAME,logging.INFO,isConsole=True,logDir=".")
+thisLogger=includeFunctions.logSetup(SCRIPTNAME,logging.INFO,isConsole=True,logDir=".",queued=True)
 includeFunctions.logToggle(SCRIPTNAME)
+CAPTURE=payloadCapture.captureSetup(SCRIPTNAME,".")
+CALLSTATS=CallStats()
+CALLSTATSFILE=SCRIPTNAME.replace(".py",".calls.json")
+CLIENT=adminClient.AdminClient(AMXADMINURL,AMXADMINUSER,AMXADMINPASSWD,thisLogger,CALLSTATS,CAPTURE,timeouts=runDeadline.getTimeouts(amxctrl if cfgFile else None))
 #################################################################
-SESSION=requests.Session()
-XSRFTOKEN=""
-USER_AGENT="Mozilla/5.0 (compatible; MSIE 9.0; Windows NT 6.1; WOW64; Trident/5.0)"
 LINE=("=" * 110)
 #
 if __name__ == '__main__':
@@ -196,7 +164,10 @@ if __name__ == '__main__':
 	removeApps=False
 	allApps=False
 	#
-	argv=sys.argv[1:]
+	argv,PROFILER=profiler.profileSetup(sys.argv[1:])
+	CALLSTATS.profiler=PROFILER
+	argv,DEADLINE=runDeadline.deadlineSetup(argv,amxctrl if cfgFile else None)
+	CLIENT.deadline=DEADLINE
 	try:	
 		opts,args=getopt.getopt(argv,"hra",["help","remove","all"])
 	except:
@@ -218,45 +189,55 @@ if __name__ == '__main__':
 	thisLogger.info(SCRIPTNAME + " " + VERSION + " " + now.strftime("%Y-%m-%d %H:%M:%S"))
 	thisLogger.info(LINE)
 	thisLogger.info("Connecting to " + AMXADMINURL)
-	SESSION=getToken()
-	if SESSION is not None:
+	PROFILER.begin("login")
+	session=getToken()
+	PROFILER.end()
+	if session is not None:
 		thisLogger.debug("Logged In")
+		PROFILER.begin("daa")
 		result=doDAA()
+		PROFILER.end()
 		if result is not None:
 			# Get all not used apps
-			root = ET.fromstring(result)
+			with PROFILER.phase("parse"):
+				root = xmlExtract.fromstring(result)
 			foundDAA=0
 			unusedDAA=0
 			deletedDAA=0
-			for app in root.findall('./soapenv:Body/ns:getAllUploadedDAAResponse/',ns_apps):
+			for app in xmlExtract.DAAS.records(root):
+				app=amxRecords.DaaRecord(**app)
 				foundDAA+=1
-				appInUse = app.find("./ax2128:used", ns_apps).text
-				if appInUse == "false":
+				if not app.used:
 					unusedDAA += 1
 
-				if appInUse == "false" or allApps:
-					appName=app.find("./ax2128:daaFileName",ns_apps).text
-					appId=app.find("./ax2128:daaId",ns_apps).text
-					appTemplate=app.find("./ax2128:applicationTemplateIdVersion",ns_apps).text
+				if not app.used or allApps:
+					appTemplate=app.template
 					if appTemplate is None:
 						appTemplate=""
 					# Show details and delete if required
-					includeFunctions.logHeader("Template " + appTemplate + " DAA " + appName + " In Use : " + appInUse)
+					includeFunctions.logHeader("Template " + appTemplate + " DAA " + app.fileName + " In Use : " + ("true" if app.used else "false"))
 					# Try and remove the application
-					if appInUse == "false" and removeApps:
-						result=deleteDAA(appId)
+					if not app.used and removeApps:
+						with PROFILER.phase("remove"):
+							result=deleteDAA(app.id)
 						if result is not None:
 							sCnt=0
-							resRoot = ET.fromstring(result)
-							for res in resRoot.findall('./soapenv:Body/ns:deleteDAASResponse/', ns_apps):
-								summary=res.find("./ax2133:summary",ns_apps).text
-								thisLogger.info("-- " + summary)
+							resRoot = xmlExtract.fromstring(result)
+							for res in xmlExtract.DAADELETED.records(resRoot):
+								thisLogger.info("-- " + res["summary"])
 								sCnt+=1
 							if sCnt == 0:
 								pass
 							deletedDAA+=1
+						elif DEADLINE.isExpired():
+							thisLogger.error("Not deleted, run deadline passed")
 						else:
 							thisLogger.error("Cannot delete this DAA")
 
-			includeFunctions.logHeader("Total : " + str(foundDAA) + " Unused : " + str(unusedDAA) + " Deleted : " + str(deletedDAA))
+			includeFunctions.logHeader("Total : " + str(foundDAA) + " Unused : " + str(unusedDAA) + " Deleted : " + str(deletedDAA) + DEADLINE.getMark())
+		elif DEADLINE.getMark():
+			includeFunctions.logHeader("No DAAs," + DEADLINE.getMark())
+	CALLSTATS.logSummary(thisLogger,CALLSTATSFILE)
+	CLIENT.logLimits(thisLogger)
+	PROFILER.logSummary(thisLogger)
 	includeFunctions.logHeader("The End")
\ No newline at end of file
@@ -12,19 +12,33 @@
 # 01/12/2021	1.1 	Created (copied from appRemove.py)
 # 03/12/2021	1.2		Added application only display and
 #                       tidied code
+# 19/10/2026	1.3		Queued logging, output is written off the collection loop
+# 19/10/2026	1.4		Raw payloads go to capture files instead of the debug log
+# 19/10/2026	1.5		Latency and size of each admin call, summary after each run
+# 19/10/2026	1.6		Added --profile
+# 19/10/2026	1.7		Responses parsed with the xmlExtract records
+# 19/10/2026	1.8		Parsed with lxml when it is installed
+# 19/10/2026	1.9		Applications kept as amxRecords.AppRecord
+# 19/10/2026	1.10	Calls through adminClient, folder views fetched on its pipeline
+# 19/10/2026	1.11	Calls in flight adapt to the admin server, limits shown after each run
+# 19/10/2026	1.12	Call timeouts from httpConnectionTimeout, added --deadline
 #################################################################
 from time import time
 import time
-import requests
 import sys
 import os
 import getopt
 import signal
 import datetime
 import logging
-import re
-import xml.etree.ElementTree as ET
 from includes import includeFunctions
+from includes import payloadCapture
+from includes.callStats import CallStats
+from includes import profiler
+from includes import xmlExtract
+from includes import amxRecords
+from includes import adminClient
+from includes import runDeadline
 #################################################################
 # Functions
 #################################################################
@@ -57,6 +71,8 @@ def doHelp():
 	print("--loop -l  <seconds> Set seconds between loops")
 	print("--summary -s         Display only summary info")
 	print("--test -t            Test mode, wait for admin connection and loop")
+	for line in profiler.HELP + runDeadline.HELP:
+		print(line)
 	print
 
 #################################################################
@@ -64,66 +80,16 @@ def doHelp():
 #################################################################
 def doCall(endpoint,action,body,content="text/xml"):
 
-	url=AMXADMINURL + "/services/" + endpoint
-	headers={'content-type': content,"Connection":"keep-alive","pragma":"no-cache","Cache-Control":"no-cache","xsrfToken":XSRFTOKEN,"SOAPAction":"urn:"+action}
-	try:
-		thisLogger.debug("Calling " + url)
-		thisLogger.debug(body)
-		response=SESSION.post(url,data=body,headers=headers)
-		if response.status_code == 200 or response.status_code == 204:
-			thisLogger.debug("Call OK")
-			if "<html>" in response.content:
-				thisLogger.error("Invalid response from server")
-				return None
-			else:
-				return response.content 
-		else:
-			thisLogger.error("Response " + str(response.status_code) + " connecting to " + url)
-	except Exception as rex:
-		thisLogger.error("Error calling " + url + " " + str(rex))
-	#
-	return None 
+	thisLogger.debug(body)
+	return CLIENT.call(endpoint,action,body,content)
 
 #################################################################
 # Simulate amx admin login form to get SSO_ID cookie
 # in the session
 #################################################################
 def getToken(loop=False):
-	
-	global XSRFTOKEN
-	url=AMXADMINURL + "/j_security_check"
-	headers={'User-agent':USER_AGENT,"Connection":"keep-alive","pragma":"no-cache","Cache-Control":"no-cache","Referer":AMXADMINURL}
-	data={"j_username" : AMXADMINUSER,"j_password":AMXADMINPASSWD}
-	while 1 == 1:
-		try:
-			thisSession=requests.Session()
-			response=thisSession.post(url,data=data,headers=headers)
-			if response.status_code == 200:
-				if "SSO_ID" in thisSession.cookies:
-					thisLogger.debug("Got SSO_ID cookie")
-					# AMX BPM 4.3 requires a csrfToken thats in admin.jsp
-					response=thisSession.post(AMXADMINURL + "/admin.jsp",data=data,headers=headers)
-					if "csrfToken" in response.content:
-						p = re.compile("csrfToken.*;")
-						res=p.search(response.content)
-						XSRFTOKEN=res.group(0).split("'")[1].strip("'")
-						thisLogger.info("Got csrfToken from content")
-					else:
-						XSRFTOKEN=""
 
-					return thisSession
-
-			else:
-				thisLogger.info("Response " + str(response.status_code) + " connecting to " + url)
-		except Exception as rex:
-			thisLogger.error("Error calling " + url + " " + str(rex))
-		
-		if loop:
-			time.sleep(LOOPSLEEP)
-		else:
-			break
-	#
-	return None
+	return CLIENT.login(loop,LOOPSLEEP)
 
 #################################################################
 # Connect to admin server and get the environment ID
@@ -140,7 +106,7 @@ def getEnvId(loop=False):
 	while 1 == 1:
 		response=doCall(endpoint,action,body)	
 		if response is not None:
-			thisLogger.debug("Rtn:" + response)
+			thisLogger.debug("Rtn: %d bytes",len(response))
 			break
 		else:
 			thisLogger.warn("Nothing returned")
@@ -163,7 +129,7 @@ def getAppStatus(envId):
 	thisLogger.debug("Call " + endpoint)
 	response=doCall(endpoint,action,body)	
 	if response is not None:
-		thisLogger.debug("Rtn:" + response)
+		thisLogger.debug("Rtn: %d bytes",len(response))
 	else:
 		thisLogger.warn("Nothing returned")
 	return response
@@ -181,52 +147,55 @@ def getAppFolderView(folderId, folderName):
 	thisLogger.debug("Call " + endpoint)
 	response=doCall(endpoint,action,body)	
 	if response is not None:
-		thisLogger.debug("Rtn:" + response)
+		thisLogger.debug("Rtn: %d bytes",len(response))
 	else:
 		thisLogger.warn("Nothing returned")
 	return response
 
 #################################################################
-# Display a folders apps and sub folders, this is called 
-# recursivley for each folder/sub folder
+# Get and parse the view of a folder, this runs on a worker of
+# the client pipeline
 #################################################################
-def doFolder(folderId, folderName,level=0):
+def getFolderRoot(folder):
+
+	fResult=getAppFolderView(folder["id"],folder["name"])
+	if fResult is None:
+		return None
+	with PROFILER.phase("parse"):
+		return xmlExtract.fromstring(fResult)
+
+#################################################################
+# Display folders apps and sub folders, this is called 
+# recursivley for the sub folders of each folder. The views of
+# the next folders are fetched while a folder is displayed.
+#################################################################
+def doFolders(folders,level=0):
 
-	fResult=getAppFolderView(folderId,folderName)
 	if level > 0:
 		indent=("  " * level )
 	else:
 		indent=""
 
-	if summaryOnly is False:
-		thisLogger.info( indent + folderName)
-
-	if fResult is not None:
-		ns_apps={"soapenv":"http://schemas.xmlsoap.org/soap/envelope/", "ns":"http://ui.application.amx.api.admin.amf.tibco.com", "ax2201":"http://types.core.api.admin.amf.tibco.com/xsd", "ax2203":"http://application.amx.api.admin.amf.tibco.com/xsd", "ax2214":"http://component.amx.api.admin.amf.tibco.com/xsd", "ax2205":"http://status.amx.api.admin.amf.tibco.com/xsd", "ax2217":"http://stagingarea.amx.api.admin.amf.tibco.com/xsd", "ax2197":"http://exception.core.api.admin.amf.tibco.com/xsd", "ax2198":"http://fixer.core.api.admin.amf.tibco.com/xsd", "ax2210":"http://ui.application.amx.api.admin.amf.tibco.com/xsd", "xsi":"http://www.w3.org/2001/XMLSchema-instance"}
-		objType=""
-		root = ET.fromstring(fResult)
-		# Get folders in this folder
-		for folderLine in root.findall('./soapenv:Body/ns:getAppFolderViewResponse/ns:return/ax2210:folders',ns_apps):
-			fId=folderLine.find("./ax2201:id",ns_apps).text
-			fName=folderLine.find("./ax2201:name",ns_apps).text
-			fPath=folderLine.find("./ax2201:path",ns_apps).text
-			doFolder(fId,fName,level+1)
-		# Get applications in this folder
-		for appLine in root.findall('./soapenv:Body/ns:getAppFolderViewResponse/ns:return/ax2210:applications',ns_apps):
-			aId=appLine.find("./ax2201:id",ns_apps).text
-			aName=appLine.find("./ax2201:name",ns_apps).text
-			aState=appLine.find("./ax2203:runtimeStateEnum",ns_apps).text
-			aSync=appLine.find("./ax2203:synchronization",ns_apps).text
-			aVersion=appLine.find("./ax2203:templateVersion",ns_apps).text
-			appObj={ "id":aId,"name":aName,"version":aVersion,"status":aState,"sync":aSync}
-			G_apps.append(appObj)
-			if summaryOnly is False:
-				buffer="%-8s%-50.50s%-25s%-10.10s%-10s" % (appObj["id"],appObj["name"],appObj["version"],appObj["sync"],appObj["status"])
-				thisLogger.info(indent + " > " + buffer)
-			else:
-				sys.stdout.write((spinner.next()))
-				sys.stdout.flush()
-				sys.stdout.write('\b')
+	roots=CLIENT.pipeline(folders,getFolderRoot)
+	for folder in folders:
+		root=next(roots)
+		folderName=folder["name"]
+		if summaryOnly is False:
+			thisLogger.info( indent + folderName)
+
+		if root is not None:
+			# Folders in this folder
+			doFolders(list(xmlExtract.FOLDERFOLDERS.records(root)),level+1)
+			# Get applications in this folder
+			for appLine in xmlExtract.FOLDERAPPS.records(root):
+				appObj=amxRecords.AppRecord(folder=folderName,**appLine)
+				G_apps.append(appObj)
+				if summaryOnly is False:
+					thisLogger.info(indent + " > " + appObj.getLine())
+				else:
+					sys.stdout.write((spinner.next()))
+					sys.stdout.flush()
+					sys.stdout.write('\b')
 
 #################################################################
 # Spinning
@@ -239,7 +208,7 @@ def spinning_cursor():
 #################################################################
 # START HERE
 #################################################################
-VERSION="1.2"
+VERSION="1.12"
 #
 SCRIPTNAME=os.path.basename(__file__)
 DIRNAME=os.path.dirname(__file__)
@@ -264,12 +233,13 @@ else:
     AMXADMINPASSWD="t"
  
 #################################################################
-thisLogger=includeFunctions.logSetup(SCRIPTNAME,logging.INFO,isConsole=True,logDir=".")
+thisLogger=includeFunctions.logSetup(SCRIPTNAME,logging.INFO,isConsole=True,logDir=".",queued=True)
 includeFunctions.logToggle(SCRIPTNAME)
+CAPTURE=payloadCapture.captureSetup(SCRIPTNAME,".")
+CALLSTATS=CallStats()
+CALLSTATSFILE=SCRIPTNAME.replace(".py",".calls.json")
+CLIENT=adminClient.AdminClient(AMXADMINURL,AMXADMINUSER,AMXADMINPASSWD,thisLogger,CALLSTATS,CAPTURE,timeouts=runDeadline.getTimeouts(amxctrl if cfgFile else None))
 #################################################################
-SESSION=requests.Session()
-XSRFTOKEN=""
-USER_AGENT="Mozilla/5.0 (compatible; MSIE 9.0; Windows NT 6.1; WOW64; Trident/5.0)"
 LOOPSLEEP=30
 LINEC=110
 LINE=("=" * LINEC)
@@ -279,7 +249,10 @@ if __name__ == '__main__':
 	original_sigint = signal.getsignal(signal.SIGINT)
 	signal.signal(signal.SIGINT, exit_gracefully)
 	#
-	argv=sys.argv[1:]
+	argv,PROFILER=profiler.profileSetup(sys.argv[1:])
+	CALLSTATS.profiler=PROFILER
+	argv,DEADLINE=runDeadline.deadlineSetup(argv,amxctrl if cfgFile else None)
+	CLIENT.deadline=DEADLINE
 	try:	
 		opts,args=getopt.getopt(argv,"ahstl:",["help","summary","test","loop","applications"])
 	except:
@@ -316,18 +289,21 @@ if __name__ == '__main__':
 	#
 	G_apps=[]
 	#
+	PROFILER.begin("login")
 	SESSION=getToken(testMode)
+	PROFILER.end()
 	if SESSION is not None:
 		thisLogger.debug("Logged In")
+		PROFILER.begin("environments")
 		result=getEnvId()
+		PROFILER.end()
 		if result is not None:
 			envId=None
-			ns_apps={ "soapenv":"http://schemas.xmlsoap.org/soap/envelope/","ns":"http://env.amx.api.admin.amf.tibco.com","ax2102":"http://host.amx.api.admin.amf.tibco.com/xsd","ax2114":"http://resinstance.amx.api.admin.amf.tibco.com/xsd","ax2108":"http://endpoint.amx.api.admin.amf.tibco.com/xsd","ax2110":"http://application.amx.api.admin.amf.tibco.com/xsd","ax278":"http://types.core.api.admin.amf.tibco.com/xsd","ax274":"http://exception.core.api.admin.amf.tibco.com/xsd","ax285":"http://node.amx.api.admin.amf.tibco.com/xsd","ax296":"http://logging.amx.api.admin.amf.tibco.com/xsd","ax275":"http://fixer.core.api.admin.amf.tibco.com/xsd","ax286":"http://reference.api.admin.amf.tibco.com/xsd","ax283":"http://env.amx.api.admin.amf.tibco.com/xsd","ax294":"http://stagingarea.amx.api.admin.amf.tibco.com/xsd","ax290":"http://status.amx.api.admin.amf.tibco.com/xsd","ax280":"http://svars.amx.api.admin.amf.tibco.com/xsd"}
-			root = ET.fromstring(result)
-			for env in root.findall('./soapenv:Body/ns:getAllEnvResponse/',ns_apps):
-				name = env.find("./ax278:name", ns_apps).text
-				if name.startswith('BPME'):
-					envId = env.find("./ax278:id", ns_apps).text
+			with PROFILER.phase("parse"):
+				root = xmlExtract.fromstring(result)
+			for env in xmlExtract.ENVS.records(root):
+				if env["name"].startswith('BPME'):
+					envId = env["id"]
 					break
 
 			if envId is not None:
@@ -340,6 +316,7 @@ if __name__ == '__main__':
 
 					startT = int(time.time())
 					G_apps=[]
+					PROFILER.begin("applications")
 					result=getAppStatus(envId)
 					
 					if result is not None:
@@ -347,27 +324,18 @@ if __name__ == '__main__':
 						if summaryOnly:
 							spinner = spinning_cursor()
 					
-						ns_apps={ "soapenv":"http://schemas.xmlsoap.org/soap/envelope/","ns":"http://application.amx.api.admin.amf.tibco.com","ax2159":"http://types.core.api.admin.amf.tibco.com/xsd" ,"ax2171":"http://stagingarea.amx.api.admin.amf.tibco.com/xsd" ,"ax2182":"http://binding.amx.api.admin.amf.tibco.com/xsd" ,"ax2161":"http://application.amx.api.admin.amf.tibco.com/xsd" ,"ax2173":"http://permission.common.amx.api.admin.amf.tibco.com/xsd" ,"ax2164":"http://svars.amx.api.admin.amf.tibco.com/xsd" ,"ax2175":"http://logging.amx.api.admin.amf.tibco.com/xsd" ,"ax2155":"http://exception.core.api.admin.amf.tibco.com/xsd" ,"ax2156":"http://fixer.core.api.admin.amf.tibco.com/xsd" ,"ax2167":"http://status.amx.api.admin.amf.tibco.com/xsd" ,"ax2178":"http://component.amx.api.admin.amf.tibco.com/xsd" ,"ax2190":"http://resinstance.amx.api.admin.amf.tibco.com/xsd","xsi":"http://www.w3.org/2001/XMLSchema-instance"}
-						root = ET.fromstring(result)
+						with PROFILER.phase("parse"):
+							root = xmlExtract.fromstring(result)
 
 						# Get the list of top-level folders
-						for folderInfo in root.findall('./soapenv:Body/ns:getApplicationViewDetailsResponse/ns:return/ax2161:appFolderDesc',ns_apps):
-							fName=folderInfo.find("./ax2159:name",ns_apps).text
-							fId=folderInfo.find("./ax2159:id",ns_apps).text
-							doFolder(fId,fName)
+						doFolders(list(xmlExtract.VIEWFOLDERS.records(root)))
 						
 						# Get the list of top-level apps
-						for appInfo in root.findall('./soapenv:Body/ns:getApplicationViewDetailsResponse/ns:return/ax2161:appDesc',ns_apps):
-							aName=appInfo.find("./ax2159:name",ns_apps).text
-							aId=appInfo.find("./ax2159:id",ns_apps).text
-							aState=appInfo.find("./ax2161:runtimeStateEnum",ns_apps).text
-							aSync=appInfo.find("./ax2161:synchronization",ns_apps).text
-							aVersion=appInfo.find("./ax2161:templateVersion",ns_apps).text
-							appObj={ "id":aId,"name":aName,"version":aVersion,"status":aState,"sync":aSync}
+						for appInfo in xmlExtract.VIEWAPPS.records(root):
+							appObj=amxRecords.AppRecord(**appInfo)
 							G_apps.append(appObj)
 							if summaryOnly is False:
-								buffer="%-8s%-50.50s%-25s%-10.10s%-10s" % (appObj["id"],appObj["name"],appObj["version"],appObj["sync"],appObj["status"])
-								thisLogger.info(" > " + buffer)
+								thisLogger.info(" > " + appObj.getLine())
 							else:
 								sys.stdout.write((spinner.next()))
 								sys.stdout.flush()
@@ -380,37 +348,34 @@ if __name__ == '__main__':
 							# sys.stdout.write('\b')
 							# thisLogger.info("")
 
-
+						PROFILER.end()
+						PROFILER.begin("output")
 						elapsed=(time.time() - startT)
 						now = datetime.datetime.now()
-						includeFunctions.logHeader(now.strftime("%Y-%m-%d %H:%M:%S") + " " + str(len(G_apps)) + " applications in " + str(int(elapsed)) + " s",length=LINEC)
-						# Build summary
-						statusList={}
-						for appObj in G_apps:	
-							status=appObj["status"]
-							if status in statusList:
-								statusList[status] += 1
-							else:
-								statusList[status] = 1
-
-							if applicationDisplay:
-								buffer="%-8s%-50.50s%-25s%-10.10s%-10s" % (appObj["id"],appObj["name"],appObj["version"],appObj["sync"],appObj["status"])
-								thisLogger.info("> " + buffer)
-
+						includeFunctions.logHeader(now.strftime("%Y-%m-%d %H:%M:%S") + " " + str(len(G_apps)) + " applications in " + str(int(elapsed)) + " s" + DEADLINE.getMark(),length=LINEC)
 						if applicationDisplay:
+							for appObj in G_apps:
+								thisLogger.info("> " + appObj.getLine())
 							thisLogger.info(LINE)
 
-						for status in statusList:
-							buffer="%-25s%3s" % (status,statusList[status])
+						# Build summary
+						for status,count in amxRecords.STATES.count(appObj.state for appObj in G_apps):
+							buffer="%-25s%3s" % (status,count)
 							thisLogger.info(buffer)
 
 						thisLogger.info(LINE)
 
+					PROFILER.end()
+					CALLSTATS.logSummary(thisLogger,CALLSTATSFILE)
+					CLIENT.logLimits(thisLogger)
 					if testMode is False:
 						doLoop=False
 					else:
 						includeFunctions.logHeader("Sleeping " + str(LOOPSLEEP) + " seconds")
-						time.sleep(LOOPSLEEP)
+						with PROFILER.phase("sleep"):
+							time.sleep(LOOPSLEEP)
+						DEADLINE.start()
 	
 	thisLogger.info("")
+	PROFILER.logSummary(thisLogger)
 	includeFunctions.logHeader("The End")
\ No newline at end of file
@@ -0,0 +1,232 @@
+#!/usr/bin/python
+#
+#  Benchmark analyse.readFile on generated BPM logs
+#
+#  Each run is done in its own process so that the peak RSS
+#  reported is the one of that run only.
+#
+#  --follow checks that the monitor and --ingest read a log that
+#  ends in a partial line only once.
+#
+#  TIBCO Software France 2026
+#
+#  19/10/2026 1.00  Created
+#  19/10/2026 1.01  --follow check of a log ending in a partial line
+#
+import sys
+import os
+import getopt
+import time
+import json
+import resource
+import subprocess
+import genBPMLog
+#
+#################################################################
+# Display help message
+#################################################################
+def doHelp():
+	print
+	print(SCRIPTNAME + " version " + VERSION)
+	print
+	print("Measure analyse.py parse throughput and peak memory on generated logs")
+	print
+	print(SCRIPTNAME + " [ options ]")
+	print
+	print("--sizes -s <n,n,..>      Log sizes in lines, default 1e5,1e6,1e7")
+	print("--modes -m <m,m,..>      readFile modes, lines, mmap and top, default all")
+	print("--dir -d <dir>           Where generated logs are kept and reused, default .")
+	print("--payload -p <bytes>     Payload size of generated messages, default 2000")
+	print("--output -o <file>       Write the results as JSON")
+	print("--baseline -b <file>     Compare with results written by an earlier --output")
+	print("--follow -F              Check that a log ending in a partial line is read once")
+	print
+
+#################################################################
+# Run readFile once and print the result as JSON, this is what
+# the child process does
+#################################################################
+def runChild(fileName,mode,lines):
+	import analyse
+	startT=time.time()
+	if mode == "mmap":
+		results=analyse.readFile(fileName,useMmap=True)
+	elif mode == "top":
+		results=analyse.readFile(fileName,topN=100)
+	else:
+		results=analyse.readFile(fileName)
+	elapsed=time.time() - startT
+	# ru_maxrss is in KB on Linux
+	maxRss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	print(json.dumps({"mode":mode,"lines":lines,"transactions":results["latency"].count,"seconds":elapsed,"linesPerSec":lines / elapsed if elapsed > 0 else 0,"maxRssKB":maxRss}))
+
+#################################################################
+# Follow and ingest a log cut in the middle of its last line, twice,
+# then with the rest of it. Each transaction must be counted once,
+# returns the failures.
+#################################################################
+def checkFollow(logDir):
+	import analyse
+	from includes.transactionDB import TransactionDB
+	fileName=os.path.join(logDir,"follow.log")
+	dbName=os.path.join(logDir,"follow.db")
+	genBPMLog.generate(fileName,count=200,payloadSize=200)
+	with open(fileName,"rb") as f:
+		data=f.read()
+	expected=analyse.readFile(fileName)["latency"].count
+	# Cut after the Payload: of the last transaction
+	cut=data.rindex(b"Payload:") + 4
+	failed=[]
+	try:
+		with open(fileName,"wb") as f:
+			f.write(data[:cut])
+		state=analyse.followFile(fileName,analyse.newState(keep=False))
+		partial=state["stats"]["latency"].count
+		print("%-30s %10d %12d" % ("follow partial",partial,state["scan"]["offset"]))
+		state=analyse.followFile(fileName,state)
+		print("%-30s %10d %12d" % ("follow partial again",state["stats"]["latency"].count,state["scan"]["offset"]))
+		if state["stats"]["latency"].count != partial:
+			failed.append("follow counted %d then %d" % (partial,state["stats"]["latency"].count))
+		if os.path.exists(dbName):
+			os.remove(dbName)
+		db=TransactionDB(dbName)
+		fileKey=analyse.getFileKey(fileName)
+		added,lines=analyse.ingestFile(fileName,db)
+		resume=db.getResume(fileKey)
+		print("%-30s %10d %12d" % ("ingest partial",added,resume))
+		added,lines=analyse.ingestFile(fileName,db)
+		print("%-30s %10d %12d" % ("ingest partial again",added,db.getResume(fileKey)))
+		# The next ingest carries on from where this one did
+		if added > 0 or db.getResume(fileKey) != resume:
+			failed.append("ingest resume went from %d to %d" % (resume,db.getResume(fileKey)))
+		with open(fileName,"wb") as f:
+			f.write(data)
+		state=analyse.followFile(fileName,state)
+		print("%-30s %10d %12d" % ("follow complete",state["stats"]["latency"].count,state["scan"]["offset"]))
+		if state["stats"]["latency"].count != expected:
+			failed.append("follow counted %d of %d" % (state["stats"]["latency"].count,expected))
+		added,lines=analyse.ingestFile(fileName,db)
+		count=db.summary()[0]
+		print("%-30s %10d %12d" % ("ingest complete",added,db.getResume(fileKey)))
+		if count != expected:
+			failed.append("ingest stored %d of %d" % (count,expected))
+		db.close()
+	finally:
+		for name in (fileName,dbName):
+			if os.path.exists(name):
+				os.remove(name)
+	return failed
+
+#################################################################
+# Count lines of an existing file
+#################################################################
+def countLines(fileName):
+	lines=0
+	with open(fileName,"rb") as f:
+		while True:
+			chunk=f.read(1048576)
+			if not chunk:
+				break
+			lines+=chunk.count(b"\n")
+	return lines
+
+#################################################################
+# Generate a log of about size lines, unless it is already there
+#################################################################
+def getLogFile(logDir,size,payloadSize):
+	fileName=os.path.join(logDir,"bench_%d_%d.log" % (size,payloadSize))
+	if os.path.exists(fileName):
+		return fileName,countLines(fileName)
+	print("Generating " + fileName)
+	done,lines=genBPMLog.generate(fileName,concurrency=20,payloadSize=payloadSize,maxLines=size)
+	return fileName,lines
+
+#################################################################
+# START HERE
+#################################################################
+VERSION="1.01"
+#
+SCRIPTNAME=os.path.basename(__file__)
+DIRNAME=os.path.dirname(os.path.abspath(__file__))
+#
+LINE="=" * 100
+#
+if __name__ == '__main__':
+
+	argv=sys.argv[1:]
+	if len(argv) == 4 and argv[0] == "--child":
+		runChild(argv[1],argv[2],int(argv[3]))
+		sys.exit()
+
+	sizes=[100000,1000000,10000000]
+	modes=["lines","mmap","top"]
+	logDir="."
+	payloadSize=2000
+	outputFile=None
+	baselineFile=None
+	follow=False
+
+	try:
+		opts,args=getopt.getopt(argv,"hs:m:d:p:o:b:F",["sizes=","modes=","dir=","payload=","output=","baseline=","follow"])
+	except:
+		doHelp()
+		exit(1)
+	for opt, arg in opts:
+		if opt == '-h':
+			doHelp()
+			sys.exit()
+		elif opt in ("-s","--sizes"):
+			sizes=[int(float(s)) for s in arg.split(",")]
+		elif opt in ("-m","--modes"):
+			modes=arg.split(",")
+		elif opt in ("-d","--dir"):
+			logDir=arg
+		elif opt in ("-p","--payload"):
+			payloadSize=int(arg)
+		elif opt in ("-o","--output"):
+			outputFile=arg
+		elif opt in ("-b","--baseline"):
+			baselineFile=arg
+		elif opt in ("-F","--follow"):
+			follow=True
+
+	if follow:
+		print(LINE)
+		print("%-30s %10s %12s" % ("Read","Trans","Offset"))
+		print(LINE)
+		failed=checkFollow(logDir)
+		print(LINE)
+		if failed:
+			print("Not read once: " + ", ".join(failed))
+			sys.exit(1)
+		print("Each transaction read once")
+		sys.exit()
+
+	baseline={}
+	if baselineFile is not None:
+		with open(baselineFile) as f:
+			for res in json.load(f):
+				baseline[(res["size"],res["mode"])]=res
+
+	allResults=[]
+	print(LINE)
+	print("%-12s %-6s %12s %12s %10s %14s %12s %10s" % ("Size","Mode","Lines","Trans","Seconds","Lines/s","Peak RSS MB","vs base"))
+	print(LINE)
+	for size in sizes:
+		fileName,lines=getLogFile(logDir,size,payloadSize)
+		for mode in modes:
+			output=subprocess.check_output([sys.executable,os.path.join(DIRNAME,SCRIPTNAME),"--child",os.path.abspath(fileName),mode,str(lines)])
+			res=json.loads(output.decode("utf-8").strip().splitlines()[-1])
+			res["size"]=size
+			allResults.append(res)
+			compare=""
+			base=baseline.get((size,mode))
+			if base is not None and base["linesPerSec"] > 0:
+				compare="%+.1f%%" % ((res["linesPerSec"] / base["linesPerSec"] - 1) * 100)
+			print("%-12d %-6s %12d %12d %10.2f %14d %12.1f %10s" % (size,mode,lines,res["transactions"],res["seconds"],res["linesPerSec"],res["maxRssKB"] / 1024.0,compare))
+	print(LINE)
+
+	if outputFile is not None:
+		with open(outputFile,"w") as f:
+			json.dump(allResults,f,indent=1)
+		print("Results written to " + outputFile)
@@ -0,0 +1,198 @@
+#!/usr/bin/python
+#
+#  Benchmark appHalted query, parse and retry against bpmRestStub
+#
+#  The stub runs in its own process, started again for each count,
+#  and keeps retried instances halted so that each thread count
+#  retries the same instances.
+#
+#  TIBCO Software France 2026
+#
+#  19/10/2026 1.00  Created
+#
+import sys
+import os
+import getopt
+import time
+import json
+import signal
+import socket
+import logging
+import subprocess
+from multiprocessing.pool import ThreadPool
+import appHalted
+import bpmRestStub
+from includes import includeFunctions
+#
+#################################################################
+# Display help message
+#################################################################
+def doHelp():
+	print
+	print(SCRIPTNAME + " version " + VERSION)
+	print
+	print("Measure appHalted query parse time and retry throughput against bpmRestStub")
+	print
+	print(SCRIPTNAME + " [ options ]")
+	print
+	print("--counts -n <n,n,..>     Halted instances served by the stub, default 1e4,1e5")
+	print("--retries -r <n>         Instances retried for each thread count, default 1000")
+	print("--threads -t <n,n,..>    Retries in flight at the same time, default 1,4,16")
+	print("--port -p <port>         Port of the stub, default 18280")
+	print("--latency -l <dist>      Stub latency, see bpmRestStub, default fixed:0")
+	print("--retry-fail -f <rate>   Fraction of retries the stub fails, default 0")
+	print("--rate -R <calls/s>      Stub rate limit, default no limit")
+	print("--output -o <file>       Write the results as JSON")
+	print("--baseline -b <file>     Compare with results written by an earlier --output")
+	print
+
+#################################################################
+# Start the stub and wait until it accepts connections
+#################################################################
+def startStub(port,count,stubArgs):
+	args=[sys.executable,os.path.join(DIRNAME,"bpmRestStub.py"),"-p",str(port),"-n",str(count),"--keep"] + stubArgs
+	stub=subprocess.Popen(args,stdout=DEVNULL,stderr=DEVNULL)
+	deadline=time.time() + 120
+	while time.time() < deadline:
+		if stub.poll() is not None:
+			raise RuntimeError("bpmRestStub exited with " + str(stub.returncode))
+		try:
+			socket.create_connection(("localhost",port),1).close()
+			return stub
+		except socket.error:
+			time.sleep(0.2)
+	stub.kill()
+	raise RuntimeError("bpmRestStub not listening on port " + str(port))
+
+def stopStub(stub):
+	stub.send_signal(signal.SIGINT)
+	stub.wait()
+
+#################################################################
+# Retry instances with threads in flight, returns (seconds,results)
+#################################################################
+def runRetries(instances,threads):
+	pool=ThreadPool(threads)
+	try:
+		startT=time.time()
+		results=pool.map(appHalted.doRetry,instances,chunksize=1)
+		return (time.time() - startT,results)
+	finally:
+		pool.close()
+		pool.join()
+
+#################################################################
+# Query, parse and retry with each thread count for one count
+#################################################################
+def runCount(count,retries,threadCounts):
+	rows=[]
+	appHalted.CALLSTATS.reset()
+	startT=time.time()
+	halted=appHalted.getHalted()
+	querySecs=time.time() - startT
+	if halted is None:
+		raise RuntimeError("No response to the halted query")
+	startT=time.time()
+	instances=appHalted.parseHalted(halted)
+	parseSecs=time.time() - startT
+	toRetry=[instance for instance,template in instances[:retries]]
+	for threads in threadCounts:
+		appHalted.CALLSTATS.reset()
+		retrySecs,results=runRetries(toRetry,threads)
+		call=appHalted.CALLSTATS.calls.get(("retry","instance"))
+		p50,p95=call["latency"].percentiles([50,95]) if call else (0,0)
+		ok=sum(1 for result in results if result == "Retry OK")
+		limited=sum(1 for result in results if result.endswith(" 429"))
+		rows.append({"count":count,"instances":len(instances),"bytes":len(halted),"querySecs":querySecs,"parseSecs":parseSecs,
+			"parsePerSec":len(instances) / parseSecs if parseSecs > 0 else 0,"threads":threads,"retries":len(toRetry),"retrySecs":retrySecs,
+			"retriesPerSec":len(toRetry) / retrySecs if retrySecs > 0 else 0,"p50Ms":p50 / 1000.0,"p95Ms":p95 / 1000.0,"ok":ok,"limited":limited,"failed":len(toRetry) - ok - limited})
+	return rows
+
+def getCompare(res,base,key):
+	if base is None or base[key] <= 0:
+		return ""
+	return "%+.1f%%" % ((res[key] / base[key] - 1) * 100)
+
+#################################################################
+# START HERE
+#################################################################
+VERSION="1.00"
+#
+SCRIPTNAME=os.path.basename(__file__)
+DIRNAME=os.path.dirname(os.path.abspath(__file__))
+#
+LINE="=" * 140
+DEVNULL=open(os.devnull,"w")
+#
+if __name__ == '__main__':
+
+	counts=[10000,100000]
+	retries=1000
+	threadCounts=[1,4,16]
+	port=18280
+	stubArgs=[]
+	outputFile=None
+	baselineFile=None
+
+	argv=sys.argv[1:]
+	try:
+		opts,args=getopt.getopt(argv,"hn:r:t:p:l:f:R:o:b:",["counts=","retries=","threads=","port=","latency=","retry-fail=","rate=","output=","baseline="])
+	except:
+		doHelp()
+		exit(1)
+	for opt, arg in opts:
+		if opt == '-h':
+			doHelp()
+			sys.exit()
+		elif opt in ("-n","--counts"):
+			counts=[int(float(n)) for n in arg.split(",")]
+		elif opt in ("-r","--retries"):
+			retries=int(float(arg))
+		elif opt in ("-t","--threads"):
+			threadCounts=[int(n) for n in arg.split(",")]
+		elif opt in ("-p","--port"):
+			port=int(arg)
+		elif opt in ("-l","--latency"):
+			stubArgs+=["--latency",arg]
+		elif opt in ("-f","--retry-fail"):
+			stubArgs+=["--retry-fail",arg]
+		elif opt in ("-R","--rate"):
+			stubArgs+=["--rate",arg]
+		elif opt in ("-o","--output"):
+			outputFile=arg
+		elif opt in ("-b","--baseline"):
+			baselineFile=arg
+
+	# Only warnings of appHalted, not each call
+	includeFunctions.logLevel(logging.WARNING)
+	url="http://localhost:%d" % port
+	appHalted.fullQuery=url + bpmRestStub.QUERYPATH + appHalted.query
+	appHalted.retyrlUrl=url + bpmRestStub.RETRYPATH
+
+	baseline={}
+	if baselineFile is not None:
+		with open(baselineFile) as f:
+			for res in json.load(f):
+				baseline[(res["count"],res["threads"])]=res
+
+	allResults=[]
+	print(LINE)
+	print("%-9s %9s %8s %8s %8s %10s %7s %8s %8s %9s %8s %8s %7s %7s %8s %8s" % ("Count","Instances","MB","Query s","Parse s","Parse/s","Threads","Retries","Retry s","Retry/s","p50 ms","p95 ms","Failed","429","Parse vs","Retry vs"))
+	print(LINE)
+	for count in counts:
+		stub=startStub(port,count,stubArgs)
+		try:
+			rows=runCount(count,retries,threadCounts)
+		finally:
+			stopStub(stub)
+		for res in rows:
+			allResults.append(res)
+			base=baseline.get((res["count"],res["threads"]))
+			print("%-9d %9d %8.1f %8.2f %8.2f %10d %7d %8d %8.2f %9.1f %8.1f %8.1f %7d %7d %8s %8s" % (res["count"],res["instances"],res["bytes"] / 1048576.0,res["querySecs"],res["parseSecs"],res["parsePerSec"],
+				res["threads"],res["retries"],res["retrySecs"],res["retriesPerSec"],res["p50Ms"],res["p95Ms"],res["failed"],res["limited"],getCompare(res,base,"parsePerSec"),getCompare(res,base,"retriesPerSec")))
+	print(LINE)
+
+	if outputFile is not None:
+		with open(outputFile,"w") as f:
+			json.dump(allResults,f,indent=1)
+		print("Results written to " + outputFile)
@@ -0,0 +1,152 @@
+#!/usr/bin/python
+#
+#  Check the concurrencyLimiter against simulated services
+#
+#  Each service answers after a latency drawn at random, the same
+#  whatever the load unless it has a capacity, then the calls over it
+#  queue and each takes longer. The limiter must not go down for the
+#  jitter of a service whose latency does not depend on the load, nor
+#  for one action being slower than another, and must go down when the
+#  service fails some of them, and must stay under its cap when the
+#  service queues calls.
+#
+#  TIBCO Software France 2026
+#
+#  19/10/2026 1.00  Created
+#
+import sys
+import os
+import getopt
+import time
+import random
+import threading
+from multiprocessing.pool import ThreadPool
+import genBPMLog
+from includes.concurrencyLimiter import AIMDLimiter
+#
+#################################################################
+# Display help message
+#################################################################
+def doHelp():
+	print
+	print(SCRIPTNAME + " version " + VERSION)
+	print
+	print("Check the concurrency limiter of adminClient against simulated services")
+	print
+	print(SCRIPTNAME + " [ options ]")
+	print
+	print("--calls -n <n>           Calls to each service, default 600")
+	print("--median -m <ms>         Median latency, lognormal, default 20")
+	print("--sigma -s <sigma>       Sigma of the latency, default 0.5")
+	print("--cap -c <n>             Cap of the limiter, default 8")
+	print("--repeat -r <n>          Runs of each service, default 3")
+	print("--seed -S <seed>         Random seed, default 1")
+	print
+
+#################################################################
+# Simulated services, name, (action,latency factor) pairs, calls
+# served at the same time before they queue, fraction of errors and
+# what the limiter must do: stay at its cap, stay under it or go down
+#################################################################
+SERVICES=[
+	("jitter",[("getApplicationSummaryById",1.0)],0,0.0,"cap"),
+	("actions",[("getApplicationSummaryById",1.0),("getApplicationsMappedToNode",5.0)],0,0.0,"cap"),
+	("queueing",[("getApplicationSummaryById",1.0)],3,0.0,"under"),
+	("errors",[("getApplicationSummaryById",1.0)],0,0.05,"down"),
+]
+
+#################################################################
+# Make calls to a simulated service through a limiter, returns it
+#################################################################
+def runService(actions,capacity,errorRate,calls,median,sigma,cap,seed):
+	rnd=random.Random(seed)
+	getLatency=genBPMLog.getLatency(rnd,"lognormal:%g:%g" % (median,sigma))
+	limiter=AIMDLimiter("service",cap)
+	lock=threading.Lock()
+	served=[0]
+
+	def call(i):
+		action,factor=actions[i % len(actions)]
+		ticket=limiter.acquire()
+		with lock:
+			served[0]+=1
+			# Calls over the capacity wait for those before them
+			load=max(1.0,served[0] / float(capacity)) if capacity else 1.0
+			seconds=getLatency() * factor * load / 1000.0
+			ok=rnd.random() >= errorRate
+		time.sleep(seconds)
+		with lock:
+			served[0]-=1
+		limiter.release(ticket,ok,action)
+
+	pool=ThreadPool(cap * 2)
+	try:
+		pool.map(call,range(calls),chunksize=1)
+	finally:
+		pool.terminate()
+	return limiter
+
+#################################################################
+# START HERE
+#################################################################
+VERSION="1.00"
+#
+SCRIPTNAME=os.path.basename(__file__)
+#
+LINE="=" * 100
+#
+if __name__ == '__main__':
+
+	calls=600
+	median=20.0
+	sigma=0.5
+	cap=8
+	repeat=3
+	seed=1
+
+	argv=sys.argv[1:]
+	try:
+		opts,args=getopt.getopt(argv,"hn:m:s:c:r:S:",["calls=","median=","sigma=","cap=","repeat=","seed="])
+	except:
+		doHelp()
+		exit(1)
+	for opt, arg in opts:
+		if opt == '-h':
+			doHelp()
+			sys.exit()
+		elif opt in ("-n","--calls"):
+			calls=int(float(arg))
+		elif opt in ("-m","--median"):
+			median=float(arg)
+		elif opt in ("-s","--sigma"):
+			sigma=float(arg)
+		elif opt in ("-c","--cap"):
+			cap=int(arg)
+		elif opt in ("-r","--repeat"):
+			repeat=int(arg)
+		elif opt in ("-S","--seed"):
+			seed=int(arg)
+
+	failed=[]
+	print(LINE)
+	print("%-10s %4s %9s %6s %6s %4s %6s %6s %10s %11s %-6s %-6s" % ("Service","Run","Seconds","Limit","Peak","Cap","Down","Errors","Latency ms","Baseline ms","Wanted","Check"))
+	print(LINE)
+	for name,actions,capacity,errorRate,wanted in SERVICES:
+		for run in range(repeat):
+			startT=time.time()
+			limiter=runService(actions,capacity,errorRate,calls,median,sigma,cap,seed + run)
+			elapsed=time.time() - startT
+			if wanted == "cap":
+				ok=limiter.decreases == 0 and limiter.limit == cap
+			elif wanted == "under":
+				ok=limiter.limit < cap
+			else:
+				ok=limiter.decreases > 0
+			if not ok:
+				failed.append("%s run %d" % (name,run + 1))
+			print("%-10s %4d %9.2f %6.1f %6.1f %4d %6d %6d %10.1f %11.1f %-6s %-6s" % (name,run + 1,elapsed,limiter.limit,limiter.peak,cap,limiter.decreases,limiter.errors,
+				limiter.service.short * 1000,limiter.service.long * 1000,wanted,"ok" if ok else "FAILED"))
+	print(LINE)
+	if failed:
+		print("Limiter not as wanted for " + ", ".join(failed))
+		sys.exit(1)
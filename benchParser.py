@@ -0,0 +1,268 @@
+#!/usr/bin/python
+#
+#  Benchmark the xmlExtract parser backends on admin and BPM responses
+#
+#  Payloads are generated with the stand-in servers, or are the
+#  responses recorded in payloadCapture files. Each backend parses
+#  each payload in its own process so that the peak RSS reported is
+#  the one of that parse only, and the fields it extracts are checked
+#  against the ElementTree ones.
+#
+#  TIBCO Software France 2026
+#
+#  19/10/2026 1.00  Created
+#
+import sys
+import os
+import getopt
+import time
+import json
+import hashlib
+import resource
+import subprocess
+from includes import xmlExtract
+from includes import payloadCapture
+#
+#################################################################
+# Display help message
+#################################################################
+def doHelp():
+	print
+	print(SCRIPTNAME + " version " + VERSION)
+	print
+	print("Compare parse time, peak memory and extracted fields of the XML parser backends")
+	print
+	print(SCRIPTNAME + " [ options ]")
+	print
+	print("--counts -n <n,n,..>     Applications, DAAs and halted instances generated, default 1e3,1e4")
+	print("--capture -c <f,f,..>    Use the largest response of each operation in these capture")
+	print("                         files instead of generated ones")
+	print("--parsers -x <p,p,..>    Backends, default all installed, " + ",".join(xmlExtract.getBackends()))
+	print("--repeat -r <n>          Parses of each payload, the best is kept, default 3")
+	print("--dir -d <dir>           Where payloads are written and reused, default .")
+	print("--output -o <file>       Write the results as JSON")
+	print("--baseline -b <file>     Compare with results written by an earlier --output")
+	print
+
+#################################################################
+# Records read from the response of each operation
+#################################################################
+RECORDS={
+	"getAllEnv":["ENVS"],
+	"getHostsOnMachine":["HOSTS"],
+	"getNodesInEnvironment":["NODES"],
+	"getApplicationRollupDetails":["COMPONENTS"],
+	"getApplicationViewDetails":["VIEWFOLDERS","VIEWAPPS"],
+	"getAppFolderView":["FOLDERFOLDERS","FOLDERAPPS"],
+	"getApplicationsMappedToNode":["MAPPEDAPPS"],
+	"getApplicationSummaryById":["APPSUMMARY"],
+	"getAllUploadedDAA":["DAAS"],
+	"deleteDAAS":["DAADELETED"],
+	"halted":["HALTED"],
+}
+
+#################################################################
+# Parse and extract once with a backend and print the result as
+# JSON, this is what the child process does
+#################################################################
+def runChild(fileName,records,backend,repeat):
+	xmlExtract.setBackend(backend)
+	extractors=[getattr(xmlExtract,name) for name in records.split(",")]
+	with open(fileName,"rb") as f:
+		payload=f.read()
+	# ru_maxrss is in KB on Linux
+	startRss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	parseSecs=None
+	extractSecs=None
+	for i in range(repeat):
+		startT=time.time()
+		root=xmlExtract.fromstring(payload)
+		elapsed=time.time() - startT
+		parseSecs=elapsed if parseSecs is None else min(parseSecs,elapsed)
+		startT=time.time()
+		found=[list(extractor.records(root)) for extractor in extractors]
+		elapsed=time.time() - startT
+		extractSecs=elapsed if extractSecs is None else min(extractSecs,elapsed)
+		if i == 0:
+			peakRss=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - startRss
+		root=None
+	digest=hashlib.md5(json.dumps(found,sort_keys=True).encode("utf-8")).hexdigest()
+	print(json.dumps({"backend":backend,"bytes":len(payload),"parseSecs":parseSecs,"extractSecs":extractSecs,"records":sum(len(recs) for recs in found),"peakRssKB":peakRss,"digest":digest}))
+
+#################################################################
+# Write a payload, unless it is already there
+#################################################################
+def writePayload(fileName,build):
+	if not os.path.exists(fileName):
+		print("Generating " + fileName)
+		payload=build()
+		with open(fileName,"wb") as f:
+			f.write(payload if isinstance(payload,bytes) else payload.encode("utf-8"))
+	return fileName
+
+#################################################################
+# Generated payloads, the largest responses for count applications
+# and halted instances, returns [(name,records,file)]
+#################################################################
+def getGenerated(payloadDir,count):
+	import amxAdminStub
+	import bpmRestStub
+
+	def getSOAP(endpoint,operation,params):
+		if amxAdminStub.ENTERPRISE is None:
+			# 999 nodes, the most getNodesInEnvironment asks for
+			amxAdminStub.ENTERPRISE=amxAdminStub.getEnterprise(applications=count,folders=0,nodes=999,unused=count)
+		return amxAdminStub.getEnvelope(endpoint,operation,amxAdminStub.OPERATIONS[(endpoint,operation)][0](amxAdminStub.ENTERPRISE,params))
+
+	payloads=[]
+	for endpoint,operation,params in (("ApplicationService","getApplicationViewDetails",{"envId":"1"}),("DAAService","getAllUploadedDAA",{}),("NodeService","getNodesInEnvironment",{"envIdentifier":"1"})):
+		name="%s_%d" % (operation,count)
+		fileName=writePayload(os.path.join(payloadDir,"bench_" + name + ".xml"),lambda: getSOAP(endpoint,operation,params))
+		payloads.append((name,RECORDS[operation],fileName))
+	name="halted_%d" % count
+	fileName=writePayload(os.path.join(payloadDir,"bench_" + name + ".xml"),lambda: bpmRestStub.getHaltedXML(bpmRestStub.getInstances(count)))
+	payloads.append((name,RECORDS["halted"],fileName))
+	amxAdminStub.ENTERPRISE=None
+	return payloads
+
+#################################################################
+# Operation of a recorded response, from its response element as the
+# recorded action is whatever each script called it
+#################################################################
+def getOperation(body):
+	try:
+		root=xmlExtract.fromstring(body)
+	except Exception:
+		# JSON or HTML
+		return None
+	if root.tag == "{%s}queryProcessInstancesOutput" % xmlExtract.PROCESS:
+		return "halted"
+	soapBody=root.find("{%s}Body" % xmlExtract.SOAPENV)
+	if soapBody is None or not len(soapBody):
+		return None
+	return soapBody[0].tag.split("}")[-1].replace("Response","")
+
+#################################################################
+# Recorded payloads, the largest response of each operation
+#################################################################
+def getCaptured(payloadDir,captureFiles):
+	largest={}
+	for captureFile in captureFiles:
+		for run,seq,endpoint,action,body in payloadCapture.readCapture(captureFile):
+			action=getOperation(body)
+			if action in RECORDS and len(body) > len(largest.get(action,b"")):
+				largest[action]=body
+	payloads=[]
+	for action in sorted(largest):
+		name="captured_" + action
+		fileName=os.path.join(payloadDir,"bench_" + name + ".xml")
+		with open(fileName,"wb") as f:
+			f.write(largest[action])
+		payloads.append((name,RECORDS[action],fileName))
+	return payloads
+
+#################################################################
+# START HERE
+#################################################################
+VERSION="1.00"
+#
+SCRIPTNAME=os.path.basename(__file__)
+DIRNAME=os.path.dirname(os.path.abspath(__file__))
+#
+LINE="=" * 128
+#
+if __name__ == '__main__':
+
+	argv=sys.argv[1:]
+	if len(argv) == 5 and argv[0] == "--child":
+		runChild(argv[1],argv[2],argv[3],int(argv[4]))
+		sys.exit()
+
+	counts=[1000,10000]
+	captureFiles=[]
+	backends=xmlExtract.getBackends()
+	repeat=3
+	payloadDir="."
+	outputFile=None
+	baselineFile=None
+
+	try:
+		opts,args=getopt.getopt(argv,"hn:c:x:r:d:o:b:",["counts=","capture=","parsers=","repeat=","dir=","output=","baseline="])
+	except:
+		doHelp()
+		exit(1)
+	for opt, arg in opts:
+		if opt == '-h':
+			doHelp()
+			sys.exit()
+		elif opt in ("-n","--counts"):
+			counts=[int(float(n)) for n in arg.split(",")]
+		elif opt in ("-c","--capture"):
+			captureFiles=arg.split(",")
+		elif opt in ("-x","--parsers"):
+			backends=arg.split(",")
+		elif opt in ("-r","--repeat"):
+			repeat=int(arg)
+		elif opt in ("-d","--dir"):
+			payloadDir=arg
+		elif opt in ("-o","--output"):
+			outputFile=arg
+		elif opt in ("-b","--baseline"):
+			baselineFile=arg
+
+	for backend in backends:
+		if backend not in xmlExtract.BACKENDS:
+			print("XML parser " + backend + " is not available, use one of " + ",".join(xmlExtract.getBackends()))
+			sys.exit(1)
+	# The fields of the other backends are checked against these
+	if "ElementTree" in backends:
+		backends.remove("ElementTree")
+	backends.insert(0,"ElementTree")
+
+	if captureFiles:
+		payloads=getCaptured(payloadDir,captureFiles)
+	else:
+		payloads=[]
+		for count in counts:
+			payloads+=getGenerated(payloadDir,count)
+
+	baseline={}
+	if baselineFile is not None:
+		with open(baselineFile) as f:
+			for res in json.load(f):
+				baseline[(res["payload"],res["backend"])]=res
+
+	allResults=[]
+	differ=[]
+	print(LINE)
+	print("%-38s %8s %-12s %9s %10s %9s %10s %8s %8s %-6s %8s" % ("Payload","MB","Parser","Records","Parse s","Extract s","Peak MB","vs ET","Speedup","Fields","vs base"))
+	print(LINE)
+	for name,records,fileName in payloads:
+		reference=None
+		for backend in backends:
+			output=subprocess.check_output([sys.executable,os.path.join(DIRNAME,SCRIPTNAME),"--child",os.path.abspath(fileName),",".join(records),backend,str(repeat)])
+			res=json.loads(output.decode("utf-8").strip().splitlines()[-1])
+			res["payload"]=name
+			res["seconds"]=res["parseSecs"] + res["extractSecs"]
+			allResults.append(res)
+			if reference is None:
+				reference=res
+			same=res["digest"] == reference["digest"]
+			if not same:
+				differ.append(name + " " + backend)
+			speedup=reference["seconds"] / res["seconds"] if res["seconds"] > 0 else 0
+			compare=""
+			base=baseline.get((name,backend))
+			if base is not None and base["seconds"] > 0:
+				compare="%+.1f%%" % ((res["seconds"] / base["seconds"] - 1) * 100)
+			print("%-38s %8.1f %-12s %9d %10.3f %9.3f %10.1f %8s %7.2fx %-6s %8s" % (name,res["bytes"] / 1048576.0,backend,res["records"],res["parseSecs"],res["extractSecs"],res["peakRssKB"] / 1024.0,
+				"%+.0f%%" % ((res["peakRssKB"] / float(reference["peakRssKB"]) - 1) * 100) if reference["peakRssKB"] > 0 else "",speedup,"same" if same else "DIFF",compare))
+	print(LINE)
+
+	if outputFile is not None:
+		with open(outputFile,"w") as f:
+			json.dump(allResults,f,indent=1)
+		print("Results written to " + outputFile)
+	if differ:
+		print("Fields differ from ElementTree for " + ", ".join(differ))
+		sys.exit(1)
@@ -0,0 +1,216 @@
+#!/usr/bin/python
+#
+#  Local stand-in for the BPM REST calls of appHalted, serves
+#  synthetic halted instances and retries them
+#
+#  Point amxctrl.py at it, for the default port
+#
+#	BPMURL="http://localhost:8280"
+#
+#  TIBCO Software France 2026
+#
+#  19/10/2026 1.00  Created
+#
+import sys
+import os
+import time
+import getopt
+import random
+import logging
+import threading
+from xml.sax.saxutils import escape
+from includes import includeFunctions
+from includes import stubServer
+import genBPMLog
+#
+#################################################################
+# Display help message
+#################################################################
+def doHelp():
+	print
+	print(SCRIPTNAME + " version " + VERSION)
+	print
+	print("Local BPM REST stand-in serving synthetic halted instances")
+	print
+	print(SCRIPTNAME + " [ options ]")
+	print
+	print("--port -p <port>         Port to listen on, default 8280")
+	print("--count -n <n>           Number of halted instances, default 1000")
+	print("--templates -t <n|a,b..> Number of process templates or their names, default 20")
+	print("--latency -l <dist>      Latency of each call in ms, fixed:<ms>, exp:<mean> or")
+	print("                         lognormal:<median>:<sigma>, default fixed:0")
+	print("--per-kb -k <ms>         Extra latency for each KB of response, default 0")
+	print("--errors -e <rate>       Fraction of calls answered with a 500, default 0")
+	print("--retry-fail -f <rate>   Fraction of retries that fail, default 0")
+	print("--rate -r <calls/s>      Calls allowed each second, more get a 429, default no limit")
+	print("--keep -K                Retried instances stay halted, for repeated benchmark runs")
+	print("--seed -s <seed>         Random seed, default 1")
+	print
+
+#################################################################
+# Paths and namespace of the BPM REST calls
+#################################################################
+QUERYPATH="/bpm/rest/process/query/halted/instance/"
+RETRYPATH="/bpm/rest/process/retry/instance/"
+NAMESPACE="http://www.tibco.com/bx/2009/management/processManagerType"
+FAULTS=["ActivityFault","ServiceFault","TimeoutFault","DataMappingFault"]
+
+#################################################################
+# Build the halted instances
+#################################################################
+def getInstances(count=1000,templates=20,seed=1):
+	rnd=random.Random(seed)
+	if isinstance(templates,int):
+		templates=["com.example.bpm.Process%03d" % i for i in range(templates)]
+	instances=[]
+	started=time.time() - 30 * 86400
+	for i in range(count):
+		instances.append({"id":"pvm:%07d" % (i + 1),"template":templates[rnd.randrange(len(templates))],"activity":"Task%02d" % rnd.randrange(50),
+			"fault":FAULTS[rnd.randrange(len(FAULTS))],"start":time.strftime("%Y-%m-%dT%H:%M:%S.000Z",time.gmtime(started + rnd.randrange(30 * 86400)))})
+	return instances
+
+#################################################################
+# Query response, in the processManagerType namespace
+#################################################################
+def getHaltedXML(instances):
+	content=['<?xml version="1.0" encoding="UTF-8"?><queryProcessInstancesOutput xmlns="%s"><processInstances>' % NAMESPACE]
+	for instance in instances:
+		content.append("<processInstance><id>%s</id><processQName><moduleName>%s</moduleName><processName>%s</processName></processQName><state>HALTED</state><startDate>%s</startDate><failedActivityName>%s</failedActivityName><activityFaultName>%s</activityFaultName></processInstance>" %
+			(instance["id"],escape(instance["template"].rsplit(".",1)[0]),escape(instance["template"]),instance["start"],instance["activity"],instance["fault"]))
+	content.append("</processInstances></queryProcessInstancesOutput>")
+	return "".join(content)
+
+#################################################################
+# Request handler
+#################################################################
+class BPMHandler(stubServer.StubHandler):
+
+	def getResponse(self,body):
+		path=self.path.split("?")[0]
+		if not self.getHeader("Authorization").startswith("Basic "):
+			return (path,"",401,"Unauthorized","text/plain",[("WWW-Authenticate",'Basic realm="bpm"')])
+		if not isAllowed():
+			return ("limit","",429,"Too many requests","text/plain",[("Retry-After","1")])
+		if path.startswith(QUERYPATH) and self.command == "GET":
+			return ("query","halted",200,getQueryResponse(),"application/xml",[])
+		if path.startswith(RETRYPATH) and self.command == "PUT":
+			return self.doRetry(path[len(RETRYPATH):])
+		return (path,"",404,"Not found","text/plain",[])
+
+	def doRetry(self,instanceId):
+		global GENERATION
+		with LOCK:
+			instance=INSTANCES.get(instanceId)
+			if instance is None:
+				return ("retry","instance",404,"Instance " + instanceId + " is not halted","text/plain",[])
+			if RETRYFAIL > 0 and RND.random() < RETRYFAIL:
+				return ("retry","instance",500,"<fault><faultCode>BX_RETRY_FAILED</faultCode><faultString>Retry of %s failed in %s</faultString></fault>" % (instanceId,instance["activity"]),"application/xml",[])
+			if not KEEP:
+				del INSTANCES[instanceId]
+				GENERATION+=1
+		return ("retry","instance",204,"","text/plain",[])
+
+#
+# Query response, built again only after instances were retried
+#
+def getQueryResponse():
+	with LOCK:
+		generation=GENERATION
+		cached=CACHE.get(generation)
+		if cached is not None:
+			return cached
+		instances=[instance for instance in ORDER if instance["id"] in INSTANCES]
+	response=getHaltedXML(instances)
+	with LOCK:
+		CACHE.clear()
+		CACHE[generation]=response
+	return response
+
+#
+# Token bucket of RATE calls a second
+#
+def isAllowed():
+	global TOKENS,REFILLED
+	if RATE <= 0:
+		return True
+	with LOCK:
+		now=time.time()
+		TOKENS=min(max(RATE,1.0),TOKENS + (now - REFILLED) * RATE)
+		REFILLED=now
+		if TOKENS < 1:
+			return False
+		TOKENS-=1
+		return True
+
+#################################################################
+# START HERE
+#################################################################
+VERSION="1.00"
+#
+SCRIPTNAME=os.path.basename(__file__)
+DIRNAME=os.path.dirname(__file__)
+#
+LOCK=threading.Lock()
+ORDER=[]
+INSTANCES={}
+CACHE={}
+GENERATION=0
+RETRYFAIL=0.0
+RATE=0.0
+TOKENS=0.0
+REFILLED=time.time()
+KEEP=False
+RND=random.Random(1)
+#
+if __name__ == '__main__':
+
+	port=8280
+	count=1000
+	templates=20
+	latency="fixed:0"
+	perKB=0.0
+	errorRate=0.0
+	seed=1
+
+	argv=sys.argv[1:]
+	try:
+		opts,args=getopt.getopt(argv,"hp:n:t:l:k:e:f:r:Ks:",["port=","count=","templates=","latency=","per-kb=","errors=","retry-fail=","rate=","keep","seed="])
+	except:
+		doHelp()
+		exit(1)
+	for opt, arg in opts:
+		if opt == '-h':
+			doHelp()
+			sys.exit()
+		elif opt in ("-p","--port"):
+			port=int(arg)
+		elif opt in ("-n","--count"):
+			count=int(float(arg))
+		elif opt in ("-t","--templates"):
+			templates=int(arg) if arg.isdigit() else arg.split(",")
+		elif opt in ("-l","--latency"):
+			latency=arg
+		elif opt in ("-k","--per-kb"):
+			perKB=float(arg)
+		elif opt in ("-e","--errors"):
+			errorRate=float(arg)
+		elif opt in ("-f","--retry-fail"):
+			RETRYFAIL=float(arg)
+		elif opt in ("-r","--rate"):
+			RATE=float(arg)
+			TOKENS=max(RATE,1.0)
+		elif opt in ("-K","--keep"):
+			KEEP=True
+		elif opt in ("-s","--seed"):
+			seed=int(arg)
+
+	thisLogger=includeFunctions.logSetup(SCRIPTNAME,logging.INFO,isConsole=True,logDir=".")
+	includeFunctions.logToggle(SCRIPTNAME)
+	ORDER=getInstances(count,templates,seed)
+	INSTANCES=dict((instance["id"],instance) for instance in ORDER)
+	RND=random.Random(seed)
+	server=stubServer.StubServer(("",port),BPMHandler,thisLogger,genBPMLog.getLatency(random.Random(seed),latency),perKB,errorRate,seed)
+	includeFunctions.logHeader(SCRIPTNAME + " " + VERSION + " listening on port " + str(port))
+	thisLogger.info("%d halted instances of %d templates" % (len(ORDER),len(set(instance["template"] for instance in ORDER))))
+	thisLogger.info("BPMURL=\"http://localhost:%d\"" % port)
+	stubServer.serve(server)
@@ -0,0 +1,187 @@
+#!/usr/bin/python
+#
+#  Generate a synthetic BPM.log with CXF interceptor messages
+#
+#  TIBCO Software France 2026
+#
+#  19/10/2026 1.00  Created
+#
+import sys
+import os
+import getopt
+import math
+import random
+import heapq
+import calendar
+from datetime import datetime
+#
+#################################################################
+# Display help message
+#################################################################
+def doHelp():
+	print
+	print(SCRIPTNAME + " version " + VERSION)
+	print
+	print("Generate a BPM logfile with CXF Logging interceptor messages for analyse.py")
+	print
+	print(SCRIPTNAME + " [ options ]")
+	print
+	print("--file -f <file>         Output file name, default BPM.log")
+	print("--count -n <count>       Number of transactions, default 10000")
+	print("--lines -L <lines>       Stop once this many lines are written, overrides count")
+	print("--concurrency -c <n>     Transactions in flight at the same time, default 10")
+	print("--latency -l <dist>      Latency in ms, fixed:<ms>, exp:<mean> or lognormal:<median>:<sigma>")
+	print("                         default lognormal:200:1.0")
+	print("--resets -r <rate>       Fraction of transactions followed by a reset error, default 0.001")
+	print("--errors -e <rate>       Fraction of transactions with a 500 response, default 0.01")
+	print("--payload -p <bytes>     Payload size of each message, default 2000")
+	print("--seed -s <seed>         Random seed, default 1")
+	print
+
+#################################################################
+# Operations the generated transactions are spread over
+#################################################################
+OPERATIONS=[
+	("GET","/bpm/rest/process/query/halted/instance/%d",None),
+	("PUT","/bpm/rest/process/retry/instance/%d",None),
+	("GET","/bpm/rest/worklist/items/%d",None),
+	("POST","/bpm/services/WorkListService",'"getWorkListItems"'),
+	("POST","/bpm/services/ProcessManagerService",'"queryProcessInstances"'),
+]
+MONTHS=["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
+
+#################################################################
+# Log timestamp from epoch milliseconds
+#################################################################
+def getStamp(millis):
+	stamp=datetime.utcfromtimestamp(millis // 1000)
+	return "%02d %s %04d %02d:%02d:%02d,%03d" % (stamp.day,MONTHS[stamp.month - 1],stamp.year,stamp.hour,stamp.minute,stamp.second,millis % 1000)
+
+#################################################################
+# Return a function giving a latency in ms from a distribution
+#################################################################
+def getLatency(rnd,dist):
+	parts=dist.split(":")
+	if parts[0] == "fixed":
+		value=float(parts[1])
+		return lambda: value
+	elif parts[0] == "exp":
+		mean=float(parts[1])
+		return lambda: rnd.expovariate(1.0 / mean)
+	elif parts[0] == "lognormal":
+		mu=math.log(float(parts[1]))
+		sigma=float(parts[2]) if len(parts) > 2 else 1.0
+		return lambda: rnd.lognormvariate(mu,sigma)
+	raise ValueError("Unknown latency distribution " + dist)
+
+#################################################################
+# Payload split in lines of about 80 bytes, like pretty printed XML
+#################################################################
+def getPayload(size):
+	lines=["Payload: <payload>"]
+	filler="  <item>" + "x" * 64 + "</item>"
+	for i in range(max(0,size - len(lines[0])) // (len(filler) + 1)):
+		lines.append(filler)
+	lines.append("</payload>")
+	return "\n".join(lines)
+
+#################################################################
+# Write the log file, returns (transactions,lines) written
+#################################################################
+def generate(fileName="BPM.log",count=10000,concurrency=10,latency="lognormal:200:1.0",resetRate=0.001,errorRate=0.01,payloadSize=2000,seed=1,maxLines=0):
+	rnd=random.Random(seed)
+	nextLatency=getLatency(rnd,latency)
+	payload=getPayload(payloadSize)
+	payloadLines=payload.count("\n") + 1
+	# Arrivals are spaced so that about concurrency calls overlap
+	median=nextLatency()
+	meanGap=max(median / float(max(concurrency,1)),0.001)
+	now=calendar.timegm(datetime(2020,6,24,8,0,0).timetuple()) * 1000
+	inFlight=[]
+	lines=0
+	done=0
+	started=0
+	with open(fileName,"w") as f:
+		write=f.write
+		while True:
+			more=started < count if maxLines <= 0 else lines < maxLines
+			# Finish calls that end before the next arrival, or to make room
+			while inFlight and (not more or len(inFlight) >= concurrency or inFlight[0][0] <= now):
+				end,id,code,thread=heapq.heappop(inFlight)
+				write("%s [%s] INFO  org.apache.cxf.interceptor.LoggingOutInterceptor - Outbound Message\n" % (getStamp(end),thread))
+				write("---------------------------\nID: %d\nResponse-Code: %d\nEncoding: UTF-8\nContent-Type: text/xml\nHeaders: {}\n%s\n--------------------------------------\n" % (id,code,payload))
+				lines+=8 + payloadLines
+				if rnd.random() < resetRate:
+					write("%s [%s] ERROR com.tibco.bx.core - java.net.SocketException: Connection reset by peer\n" % (getStamp(end),thread))
+					lines+=1
+				done+=1
+				now=max(now,end)
+			if not more:
+				break
+			started+=1
+			now+=int(rnd.expovariate(1.0 / meanGap)) + 1
+			method,path,action=OPERATIONS[rnd.randrange(len(OPERATIONS))]
+			if "%d" in path:
+				path=path % rnd.randrange(1,100000)
+			thread="http-" + str(rnd.randrange(1,50))
+			write("%s [%s] INFO  org.apache.cxf.interceptor.LoggingInInterceptor - Inbound Message\n" % (getStamp(now),thread))
+			headers="{content-type=[text/xml]}"
+			if action is not None:
+				headers="{SOAPAction=[" + action + "], content-type=[text/xml]}"
+			write("----------------------------\nID: %d\nAddress: http://bpmnode:8080%s\nEncoding: UTF-8\nHttp-Method: %s\nContent-Type: text/xml\nHeaders: %s\n%s\n--------------------------------------\n" % (started,path,method,headers,payload))
+			lines+=9 + payloadLines
+			code=500 if rnd.random() < errorRate else 200
+			heapq.heappush(inFlight,(now + int(nextLatency()),started,code,thread))
+	return (done,lines)
+
+#################################################################
+# START HERE
+#################################################################
+VERSION="1.00"
+#
+SCRIPTNAME=os.path.basename(__file__)
+DIRNAME=os.path.dirname(__file__)
+#
+if __name__ == '__main__':
+
+	outputFile="BPM.log"
+	count=10000
+	maxLines=0
+	concurrency=10
+	latency="lognormal:200:1.0"
+	resetRate=0.001
+	errorRate=0.01
+	payloadSize=2000
+	seed=1
+
+	argv=sys.argv[1:]
+	try:
+		opts,args=getopt.getopt(argv,"hf:n:L:c:l:r:e:p:s:",["file=","count=","lines=","concurrency=","latency=","resets=","errors=","payload=","seed="])
+	except:
+		doHelp()
+		exit(1)
+	for opt, arg in opts:
+		if opt == '-h':
+			doHelp()
+			sys.exit()
+		elif opt in ("-f","--file"):
+			outputFile=arg
+		elif opt in ("-n","--count"):
+			count=int(arg)
+		elif opt in ("-L","--lines"):
+			maxLines=int(float(arg))
+		elif opt in ("-c","--concurrency"):
+			concurrency=int(arg)
+		elif opt in ("-l","--latency"):
+			latency=arg
+		elif opt in ("-r","--resets"):
+			resetRate=float(arg)
+		elif opt in ("-e","--errors"):
+			errorRate=float(arg)
+		elif opt in ("-p","--payload"):
+			payloadSize=int(arg)
+		elif opt in ("-s","--seed"):
+			seed=int(arg)
+
+	done,lines=generate(outputFile,count,concurrency,latency,resetRate,errorRate,payloadSize,seed,maxLines)
+	print(SCRIPTNAME + " " + VERSION + " wrote " + str(done) + " transactions, " + str(lines) + " lines to " + outputFile)
@@ -0,0 +1,361 @@
+#!/usr/bin/python
+#
+# Client for the AMX Administrator SOAP services
+#
+# One session for all calls of a script, either logged in through the
+# admin UI form, which also gets the csrfToken AMX BPM 4.3 wants, or
+# with basic auth on amxadministrator.httpbasic. Each call is recorded
+# in CallStats and in the payload capture.
+#
+#	client=adminClient.AdminClient(AMXADMINURL,user,password,thisLogger,CALLSTATS,CAPTURE)
+#	client.login()
+#	content=client.call("EnvService","getAllEnv",body)
+#
+# pipeline() runs a function, usually a call and the parse of its
+# response, for each item on a pool of worker threads, so that parsing
+# one response overlaps the calls still in flight. Results come back
+# in the order of the items, whatever order the calls finish in.
+#
+#	for app,summary in zip(apps,client.pipeline(apps,getSummary)):
+#
+# The function runs on a worker, it must only use thread-safe state
+# and must not wait on another pipeline. The caller can start one
+# from the loop over results of another, as for nested folders.
+#
+# How many calls to a service are in flight is not the number of
+# workers, it is up to a concurrencyLimiter for each service. It
+# starts low and grows while calls stay quick, and falls back on
+# errors or on calls of an action staying slower than usual, never
+# over the cap of the service in CAPS.
+# logLimits shows where each one got to.
+#
+# Calls have the connect and read timeouts of runDeadline, cut to
+# what is left of the run deadline, and are not made once it passed.
+#
+# A login in a wait loop, and waitReady(), first wait for the admin
+# server to answer a readinessProbe, so one that comes back is used
+# within a second or so.
+#
+# A call answered with the login page, the SSO session of a form login
+# expired, logs in again and is made once more. One call logs in for
+# all those that saw the same session expire, the others wait for it
+# and use the new session.
+#
+# 19/10/2026	Created
+# 19/10/2026	Calls in flight limited for each service
+# 19/10/2026	Timeouts and run deadline, calls to the admin pages
+# 19/10/2026	Readiness probe before logging in again
+# 19/10/2026	Logs in again when the session expired
+# 19/10/2026	New limiter ticket for a call made again after logging in
+#
+import re
+import logging
+import threading
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import requests
+from requests.auth import HTTPBasicAuth
+from includes import payloadCapture
+from includes.concurrencyLimiter import AIMDLimiter
+from includes import runDeadline
+from includes import readinessProbe
+###################################################################
+USER_AGENT="Mozilla/5.0 (compatible; MSIE 9.0; Windows NT 6.1; WOW64; Trident/5.0)"
+# Most calls in flight to each service, DAAService and the others
+# are one or two calls a run
+CAPS={"ApplicationService":8,"ApplicationUIService":8,"NodeService":4,"HostService":4,"EnvService":2,"DAAService":2}
+OTHERCAP=2
+# Workers of a pipeline, the limiters decide how many are calling
+WORKERS=max(CAPS.values())
+# Seconds between checks for a result, so that CTRL+C is seen on Python 2
+POLL=1
+CSRFTOKEN=re.compile("csrfToken.*;")
+# In the page the server answers with once the session expired
+LOGINPAGE=b"j_security_check"
+###################################################################
+class SessionExpired(Exception):
+	pass
+
+class AdminClient(object):
+
+	#
+	# adminUrl is the amxadministrator URL, basicAuth uses the
+	# httpbasic services instead of a login. caps change those of CAPS
+	# and target is the latency in seconds the limiters keep calls
+	# under, by default twice the usual latency of each action.
+	# timeouts are the (connect,read) seconds of each call and deadline
+	# a runDeadline.Deadline.
+	#
+	def __init__(self,adminUrl,user,password,logger=None,callStats=None,capture=None,basicAuth=False,workers=WORKERS,caps=None,target=None,timeouts=None,deadline=None):
+		self.adminUrl=adminUrl
+		self.user=user
+		self.password=password
+		self.logger=logger if logger is not None else logging.getLogger(__name__)
+		self.callStats=callStats
+		self.capture=capture if capture is not None else payloadCapture.NoCapture()
+		self.basicAuth=basicAuth
+		self.workers=workers
+		self.xsrfToken=""
+		self.pool=None
+		self.lock=threading.Lock()
+		# Held while logging in again, generation counts the logins
+		self.loginLock=threading.Lock()
+		self.generation=0
+		self.caps=dict(CAPS)
+		if caps:
+			self.caps.update(caps)
+		self.target=target
+		self.limiters={}
+		self.timeouts=timeouts if timeouts is not None else runDeadline.getTimeouts()
+		self.deadline=deadline if deadline is not None else runDeadline.Deadline()
+		if basicAuth:
+			self.servicesUrl=adminUrl + ".httpbasic/services/"
+		else:
+			self.servicesUrl=adminUrl + "/services/"
+		self.session=self.getSession()
+		self.probe=readinessProbe.Probe(adminUrl,logger=self.logger)
+
+	def getSession(self):
+		session=requests.Session()
+		# A connection for each worker, kept alive between calls
+		adapter=requests.adapters.HTTPAdapter(pool_connections=1,pool_maxsize=max(self.workers,10))
+		session.mount("http://",adapter)
+		session.mount("https://",adapter)
+		if self.basicAuth:
+			session.auth=HTTPBasicAuth(self.user,self.password)
+		return session
+
+	#
+	# Simulate the admin login form to get the SSO_ID cookie, if loop
+	# wait for the server to be up and try again until it works, backing
+	# off up to sleep seconds between logins it refused. Returns the
+	# session or None.
+	#
+	def login(self,loop=False,sleep=30):
+		if self.basicAuth:
+			return self.session
+		url=self.adminUrl + "/j_security_check"
+		headers={"User-agent":USER_AGENT,"Connection":"keep-alive","pragma":"no-cache","Cache-Control":"no-cache","Referer":self.adminUrl}
+		data={"j_username":self.user,"j_password":self.password}
+		backoff=readinessProbe.Backoff(cap=sleep)
+		while True:
+			if loop and not self.waitReady():
+				return None
+			try:
+				session=self.getSession()
+				response=session.post(url,data=data,headers=headers,timeout=self.deadline.getTimeout(self.timeouts))
+				if response.status_code == 200:
+					if "SSO_ID" in session.cookies:
+						self.logger.debug("Got SSO_ID cookie")
+						# AMX BPM 4.3 requires a csrfToken thats in admin.jsp
+						response=session.post(self.adminUrl + "/admin.jsp",data=data,headers=headers,timeout=self.deadline.getTimeout(self.timeouts))
+						res=CSRFTOKEN.search(response.text)
+						if res is not None:
+							self.xsrfToken=res.group(0).split("'")[1].strip("'")
+							self.logger.info("Got csrfToken from content")
+						else:
+							self.xsrfToken=""
+						self.session=session
+						self.generation+=1
+						return session
+				else:
+					self.logger.info("Response " + str(response.status_code) + " connecting to " + url)
+			except runDeadline.DeadlineExceeded as dex:
+				self.logger.error(str(dex) + ", not logged in")
+				return None
+			except Exception as rex:
+				self.logger.error("Error calling " + url + " " + str(rex))
+			if not loop or self.deadline.isExpired():
+				return None
+			backoff.sleep(self.deadline)
+
+	#
+	# Wait for the admin server to answer the probe, False when the
+	# run deadline passed first
+	#
+	def waitReady(self):
+		return self.probe.wait(self.deadline)
+
+	#
+	# Post a SOAP body to a service, returns the response content or
+	# None when the call failed
+	#
+	def call(self,endpoint,action,body,content="text/xml"):
+		url=self.servicesUrl + endpoint
+
+		# Built again with the new csrfToken when the call is made again
+		def build():
+			headers={"content-type":content,"Connection":"keep-alive","pragma":"no-cache","Cache-Control":"no-cache","SOAPAction":"urn:" + action}
+			if not self.basicAuth:
+				headers["xsrfToken"]=self.xsrfToken
+			return (url,body,headers)
+
+		return self.request(endpoint,action,build,body)
+
+	#
+	# Post a form to an admin page, the viewstatus JSON services of
+	# 4.3, path is below the amxadministrator URL
+	#
+	def callPage(self,path,endpoint,action,data,content="application/x-www-form-urlencoded; charset=UTF-8"):
+		url=self.adminUrl + path
+
+		def build():
+			headers={"content-type":content,"Connection":"keep-alive","pragma":"no-cache","Cache-Control":"no-cache","xsrfToken":self.xsrfToken}
+			return (url,data + "&xsrfToken=" + self.xsrfToken,headers)
+
+		return self.request(endpoint,action,build,data)
+
+	#
+	# Make the call build() gives the url, body and headers of, once
+	# more after logging in again if the session expired
+	#
+	def request(self,endpoint,action,build,captured):
+		if self.deadline.isExpired():
+			self.logger.debug("Run deadline passed, not calling " + endpoint)
+			return None
+		limiter=self.getLimiter(endpoint)
+		generation=self.generation
+		result,expired=self.attempt(limiter,endpoint,action,build,captured)
+		if expired and self.relogin(generation):
+			result,expired=self.attempt(limiter,endpoint,action,build,captured)
+			if expired:
+				self.logger.error("Login page again from " + endpoint + " after logging in")
+		return result
+
+	#
+	# Make the call once within the limit of its service, returns the
+	# result and whether the server answered with its login page. The
+	# login that follows and the call made again are not part of the
+	# latency of this one.
+	#
+	def attempt(self,limiter,endpoint,action,build,captured):
+		ticket=limiter.acquire()
+		result=None
+		expired=False
+		try:
+			result=self.post(endpoint,action,build(),captured)
+		except SessionExpired:
+			expired=True
+		finally:
+			# A call cut short by the deadline or sent with an expired
+			# session says nothing about the server
+			if expired or (result is None and self.deadline.isExpired()):
+				limiter.cancel()
+			else:
+				limiter.release(ticket,result is not None,action)
+		return (result,expired)
+
+	#
+	# Log in again after a call made with the session of generation got
+	# the login page, unless another call did already. False when the
+	# login failed.
+	#
+	def relogin(self,generation):
+		with self.loginLock:
+			if self.generation != generation:
+				return True
+			self.logger.info("Session expired, logging in again")
+			return self.login() is not None
+
+	def getLimiter(self,endpoint):
+		limiter=self.limiters.get(endpoint)
+		if limiter is None:
+			with self.lock:
+				limiter=self.limiters.get(endpoint)
+				if limiter is None:
+					limiter=AIMDLimiter(endpoint,self.caps.get(endpoint,OTHERCAP),self.target,logger=self.logger)
+					self.limiters[endpoint]=limiter
+		return limiter
+
+	#
+	# Log the limit of each service, where it is, the highest it got,
+	# its cap and how often it went down
+	#
+	def logLimits(self,logger):
+		if not self.limiters:
+			return
+		head="%-30.30s %6s %6s %4s %6s %6s %10s %11s"
+		line="=" * 86
+		logger.info(line)
+		logger.info(head % ("Service","Limit","Peak","Cap","Down","Errors","Latency ms","Baseline ms"))
+		logger.info(line)
+		for endpoint in sorted(self.limiters):
+			logger.info(self.limiters[endpoint].getLine())
+		logger.info(line)
+
+	#
+	# Status CallStats records for a response, an HTML page instead of
+	# SOAP is an error even with a 200
+	#
+	def getStatus(self,response):
+		if (response.status_code == 200 or response.status_code == 204) and b"<html>" in response.content:
+			if not self.basicAuth and LOGINPAGE in response.content:
+				return "LoginPage"
+			return "HTML"
+		return response.status_code
+
+	#
+	# Post request, the (url,body,headers) of a call, returns the
+	# response content or None when the call failed. Raises
+	# SessionExpired when the server answered with its login page.
+	#
+	def post(self,endpoint,action,request,captured):
+		url,body,headers=request
+		try:
+			self.logger.debug("Calling " + url)
+			timeout=self.deadline.getTimeout(self.timeouts)
+			if self.callStats is not None:
+				response=self.callStats.call(endpoint,action,self.session.post,url,data=body,headers=headers,timeout=timeout,getStatus=self.getStatus)
+			else:
+				response=self.session.post(url,data=body,headers=headers,timeout=timeout)
+			self.capture.capture(endpoint,action,captured,response.content)
+			if response.status_code == 200 or response.status_code == 204:
+				if b"<html>" in response.content:
+					if not self.basicAuth and LOGINPAGE in response.content:
+						raise SessionExpired(url)
+					self.logger.error("Invalid response from server")
+					return None
+				return response.content
+			self.logger.error("Response " + str(response.status_code) + " connecting to " + url)
+		except runDeadline.DeadlineExceeded as dex:
+			self.logger.debug(str(dex) + ", not calling " + url)
+		except SessionExpired:
+			raise
+		except Exception as rex:
+			if self.deadline.isExpired():
+				self.logger.error("Run deadline passed calling " + url)
+			else:
+				self.logger.error("Error calling " + url + " " + str(rex))
+		return None
+
+	#
+	# Yield function(item) for each item, in the order of items, with
+	# up to workers of them running at the same time and their calls
+	# within the limit of each service
+	#
+	def pipeline(self,items,function):
+		if self.workers <= 1:
+			for item in items:
+				yield function(item)
+			return
+		results=self.getPool().imap(function,items)
+		while True:
+			try:
+				result=results.next(POLL)
+			except StopIteration:
+				return
+			except multiprocessing.TimeoutError:
+				continue
+			yield result
+
+	def getPool(self):
+		with self.lock:
+			if self.pool is None:
+				self.pool=ThreadPool(self.workers)
+			return self.pool
+
+	def close(self):
+		with self.lock:
+			if self.pool is not None:
+				self.pool.terminate()
+				self.pool=None
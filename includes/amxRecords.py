@@ -0,0 +1,136 @@
+#!/usr/bin/python
+#
+# Compact records for applications, nodes, hosts and DAAs
+#
+# A loop-mode snapshot of 10k applications keeps one record for each,
+# so they have __slots__ instead of a dict, and their state and sync
+# are small int codes of an Enum shared by all of them. The other
+# strings that repeat, versions, folders, environments, are interned
+# once. Counting states is then adding up a list indexed by code.
+#
+#	apps.sort(key=attrgetter("name"))
+#	for status,count in amxRecords.STATES.count(app.state for app in apps):
+#
+# 19/10/2026	Created
+#
+import threading
+###################################################################
+# Codes of a set of names, names not known yet get the next code
+###################################################################
+class Enum(object):
+
+	def __init__(self,names):
+		self.names=list(names)
+		self.codes=dict((name,code) for code,name in enumerate(self.names))
+		self.lock=threading.Lock()
+
+	def code(self,name):
+		code=self.codes.get(name)
+		if code is None:
+			with self.lock:
+				code=self.codes.get(name)
+				if code is None:
+					code=len(self.names)
+					self.names.append(name)
+					self.codes[name]=code
+		return code
+
+	def name(self,code):
+		return self.names[code]
+
+	#
+	# [(name,count)] of codes, in code order and without the names
+	# that are not there
+	#
+	def count(self,codes):
+		counts=[0] * len(self.names)
+		for code in codes:
+			counts[code]+=1
+		return [(self.names[code],count) for code,count in enumerate(counts) if count]
+
+# Application and host states, runtimeStateEnum
+STATES=Enum(["RUNNING","STOPPED","PARTIALLY_RUNNING","UNKNOWN"])
+# Application synchronization
+SYNCS=Enum(["IN_SYNC","OUT_OF_SYNC"])
+# Node and component states
+NODESTATES=Enum(["Running","Stopped"])
+
+INTERNED={}
+
+def intern(text):
+	# Not the builtin, it does not take unicode on Python 2
+	return INTERNED.setdefault(text,text)
+
+###################################################################
+# Records
+###################################################################
+class AppRecord(object):
+
+	__slots__=("id","name","version","state","sync","folder","environment","deployed")
+	# Id, name, version, sync and status, the line each script shows
+	LINE="%-8s%-50.50s%-25s%-10.10s%-10s"
+
+	def __init__(self,id,name,version,state,sync,folder=None,environment=None,deployed=None):
+		self.id=id
+		self.name=name
+		self.version=intern(version)
+		self.state=STATES.code(state)
+		self.sync=SYNCS.code(sync)
+		self.folder=intern(folder)
+		self.environment=intern(environment)
+		self.deployed=deployed
+
+	@property
+	def status(self):
+		return STATES.names[self.state]
+
+	@property
+	def syncName(self):
+		return SYNCS.names[self.sync]
+
+	def getLine(self):
+		return self.LINE % (self.id,self.name,self.version,SYNCS.names[self.sync],STATES.names[self.state])
+
+class NodeRecord(object):
+
+	__slots__=("id","name","environment","hostName","machine","state","version","synchronized")
+
+	def __init__(self,id,name,environment,hostName,machine,state,version,synchronized):
+		self.id=id
+		self.name=name
+		self.environment=intern(environment)
+		self.hostName=intern(hostName)
+		self.machine=intern(machine)
+		self.state=NODESTATES.code(state)
+		self.version=intern(version)
+		self.synchronized=intern(synchronized)
+
+	@property
+	def status(self):
+		return NODESTATES.names[self.state]
+
+class HostRecord(object):
+
+	__slots__=("name","state","version","machine","synchronized")
+
+	def __init__(self,name,status,version,machine,synchronized):
+		self.name=name
+		self.state=STATES.code(status)
+		self.version=intern(version)
+		self.machine=intern(machine)
+		self.synchronized=intern(synchronized)
+
+	@property
+	def status(self):
+		return STATES.names[self.state]
+
+class DaaRecord(object):
+
+	__slots__=("id","fileName","used","template")
+
+	def __init__(self,id,fileName,used,template):
+		self.id=id
+		self.fileName=fileName
+		# In use unless it says it is not, an unused DAA can be deleted
+		self.used=used != "false"
+		self.template=template
@@ -0,0 +1,128 @@
+#!/usr/bin/python
+#
+# Latency and byte counts of admin and BPM calls
+#
+# Each endpoint and action has a latency histogram, so memory only
+# depends on the number of different calls made. logSummary prints
+# a table of them, slowest total first, writes the same as JSON and
+# starts again for the next loop.
+#
+# Calls can be recorded from several threads.
+#
+# 19/10/2026	Created
+# 19/10/2026	Thread-safe record
+# 19/10/2026	Status of a response can be given by the caller
+#
+import time
+import threading
+import json
+from includes.latencyHistogram import LatencyHistogram
+###################################################################
+# Different endpoint and action pairs kept, the rest are (other)
+MAXCALLS=200
+###################################################################
+class CallStats(object):
+
+	def __init__(self):
+		# A profiler.Profiler, each call is then a phase of it
+		self.profiler=None
+		self.lock=threading.Lock()
+		self.reset()
+
+	def reset(self):
+		self.calls={}
+		self.started=time.time()
+
+	#
+	# Add one call, status is the HTTP status or a string when the
+	# call failed before a response
+	#
+	def record(self,endpoint,action,seconds,status,requestBytes=0,responseBytes=0):
+		with self.lock:
+			key=(endpoint,action)
+			call=self.calls.get(key)
+			if call is None:
+				if len(self.calls) >= MAXCALLS:
+					key=("(other)","")
+					call=self.calls.get(key)
+				if call is None:
+					call={"count":0,"errors":0,"status":{},"requestBytes":0,"responseBytes":0,"latency":LatencyHistogram()}
+					self.calls[key]=call
+			call["count"]+=1
+			if not str(status)[:1] in ("2","3"):
+				call["errors"]+=1
+			call["status"][str(status)]=call["status"].get(str(status),0) + 1
+			call["requestBytes"]+=requestBytes
+			call["responseBytes"]+=responseBytes
+			call["latency"].record(int(seconds * 1000000))
+
+	#
+	# Make a requests call, function is requests.post, session.get...,
+	# and record it. An exception is recorded with its name as status
+	# and raised again. getStatus(response), when given, is the status
+	# recorded instead of the HTTP one.
+	#
+	def call(self,endpoint,action,function,*args,**kwargs):
+		getStatus=kwargs.pop("getStatus",None)
+		data=kwargs.get("data")
+		requestBytes=len(data) if data and not isinstance(data,dict) else 0
+		if self.profiler is not None:
+			self.profiler.begin("call " + endpoint)
+		startT=time.time()
+		try:
+			response=function(*args,**kwargs)
+		except Exception as ex:
+			self.record(endpoint,action,time.time() - startT,type(ex).__name__,requestBytes)
+			raise
+		finally:
+			if self.profiler is not None:
+				self.profiler.end()
+		status=getStatus(response) if getStatus is not None else response.status_code
+		self.record(endpoint,action,time.time() - startT,status,requestBytes,len(response.content))
+		return response
+
+	#
+	# Keys slowest total time first
+	#
+	def getKeys(self):
+		return sorted(self.calls,key=lambda k: self.calls[k]["latency"].total,reverse=True)
+
+	def toDict(self):
+		calls=[]
+		for endpoint,action in self.getKeys():
+			call=self.calls[(endpoint,action)]
+			hist=call["latency"]
+			p50,p95,p99=hist.percentiles([50,95,99])
+			calls.append({"endpoint":endpoint,"action":action,"count":call["count"],"errors":call["errors"],"status":call["status"],
+				"totalMs":hist.total / 1000.0,"meanMs":hist.mean() / 1000.0,"p50Ms":p50 / 1000.0,"p95Ms":p95 / 1000.0,"p99Ms":p99 / 1000.0,"maxMs":hist.max / 1000.0,
+				"requestBytes":call["requestBytes"],"responseBytes":call["responseBytes"]})
+		return {"started":self.started,"seconds":time.time() - self.started,"calls":calls}
+
+	def writeJSON(self,fileName):
+		with open(fileName,"w") as f:
+			json.dump(self.toDict(),f,indent=1)
+
+	#
+	# Log the table, write it as JSON if jsonFile is set and reset
+	#
+	def logSummary(self,logger,jsonFile=None):
+		if not self.calls:
+			return
+		head="%-50.50s %6s %5s %9s %9s %9s %9s %9s %10s"
+		line="=" * 123
+		logger.info(line)
+		logger.info(head % ("Endpoint Action","Calls","Err","Total s","Avg ms","p50 ms","p95 ms","Max ms","Rsp KB"))
+		logger.info(line)
+		for key in self.getKeys():
+			call=self.calls[key]
+			hist=call["latency"]
+			p50,p95=hist.percentiles([50,95])
+			logger.info(head % ((key[0] + " " + key[1]).strip(),call["count"],call["errors"],"%.2f" % (hist.total / 1000000.0),"%.1f" % (hist.mean() / 1000.0),
+				"%.1f" % (p50 / 1000.0),"%.1f" % (p95 / 1000.0),"%.1f" % (hist.max / 1000.0),"%.1f" % (call["responseBytes"] / 1024.0)))
+		logger.info(line)
+		if jsonFile is not None:
+			try:
+				self.writeJSON(jsonFile)
+			except Exception as ex:
+				logger.error("Cannot write " + jsonFile + " " + str(ex))
+		self.reset()
@@ -0,0 +1,202 @@
+#!/usr/bin/python
+#
+# Adaptive limit of the calls in flight to one service
+#
+# The admin server is shared with the operators using its UI, so
+# the calls of a script to a service are limited to what it answers
+# without slowing down, found as it goes, additive increase and
+# multiplicative decrease as TCP does:
+#
+#	- each call that ends while the limit is used, and while the
+#	  latency of its action is under GROW times its baseline, adds
+#	  1/limit, so the limit grows by one for a limit of calls
+#	- an error, an HTML page instead of SOAP, or the latency of an
+#	  action staying over TOLERANCE times its baseline for SUSTAIN
+#	  calls in a row halves it, once for the calls that were in flight
+#	- in between the limit stays as it is
+#
+# The latency of each action of the service is kept apart as geometric
+# means, a short term one over the last few calls, and a baseline, its
+# usual latency when the service is not loaded by the script, from the
+# calls made with at most INITIAL calls in flight. The limit only grows
+# once an action has WARMUP of them. The jitter of a server whose
+# latency does not depend on the load moves the short term latency
+# around the baseline and does not lower the limit, queueing on the
+# server makes it rise and stay up. A server that got slower for
+# another reason brings the limit down to where the baseline is
+# measured again. With a target latency in seconds the short term
+# latency of each action is compared to it instead. The limit stays
+# between 1 and the cap of the service.
+#
+#	limiter=concurrencyLimiter.AIMDLimiter("ApplicationService",8)
+#	ticket=limiter.acquire()
+#	...
+#	limiter.release(ticket,ok,"getApplicationSummaryById")
+#
+# benchLimiter checks it against simulated services.
+#
+# 19/10/2026	Created
+# 19/10/2026	Latency kept for each action against its own baseline
+#
+import time
+import math
+import threading
+###################################################################
+# Limit of a new limiter, calls with at most this many in flight
+# give the baseline
+INITIAL=2
+MINLIMIT=1
+# Limit kept after a decrease
+BACKOFF=0.5
+# Weight of the last call in the short term latency and in the baseline
+SHORT=0.1
+LONG=0.05
+# Short term latency over the baseline that is a rise, and under which
+# the limit can grow
+TOLERANCE=2.0
+GROW=1.5
+# Calls in a row over TOLERANCE before the limit goes down
+SUSTAIN=3
+# Calls of an action in the baseline before the limit changes for it
+WARMUP=30
+# Shortest latency counted, a call cannot take no time
+MINSECONDS=0.0001
+###################################################################
+class ActionLatency(object):
+
+	__slots__=("short","long","logShort","logLong","calls","samples","over")
+
+	def __init__(self):
+		self.short=None
+		self.long=None
+		self.logShort=None
+		self.logLong=None
+		self.calls=0
+		self.samples=0
+		self.over=0
+
+	#
+	# baseline is True for a call made with the service not loaded
+	#
+	def add(self,seconds,baseline=True):
+		# Averages of the log of the latency, so that one call many times
+		# slower than the others is not taken for a rise
+		logSeconds=math.log(max(seconds,MINSECONDS))
+		self.calls+=1
+		self.logShort=logSeconds if self.logShort is None else self.logShort + max(SHORT,1.0 / self.calls) * (logSeconds - self.logShort)
+		self.short=math.exp(self.logShort)
+		if baseline:
+			self.samples+=1
+			# The mean of the first calls, so that one quick call is not
+			# taken for the baseline
+			self.logLong=logSeconds if self.logLong is None else self.logLong + max(LONG,1.0 / self.samples) * (logSeconds - self.logLong)
+			self.long=math.exp(self.logLong)
+
+class AIMDLimiter(object):
+
+	def __init__(self,name,cap,target=None,initial=INITIAL,logger=None):
+		self.name=name
+		self.cap=cap
+		self.target=target
+		self.logger=logger
+		self.limit=float(max(MINLIMIT,min(initial,cap)))
+		self.peak=self.limit
+		self.inFlight=0
+		# ActionLatency of each action, and of all of them to show
+		self.actions={}
+		self.service=ActionLatency()
+		self.decreased=0.0
+		self.decreases=0
+		self.errors=0
+		self.cond=threading.Condition()
+
+	#
+	# Short term latency of an action over its baseline, or over the
+	# target divided by TOLERANCE when there is one, None while there
+	# is no baseline yet
+	#
+	def getRatio(self,latency):
+		if self.target is not None:
+			return latency.short * TOLERANCE / self.target
+		if latency.samples < WARMUP or latency.long <= 0:
+			return None
+		return latency.short / latency.long
+
+	#
+	# Wait for the call to be within the limit, returns the ticket of
+	# the call to give back to release(), its start time and the calls
+	# in flight with it
+	#
+	def acquire(self):
+		with self.cond:
+			while self.inFlight >= int(self.limit):
+				self.cond.wait()
+			self.inFlight+=1
+			inFlight=self.inFlight
+		return (time.time(),inFlight)
+
+	#
+	# End of a call of action, ok is False when it failed
+	#
+	def release(self,ticket,ok=True,action=None):
+		startT,startInFlight=ticket
+		endT=time.time()
+		seconds=endT - startT
+		decreased=None
+		with self.cond:
+			# Whether the limit was used, a limit that is not is not raised
+			used=self.inFlight >= int(self.limit)
+			baseline=max(startInFlight,self.inFlight) <= INITIAL
+			self.inFlight-=1
+			ratio=None
+			over=False
+			if ok:
+				latency=self.actions.get(action)
+				if latency is None:
+					latency=self.actions[action]=ActionLatency()
+				latency.add(seconds,baseline)
+				self.service.add(seconds,baseline)
+				ratio=self.getRatio(latency)
+				if ratio is not None and ratio > TOLERANCE:
+					latency.over+=1
+					over=latency.over >= SUSTAIN
+				else:
+					latency.over=0
+			else:
+				self.errors+=1
+			if not ok or over:
+				# Calls started before the last decrease saw the old limit
+				if startT >= self.decreased and self.limit > MINLIMIT:
+					decreased=(self.limit,max(MINLIMIT,self.limit * BACKOFF))
+					self.limit=decreased[1]
+					self.decreased=endT
+					self.decreases+=1
+					# Start again from the calls made with the new limit
+					for other in self.actions.values():
+						other.short=other.long
+						other.logShort=other.logLong
+						other.over=0
+			elif used and ratio is not None and ratio < GROW:
+				self.limit=min(self.cap,self.limit + 1.0 / self.limit)
+				self.peak=max(self.peak,self.limit)
+			self.cond.notify_all()
+		if decreased is not None and self.logger is not None:
+			self.logger.debug("%s concurrency %.1f to %.1f after %s in %.0f ms" % (self.name,decreased[0],decreased[1],"an error" if not ok else "slower " + str(action) + " calls",seconds * 1000))
+
+	#
+	# End of a call that says nothing about the service, one not made
+	# or cut short by the run deadline
+	#
+	def cancel(self):
+		with self.cond:
+			self.inFlight-=1
+			self.cond.notify_all()
+
+	#
+	# Limit, peak, cap, decreases, errors, and the short term latency
+	# and baseline of all the calls
+	#
+	def getLine(self):
+		return "%-30.30s %6.1f %6.1f %4d %6d %6d %10s %11s" % (self.name,self.limit,self.peak,self.cap,self.decreases,self.errors,
+			"%.1f" % (self.service.short * 1000) if self.service.short is not None else "",
+			"%.1f" % (self.service.long * 1000) if self.service.long is not None else "")
@@ -6,27 +6,136 @@
 # 03/07/2020	Updated logging to use rotating file handler
 #				and correct logger use bty returning a logger
 #				object
+# 19/10/2026	Added queued logging, file and console writes
+#				done by a listener thread
 import logging
 from logging.handlers import TimedRotatingFileHandler
 import os
 import base64
 import re
+import threading
+import atexit
+try:
+	import queue
+except ImportError:
+	import Queue as queue
 ###################################################################
 ###################################################################
 LOGDIR="."
 ###################################################################
 LOGFILE=""
 LOGGER=None
+LISTENER=None
 DEBUGLEVEL=logging.INFO
+# What a queued logger does with a record when its queue is full
+OVERFLOWPOLICIES=("block","drop","drop-oldest")
+#
+# Handler that only puts records on a queue, the message is
+# formatted first so the record no longer refers to its arguments
+#
+class LogQueueHandler(logging.Handler):
+
+	def __init__(self,logQueue,overflow="block"):
+		logging.Handler.__init__(self)
+		if overflow not in OVERFLOWPOLICIES:
+			raise ValueError("Log overflow must be one of " + ",".join(OVERFLOWPOLICIES))
+		self.queue=logQueue
+		self.overflow=overflow
+		self.dropped=0
+
+	def prepare(self,record):
+		record.message=self.format(record)
+		record.msg=record.message
+		record.args=None
+		record.exc_info=None
+		record.exc_text=None
+		return record
+
+	def enqueue(self,record):
+		if self.overflow == "block":
+			self.queue.put(record)
+			return
+		while True:
+			try:
+				self.queue.put_nowait(record)
+				return
+			except queue.Full:
+				self.dropped+=1
+				if self.overflow == "drop":
+					return
+			# drop-oldest, make room and try again
+			try:
+				self.queue.get_nowait()
+			except queue.Empty:
+				pass
+
+	def emit(self,record):
+		try:
+			self.enqueue(self.prepare(record))
+		except Exception:
+			self.handleError(record)
+#
+# Thread passing records from a queue to the real handlers
+#
+class LogQueueListener(object):
+
+	def __init__(self,logQueue,handlers):
+		self.queue=logQueue
+		self.handlers=handlers
+		self.thread=None
+
+	def start(self):
+		self.thread=threading.Thread(target=self.run,name="logListener")
+		self.thread.daemon=True
+		self.thread.start()
+
+	def handle(self,record):
+		for handler in self.handlers:
+			if record.levelno >= handler.level:
+				handler.handle(record)
+
+	def run(self):
+		while True:
+			record=self.queue.get()
+			# None is put by stop
+			if record is None:
+				break
+			self.handle(record)
+
+	def stop(self):
+		if self.thread is not None:
+			self.queue.put(None)
+			self.thread.join()
+			self.thread=None
+#
+# Write what is still queued and stop the listener thread, done at
+# exit for queued loggers
+#
+def logStop():
+	global LISTENER
+	if LISTENER is None:
+		return
+	listener=LISTENER
+	LISTENER=None
+	listener.stop()
+	for handler in LOGGER.handlers:
+		if isinstance(handler,LogQueueHandler) and handler.dropped > 0:
+			listener.handle(logging.makeLogRecord({"name":LOGGER.name,"levelno":logging.WARNING,"levelname":"WARNING","msg":str(handler.dropped) + " log messages dropped, log queue full"}))
+	for handler in listener.handlers:
+		handler.flush()
 #
 #
 # Setup a default logger based on the script name, add a console logger
 # if debug mode is set
+# With queued set the logger only puts records on a queue of
+# queueSize records and a listener thread writes them, overflow is
+# block, drop or drop-oldest for when the queue is full
 #
-def logSetup(thisName,logLevel=logging.INFO,isConsole=True,logDir=None):
+def logSetup(thisName,logLevel=logging.INFO,isConsole=True,logDir=None,queued=False,queueSize=10000,overflow="block"):
 	global LOGFILE
 	global LOGGER
 	global LOGDIR
+	global LISTENER
 	# If dir is set externally
 	if logDir is not None:
 		LOGDIR=logDir
@@ -42,7 +151,7 @@ def logSetup(thisName,logLevel=logging.INFO,isConsole=True,logDir=None):
 	thisLogger.setLevel(logLevel)
 	file_handler = TimedRotatingFileHandler(LOGFILE, when='midnight',backupCount=10)
 	file_handler.setFormatter(format)
-	thisLogger.addHandler(file_handler)
+	handlers=[file_handler]
 	if isConsole:
 		# define a Handler which writes INFO messages or higher to the sys.stderr
 		console = logging.StreamHandler()
@@ -52,7 +161,16 @@ def logSetup(thisName,logLevel=logging.INFO,isConsole=True,logDir=None):
 		# tell the handler to use this format
 		console.setFormatter(formatter)
 		# add the handler to the root logger
-		thisLogger.addHandler(console)
+		handlers.append(console)
+	if queued:
+		logQueue=queue.Queue(queueSize)
+		thisLogger.addHandler(LogQueueHandler(logQueue,overflow))
+		LISTENER=LogQueueListener(logQueue,handlers)
+		LISTENER.start()
+		atexit.register(logStop)
+	else:
+		for handler in handlers:
+			thisLogger.addHandler(handler)
 	LOGGER=thisLogger
 	return thisLogger
 #
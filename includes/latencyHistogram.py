@@ -0,0 +1,187 @@
+#!/usr/bin/python
+#
+# Streaming latency histograms, time series and rolling windows
+#
+# Values are recorded in microseconds into logarithmic buckets so
+# memory depends on the range of values seen, never on how many
+# values were recorded.
+#
+# 19/10/2026	Created
+#
+import math
+###################################################################
+# Relative width of a bucket, a reported percentile is never more
+# than this fraction away from the real value
+###################################################################
+PRECISION=0.01
+LOGBASE=math.log(1.0 + PRECISION)
+###################################################################
+#
+# Log bucketed histogram
+#
+class LatencyHistogram(object):
+
+	def __init__(self):
+		self.buckets={}
+		self.count=0
+		self.total=0
+		self.min=None
+		self.max=0
+
+	#
+	# Add a value in microseconds
+	#
+	def record(self,value):
+		if value > 1:
+			idx=int(math.log(value) / LOGBASE) + 1
+		else:
+			value=max(value,0)
+			idx=0
+		buckets=self.buckets
+		buckets[idx]=buckets.get(idx,0) + 1
+		self.count+=1
+		self.total+=value
+		if value > self.max:
+			self.max=value
+		if self.min is None or value < self.min:
+			self.min=value
+
+	#
+	# Add all values from another histogram
+	#
+	def merge(self,other):
+		for idx in other.buckets:
+			self.buckets[idx]=self.buckets.get(idx,0) + other.buckets[idx]
+		self.count+=other.count
+		self.total+=other.total
+		if other.max > self.max:
+			self.max=other.max
+		if other.min is not None and (self.min is None or other.min < self.min):
+			self.min=other.min
+
+	def mean(self):
+		if self.count == 0:
+			return 0
+		return self.total / float(self.count)
+
+	#
+	# Return a list of values for a list of percentiles (0-100)
+	#
+	def percentiles(self,pList):
+		rtn=[]
+		if self.count == 0:
+			return [0 for p in pList]
+		keys=sorted(self.buckets)
+		for p in pList:
+			target=max(1,int(math.ceil(p / 100.0 * self.count)))
+			seen=0
+			for idx in keys:
+				seen+=self.buckets[idx]
+				if seen >= target:
+					break
+			# Upper edge of the bucket, but never above what was seen
+			if idx == 0:
+				value=self.min
+			else:
+				value=min(int(math.exp(idx * LOGBASE)),self.max)
+			rtn.append(value)
+		return rtn
+
+	def percentile(self,p):
+		return self.percentiles([p])[0]
+
+#
+# Histogram plus counters for consecutive fixed intervals, only the
+# most recent maxBuckets intervals are kept
+#
+class TimeSeries(object):
+
+	def __init__(self,interval=60,maxBuckets=1440):
+		self.interval=interval
+		self.maxBuckets=maxBuckets
+		self.buckets={}
+
+	#
+	# stamp is in epoch seconds, value in microseconds
+	#
+	def record(self,stamp,value,error=False):
+		key=int(stamp) - (int(stamp) % self.interval)
+		bucket=self.buckets.get(key)
+		if bucket is None:
+			bucket={"count":0,"errors":0,"latency":LatencyHistogram()}
+			self.buckets[key]=bucket
+			if len(self.buckets) > self.maxBuckets:
+				del self.buckets[min(self.buckets)]
+		bucket["count"]+=1
+		if error:
+			bucket["errors"]+=1
+		bucket["latency"].record(value)
+
+	#
+	# Return list of (start,bucket) in time order
+	#
+	def items(self):
+		return [(key,self.buckets[key]) for key in sorted(self.buckets)]
+
+#
+# Counters and histograms for the last few minutes in a ring of
+# fixed slots, recording is O(1) and old slots are reused in place
+#
+class RollingWindow(object):
+
+	def __init__(self,slotSeconds=10,maxSeconds=900):
+		self.slotSeconds=slotSeconds
+		self.slots=[None] * (maxSeconds // slotSeconds)
+		self.first=None
+		self.latest=0
+
+	#
+	# Slot for an epoch second, None if it is older than the ring
+	#
+	def getSlot(self,stamp):
+		number=int(stamp) // self.slotSeconds
+		idx=number % len(self.slots)
+		slot=self.slots[idx]
+		if slot is None or slot[0] < number:
+			slot=[number,0,0,0,LatencyHistogram()]
+			self.slots[idx]=slot
+		elif slot[0] > number:
+			return None
+		if stamp > self.latest:
+			self.latest=stamp
+		if self.first is None or stamp < self.first:
+			self.first=stamp
+		return slot
+
+	def record(self,stamp,value,error=False):
+		slot=self.getSlot(stamp)
+		if slot is not None:
+			slot[1]+=1
+			if error:
+				slot[2]+=1
+			slot[4].record(value)
+
+	def recordReset(self,stamp):
+		slot=self.getSlot(stamp)
+		if slot is not None:
+			slot[3]+=1
+
+	#
+	# Totals for the last seconds up to the latest stamp recorded
+	#
+	def summary(self,seconds):
+		latency=LatencyHistogram()
+		count=errors=resets=0
+		last=int(self.latest) // self.slotSeconds
+		oldest=last - seconds // self.slotSeconds + 1
+		for slot in self.slots:
+			if slot is not None and oldest <= slot[0] <= last:
+				count+=slot[1]
+				errors+=slot[2]
+				resets+=slot[3]
+				latency.merge(slot[4])
+		# Rate over the part of the window there is data for
+		span=seconds
+		if self.first is not None:
+			span=max(1,min(seconds,int(self.latest - self.first) + 1))
+		return {"count":count,"errors":errors,"resets":resets,"rate":count / float(span),"latency":latency}
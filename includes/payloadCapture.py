@@ -0,0 +1,141 @@
+#!/usr/bin/python
+#
+# Capture of raw request and response bodies
+#
+# Capture is off unless /tmp/<script>.capture exists, it is then
+# read once at setup. Each line of it is either an endpoint to
+# capture, all endpoints are captured if none is listed, or one of
+#
+#	sample=<fraction>	Only capture this fraction of the calls
+#	maxbytes=<bytes>	Stop before a call takes a capture file over this size
+#	dir=<dir>			Where the capture files go, default logDir
+#
+# Requests go to <script>.req.cap and responses to <script>.rsp.cap,
+# each body follows a line
+#
+#	#### <run> <seq> <endpoint> <action> <bytes>
+#
+# and readCapture gives them back, to replay them as test fixtures.
+#
+# 19/10/2026	Created
+# 19/10/2026	Calls can be captured from several threads
+# 19/10/2026	Request and response written together or not at all
+#
+import os
+import time
+import random
+import logging
+import threading
+###################################################################
+MAXBYTES=50 * 1048576
+HEADER=b"#### "
+###################################################################
+class PayloadCapture(object):
+
+	def __init__(self,thisName,captureDir=".",endpoints=None,sample=1.0,maxBytes=MAXBYTES):
+		self.enabled=True
+		self.logger=logging.getLogger(thisName)
+		self.endpoints=endpoints
+		self.sample=sample
+		self.maxBytes=maxBytes
+		self.run=time.strftime("%Y%m%d%H%M%S")
+		self.seq=0
+		base=os.path.join(captureDir,thisName.replace(".py",""))
+		self.files={"req":base + ".req.cap","rsp":base + ".rsp.cap"}
+		self.sizes={}
+		for kind in self.files:
+			self.sizes[kind]=os.path.getsize(self.files[kind]) if os.path.exists(self.files[kind]) else 0
+		self.full=False
+		self.lock=threading.Lock()
+
+	#
+	# Write both bodies of a call if it is to be captured, nothing is
+	# built or written when capture is off
+	#
+	def capture(self,endpoint,action,request,response):
+		if not self.enabled or self.full:
+			return False
+		if self.endpoints and endpoint not in self.endpoints:
+			return False
+		if self.sample < 1.0 and random.random() >= self.sample:
+			return False
+		# The request and response of a call stay together, both are
+		# written or neither is, so that the files pair up on replay
+		with self.lock:
+			records={}
+			for kind,body in (("req",request),("rsp",response)):
+				records[kind]=self.getRecord(self.seq + 1,endpoint,action,body)
+				if self.sizes[kind] + len(records[kind]) > self.maxBytes:
+					self.full=True
+					self.logger.warning("Capture file " + self.files[kind] + " is full, capture stopped")
+					return False
+			self.seq+=1
+			for kind in ("req","rsp"):
+				with open(self.files[kind],"ab") as f:
+					f.write(records[kind])
+				self.sizes[kind]+=len(records[kind])
+		return True
+
+	#
+	# Header line, body and newline of one capture record
+	#
+	def getRecord(self,seq,endpoint,action,body):
+		if body is None:
+			body=b""
+		elif not isinstance(body,bytes):
+			body=body.encode("utf-8")
+		header=HEADER + ("%s %d %s %s %d\n" % (self.run,seq,endpoint,action.replace(" ","_") if action else "-",len(body))).encode("utf-8")
+		return header + body + b"\n"
+
+#
+# Capture that is never enabled, what captureSetup returns when
+# there is no control file
+#
+class NoCapture(object):
+
+	enabled=False
+
+	def capture(self,endpoint,action,request,response):
+		return False
+
+#
+# Read the control file of a script and return its capture
+#
+def captureSetup(thisName,logDir="."):
+	control="/tmp/" + thisName + ".capture"
+	if not os.path.exists(control):
+		return NoCapture()
+	endpoints=[]
+	options={"dir":logDir,"sample":"1.0","maxbytes":str(MAXBYTES)}
+	try:
+		with open(control) as f:
+			for line in f:
+				line=line.strip()
+				if not line or line.startswith("#"):
+					continue
+				if "=" in line:
+					key,value=line.split("=",1)
+					options[key.strip().lower()]=value.strip()
+				else:
+					endpoints.append(line)
+		return PayloadCapture(thisName,options["dir"],endpoints,float(options["sample"]),int(options["maxbytes"]))
+	except Exception as ex:
+		logging.getLogger(thisName).error("Cannot use capture file " + control + " " + str(ex))
+		return NoCapture()
+
+#
+# Yield (run,seq,endpoint,action,body) from a capture file
+#
+def readCapture(fileName):
+	with open(fileName,"rb") as f:
+		while True:
+			line=f.readline()
+			if not line:
+				break
+			if not line.startswith(HEADER):
+				continue
+			run,seq,endpoint,action,length=line[len(HEADER):].decode("utf-8").split()
+			body=f.read(int(length))
+			# Newline after the body
+			f.read(1)
+			yield (run,int(seq),endpoint,action,body)
@@ -0,0 +1,206 @@
+#!/usr/bin/python
+#
+# Named phase timers for the --profile option of the scripts
+#
+# Phases are started and ended around login, each collection step,
+# parsing and output, they nest and the breakdown shows the time of
+# each phase with and without the phases inside it. Optionally the
+# whole run is also under cProfile, dumped as a pstats file, and
+# every phase is written as a Chrome trace event, load the file in
+# chrome://tracing or https://ui.perfetto.dev to see the timeline.
+#
+# Nothing is recorded unless --profile is given, begin and end then
+# return straight away. Phases of worker threads are timed on their
+# own stack, their times overlap those of the main thread so they are
+# shown apart and only the phases of the main thread are counted
+# against the run. The trace keeps the last MAXEVENTS phases, a --test
+# loop runs for days.
+#
+# 19/10/2026	Created
+# 19/10/2026	Phases can end on several threads
+# 19/10/2026	Worker phases apart from the run, trace events capped
+#
+import os
+import time
+import json
+import threading
+from collections import deque
+###################################################################
+# Help lines for the options profileSetup takes out of the arguments
+HELP=[
+	"--profile               Time login, collection, parsing and output and show the breakdown",
+	"--profile-stats <file>  Also run under cProfile and write a pstats file",
+	"--profile-trace <file>  Also write the phases as a Chrome trace event timeline",
+]
+# Phases kept for the trace, the latest ones
+MAXEVENTS=200000
+###################################################################
+class Profiler(object):
+
+	def __init__(self,enabled=False,statsFile=None,traceFile=None):
+		self.enabled=enabled
+		self.statsFile=statsFile
+		self.traceFile=traceFile
+		self.events=deque(maxlen=MAXEVENTS)
+		# Phases of the main thread and of the worker threads
+		self.phases={}
+		self.workerPhases={}
+		self.mainThread=threading.current_thread().ident
+		self.local=threading.local()
+		self.lock=threading.Lock()
+		self.cprofile=None
+		self.started=time.time()
+		self.stopped=None
+
+	def getStack(self):
+		stack=getattr(self.local,"stack",None)
+		if stack is None:
+			stack=[]
+			self.local.stack=stack
+		return stack
+
+	def start(self):
+		self.started=time.time()
+		if self.enabled and self.statsFile is not None:
+			import cProfile
+			self.cprofile=cProfile.Profile()
+			self.cprofile.enable()
+
+	#
+	# Start a phase, it ends with the next end() on the same thread
+	#
+	def begin(self,name):
+		if not self.enabled:
+			return
+		# [name,start,time in phases inside this one]
+		self.getStack().append([name,time.time(),0.0])
+
+	def end(self):
+		if not self.enabled:
+			return
+		stack=self.getStack()
+		if not stack:
+			return
+		name,startT,inner=stack.pop()
+		endT=time.time()
+		elapsed=endT - startT
+		if stack:
+			stack[-1][2]+=elapsed
+		thread=threading.current_thread().ident
+		phases=self.phases if thread == self.mainThread else self.workerPhases
+		with self.lock:
+			phase=phases.get(name)
+			if phase is None:
+				phase={"count":0,"total":0.0,"self":0.0}
+				phases[name]=phase
+			phase["count"]+=1
+			phase["total"]+=elapsed
+			phase["self"]+=elapsed - inner
+			if self.traceFile is not None:
+				self.events.append((name,startT,elapsed,thread))
+
+	#
+	# Context manager form, with PROFILER.phase("parse"): ...
+	#
+	def phase(self,name):
+		return Phase(self,name)
+
+	#
+	# End open phases and the profile, write the files asked for
+	#
+	def stop(self):
+		if not self.enabled or self.stopped is not None:
+			return
+		while self.getStack():
+			self.end()
+		self.stopped=time.time()
+		if self.cprofile is not None:
+			self.cprofile.disable()
+			self.cprofile.dump_stats(self.statsFile)
+		if self.traceFile is not None:
+			self.writeTrace(self.traceFile)
+
+	def writeTrace(self,fileName):
+		pid=os.getpid()
+		events=[{"name":name,"ph":"X","ts":int((startT - self.started) * 1000000),"dur":int(elapsed * 1000000),"pid":pid,"tid":tid} for name,startT,elapsed,tid in self.events]
+		with open(fileName,"w") as f:
+			json.dump({"traceEvents":events,"displayTimeUnit":"ms"},f)
+
+	#
+	# Log the phase breakdown, longest time outside inner phases first
+	#
+	def logSummary(self,logger):
+		if not self.enabled:
+			return
+		self.stop()
+		run=max(self.stopped - self.started,0.000001)
+		head="%-40.40s %8s %10s %10s %8s"
+		line="=" * 80
+		logger.info(line)
+		logger.info(head % ("Phase","Count","Total s","Self s","Self %"))
+		logger.info(line)
+		accounted=0.0
+		for name in sorted(self.phases,key=lambda n: self.phases[n]["self"],reverse=True):
+			phase=self.phases[name]
+			accounted+=phase["self"]
+			logger.info(head % (name,phase["count"],"%.3f" % phase["total"],"%.3f" % phase["self"],"%.1f" % (phase["self"] * 100.0 / run)))
+		logger.info(head % ("(outside phases)","","","%.3f" % max(run - accounted,0),"%.1f" % (max(run - accounted,0) * 100.0 / run)))
+		logger.info(head % ("Run","","%.3f" % run,"",""))
+		logger.info(line)
+		if self.workerPhases:
+			# In parallel with the main thread, not part of the run time
+			logger.info(head % ("Worker thread phase","Count","Total s","Self s",""))
+			logger.info(line)
+			for name in sorted(self.workerPhases,key=lambda n: self.workerPhases[n]["self"],reverse=True):
+				phase=self.workerPhases[name]
+				logger.info(head % (name,phase["count"],"%.3f" % phase["total"],"%.3f" % phase["self"],""))
+			logger.info(line)
+		if self.statsFile is not None:
+			logger.info("Profile written to " + self.statsFile)
+		if self.traceFile is not None:
+			logger.info("Trace written to " + self.traceFile)
+
+class Phase(object):
+
+	def __init__(self,profiler,name):
+		self.profiler=profiler
+		self.name=name
+
+	def __enter__(self):
+		self.profiler.begin(self.name)
+		return self
+
+	def __exit__(self,excType,excValue,tb):
+		self.profiler.end()
+		return False
+
+#
+# Take the profile options out of argv, returns the arguments left
+# for the script and its profiler, started
+#
+def profileSetup(argv):
+	enabled=False
+	statsFile=None
+	traceFile=None
+	rest=[]
+	idx=0
+	while idx < len(argv):
+		name,sep,value=argv[idx].partition("=")
+		idx+=1
+		if name in ("--profile-stats","--profile-trace") and not sep and idx < len(argv):
+			# Value as the next argument
+			value=argv[idx]
+			idx+=1
+		if name == "--profile":
+			enabled=True
+		elif name == "--profile-stats":
+			enabled=True
+			statsFile=value or None
+		elif name == "--profile-trace":
+			enabled=True
+			traceFile=value or None
+		else:
+			rest.append(argv[idx - 1])
+	profiler=Profiler(enabled,statsFile,traceFile)
+	profiler.start()
+	return (rest,profiler)
@@ -0,0 +1,114 @@
+#!/usr/bin/python
+#
+# Wait for a server to be up before logging in again
+#
+# The wait loops of --test used to try a full login every 30 s, so a
+# restarted admin server was seen up to 30 s late. The probe is a
+# plain GET of the admin page, no login and no session, a server that
+# answers it with anything but a 5xx is up. Between probes the delay
+# doubles from FIRSTDELAY up to CAPDELAY, each one taken at random in
+# its upper half so that scripts started together do not probe
+# together.
+#
+#	probe=readinessProbe.Probe(AMXADMINURL,logger=thisLogger)
+#	if probe.wait(DEADLINE):
+#		session=client.login()
+#
+# Backoff is the same delays for any other wait loop, with its own cap.
+#
+# 19/10/2026	Created
+#
+import time
+import random
+import requests
+from includes import runDeadline
+###################################################################
+# Seconds before the second probe, the first one is right away
+FIRSTDELAY=0.1
+# Most seconds between probes, a server that is back is seen within it
+CAPDELAY=1.0
+FACTOR=2.0
+# Seconds a probe waits to connect and for the response
+PROBETIMEOUT=2.0
+###################################################################
+class Backoff(object):
+
+	def __init__(self,first=FIRSTDELAY,cap=CAPDELAY,factor=FACTOR):
+		self.first=first
+		self.cap=cap
+		self.factor=factor
+		self.reset()
+
+	def reset(self):
+		self.delay=self.first
+
+	#
+	# Seconds to wait now, between half and all of the current delay,
+	# which then grows for the next time
+	#
+	def getDelay(self):
+		delay=min(self.delay,self.cap)
+		self.delay=delay * self.factor
+		return delay / 2 + random.uniform(0,delay / 2)
+
+	#
+	# Sleep the next delay, no longer than what is left of the deadline
+	#
+	def sleep(self,deadline=None):
+		delay=self.getDelay()
+		remaining=deadline.remaining() if deadline is not None else None
+		if remaining is not None:
+			delay=max(0,min(delay,remaining))
+		time.sleep(delay)
+
+class Probe(object):
+
+	def __init__(self,url,timeout=PROBETIMEOUT,first=FIRSTDELAY,cap=CAPDELAY,logger=None):
+		self.url=url
+		self.timeout=timeout
+		self.first=first
+		self.cap=cap
+		self.logger=logger
+		self.probes=0
+
+	#
+	# Whether the server answers, deadline cuts the probe timeout
+	#
+	def isReady(self,deadline=None):
+		self.probes+=1
+		try:
+			timeout=(self.timeout,self.timeout)
+			if deadline is not None:
+				timeout=deadline.getTimeout(timeout)
+			response=requests.get(self.url,timeout=timeout,allow_redirects=False,stream=True)
+			response.close()
+			if response.status_code < 500:
+				return True
+			self.log("Response " + str(response.status_code) + " probing " + self.url)
+		except runDeadline.DeadlineExceeded:
+			pass
+		except Exception as rex:
+			self.log("Error probing " + self.url + " " + str(rex))
+		return False
+
+	#
+	# Probe until the server answers, True once it does, False when
+	# the deadline passed first
+	#
+	def wait(self,deadline=None):
+		startT=time.time()
+		self.probes=0
+		backoff=Backoff(self.first,self.cap)
+		while not self.isReady(deadline):
+			if self.probes == 1 and self.logger is not None:
+				self.logger.info("Waiting for " + self.url)
+			if deadline is not None and deadline.isExpired():
+				return False
+			backoff.sleep(deadline)
+		if self.probes > 1 and self.logger is not None:
+			self.logger.info("%s answered after %.1f s and %d probes" % (self.url,time.time() - startT,self.probes))
+		return True
+
+	def log(self,message):
+		if self.logger is not None:
+			self.logger.debug(message)
@@ -0,0 +1,111 @@
+#!/usr/bin/python
+#
+# Timeouts of the HTTP calls and deadline of a run
+#
+# httpConnectionTimeout in amxctrl.py, in ms, is how long a call
+# waits to connect and for each read of its response, httpReadTimeout
+# when it is there sets the read one alone. Without them calls wait
+# CONNECTTIMEOUT and READTIMEOUT seconds.
+#
+# The deadline bounds a whole run, runDeadline seconds in amxctrl.py
+# or the --deadline option. Once it is past no call is made, the
+# calls in flight end at the latest when it passes, and the script
+# shows what it has collected marked as incomplete. In loop mode each
+# run has its own deadline, start() is called after each sleep.
+#
+#	TIMEOUTS=runDeadline.getTimeouts(amxctrl)
+#	argv,DEADLINE=runDeadline.deadlineSetup(argv,amxctrl)
+#	response=session.post(url,timeout=DEADLINE.getTimeout(TIMEOUTS))
+#	includeFunctions.logHeader("Total " + str(total) + DEADLINE.getMark())
+#
+# 19/10/2026	Created
+#
+import time
+###################################################################
+CONNECTTIMEOUT=30.0
+READTIMEOUT=360.0
+# Help line for the option deadlineSetup takes out of the arguments
+HELP=[
+	"--deadline <seconds>    Stop calling the server after this long and show what was collected",
+]
+###################################################################
+class DeadlineExceeded(Exception):
+	pass
+
+class Deadline(object):
+
+	#
+	# seconds of each run, None for no deadline
+	#
+	def __init__(self,seconds=None):
+		self.seconds=seconds
+		self.start()
+
+	def start(self):
+		self.expires=time.time() + self.seconds if self.seconds else None
+		self.expired=False
+
+	#
+	# Seconds left, None when there is no deadline
+	#
+	def remaining(self):
+		if self.expires is None:
+			return None
+		return self.expires - time.time()
+
+	def isExpired(self):
+		if not self.expired and self.expires is not None and time.time() >= self.expires:
+			self.expired=True
+		return self.expired
+
+	#
+	# (connect,read) timeouts of a call, cut to what is left of the
+	# run, raises DeadlineExceeded once it is past
+	#
+	def getTimeout(self,timeouts):
+		remaining=self.remaining()
+		if remaining is None:
+			return timeouts
+		if remaining <= 0:
+			self.expired=True
+			raise DeadlineExceeded("Run deadline of %g s passed" % self.seconds)
+		return (min(timeouts[0],remaining),min(timeouts[1],remaining))
+
+	#
+	# What to add to the result lines of a run that had calls refused
+	# or cut short by the deadline
+	#
+	def getMark(self):
+		if not self.expired:
+			return ""
+		return " INCOMPLETE, run deadline of %g s passed" % self.seconds
+
+#
+# (connect,read) timeouts in seconds from amxctrl, config is None
+# when there is no amxctrl.py
+#
+def getTimeouts(config=None):
+	connect=getattr(config,"httpConnectionTimeout",None)
+	read=getattr(config,"httpReadTimeout",connect)
+	return (connect / 1000.0 if connect else CONNECTTIMEOUT,read / 1000.0 if read else READTIMEOUT)
+
+#
+# Take the deadline option out of argv, returns the arguments left
+# for the script and the deadline, started
+#
+def deadlineSetup(argv,config=None):
+	seconds=getattr(config,"runDeadline",None)
+	rest=[]
+	idx=0
+	while idx < len(argv):
+		name,sep,value=argv[idx].partition("=")
+		idx+=1
+		if name == "--deadline":
+			if not sep and idx < len(argv):
+				# Value as the next argument
+				value=argv[idx]
+				idx+=1
+			seconds=float(value) if value else None
+		else:
+			rest.append(argv[idx - 1])
+	return (rest,Deadline(seconds))
@@ -0,0 +1,146 @@
+#!/usr/bin/python
+#
+# Threaded HTTP server for the local stand-in servers
+#
+# The stand-ins answer the calls of the scripts with synthetic data
+# so that they can be run and benchmarked without a real admin or
+# BPM server. This is what they share, the server, reading requests
+# and sending responses, injected latency and errors and a CallStats
+# of everything served, logged when the server stops.
+#
+# A handler only implements getResponse(body), it returns
+# (endpoint,action,status,body,contentType,headers).
+#
+# 19/10/2026	Created
+# 19/10/2026	Nagle off, calls on a kept connection were 40ms late
+# 19/10/2026	Capacity, calls over it wait like on a busy server
+#
+import time
+import random
+import threading
+try:
+	from BaseHTTPServer import HTTPServer,BaseHTTPRequestHandler
+	from SocketServer import ThreadingMixIn
+except ImportError:
+	from http.server import HTTPServer,BaseHTTPRequestHandler
+	from socketserver import ThreadingMixIn
+from includes.callStats import CallStats
+###################################################################
+class StubServer(ThreadingMixIn,HTTPServer):
+
+	daemon_threads=True
+	allow_reuse_address=True
+	request_queue_size=128
+
+	#
+	# latency is a function giving a delay in ms for each call, perKB
+	# ms are added for each KB of response and errorRate is the
+	# fraction of calls answered with the handler fault. Only capacity
+	# calls are served at the same time, the others wait for one of
+	# them to end, 0 for no limit.
+	#
+	def __init__(self,address,handler,logger,latency=None,perKB=0.0,errorRate=0.0,seed=1,capacity=0):
+		HTTPServer.__init__(self,address,handler)
+		self.logger=logger
+		self.latency=latency
+		self.perKB=perKB
+		self.errorRate=errorRate
+		self.rnd=random.Random(seed)
+		self.lock=threading.Lock()
+		self.slots=threading.Semaphore(capacity) if capacity > 0 else None
+		self.stats=CallStats()
+
+	def getDelay(self,responseBytes):
+		delay=self.perKB * responseBytes / 1024.0
+		if self.latency is not None:
+			with self.lock:
+				delay+=self.latency()
+		return delay / 1000.0
+
+	def isError(self):
+		if self.errorRate <= 0:
+			return False
+		with self.lock:
+			return self.rnd.random() < self.errorRate
+
+	def record(self,endpoint,action,seconds,status,requestBytes,responseBytes):
+		with self.lock:
+			self.stats.record(endpoint,action,seconds,status,requestBytes,responseBytes)
+
+class StubHandler(BaseHTTPRequestHandler):
+
+	# Keep alive, like the real servers
+	protocol_version="HTTP/1.1"
+	# Headers are written one by one, without this a client that keeps
+	# the connection waits for a delayed ACK on each call
+	disable_nagle_algorithm=True
+
+	def do_GET(self):
+		self.dispatch()
+
+	def do_POST(self):
+		self.dispatch()
+
+	def do_PUT(self):
+		self.dispatch()
+
+	def getHeader(self,name,default=""):
+		value=self.headers.get(name)
+		return default if value is None else value
+
+	def readBody(self):
+		length=int(self.getHeader("Content-Length","0") or 0)
+		return self.rfile.read(length) if length > 0 else b""
+
+	#
+	# Answer of an injected error, handlers change it to look like
+	# their server, None for calls that never fail
+	#
+	def getFault(self,endpoint,action):
+		return (500,"Injected error","text/plain")
+
+	def dispatch(self):
+		startT=time.time()
+		body=self.readBody()
+		if self.server.slots is not None:
+			self.server.slots.acquire()
+		try:
+			endpoint,action,status,response,contentType,headers=self.getResponse(body)
+			if status == 200 and self.server.isError():
+				fault=self.getFault(endpoint,action)
+				if fault is not None:
+					status,response,contentType=fault
+					headers=[]
+			if not isinstance(response,bytes):
+				response=response.encode("utf-8")
+			delay=self.server.getDelay(len(response))
+			if delay > 0:
+				time.sleep(delay)
+		finally:
+			if self.server.slots is not None:
+				self.server.slots.release()
+		self.send_response(status)
+		self.send_header("Content-Type",contentType)
+		self.send_header("Content-Length",str(len(response)))
+		for name,value in headers:
+			self.send_header(name,value)
+		self.end_headers()
+		self.wfile.write(response)
+		self.server.record(endpoint,action,time.time() - startT,status,len(body),len(response))
+
+	def log_message(self,format,*args):
+		# Not address_string(), it does a reverse lookup on Python 2
+		self.server.logger.debug(self.client_address[0] + " " + (format % args))
+
+#
+# Serve until interrupted then log what was served
+#
+def serve(server):
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+		server.logger.info("Stopped, calls served")
+		server.stats.logSummary(server.logger)
@@ -0,0 +1,118 @@
+#!/usr/bin/python
+#
+# SQLite store of parsed BPM log transactions
+#
+# Rows are keyed by log file and byte offset of the line they come
+# from, so ingesting the same part of a log twice adds nothing.
+# Times are epoch microseconds.
+#
+# 19/10/2026	Created
+#
+import sqlite3
+###################################################################
+HOUR=3600 * 1000000
+SCHEMA=[
+	"CREATE TABLE IF NOT EXISTS files (filekey TEXT PRIMARY KEY, path TEXT, resume INTEGER, ingested TEXT)",
+	"CREATE TABLE IF NOT EXISTS transactions (filekey TEXT, offset INTEGER, id TEXT, start INTEGER, end INTEGER, elapsed INTEGER, response INTEGER, operation TEXT, PRIMARY KEY (filekey, offset))",
+	"CREATE INDEX IF NOT EXISTS transactions_start ON transactions (start)",
+	"CREATE INDEX IF NOT EXISTS transactions_id ON transactions (id)",
+	"CREATE INDEX IF NOT EXISTS transactions_response ON transactions (response)",
+	"CREATE TABLE IF NOT EXISTS resets (filekey TEXT, offset INTEGER, stamp INTEGER, id TEXT, PRIMARY KEY (filekey, offset))",
+	"CREATE INDEX IF NOT EXISTS resets_stamp ON resets (stamp)",
+]
+###################################################################
+class TransactionDB(object):
+
+	def __init__(self,fileName,batchSize=5000):
+		self.conn=sqlite3.connect(fileName)
+		self.conn.execute("PRAGMA synchronous=NORMAL")
+		for sql in SCHEMA:
+			self.conn.execute(sql)
+		self.conn.commit()
+		self.batchSize=batchSize
+		self.rows=[]
+		self.resetRows=[]
+		self.inserted=0
+
+	#
+	# Offset to carry on ingesting a file from
+	#
+	def getResume(self,fileKey):
+		row=self.conn.execute("SELECT resume FROM files WHERE filekey=?",(fileKey,)).fetchone()
+		if row is None:
+			return 0
+		return row[0]
+
+	def setResume(self,fileKey,path,offset):
+		self.flush()
+		self.conn.execute("INSERT OR REPLACE INTO files VALUES (?,?,?,datetime('now'))",(fileKey,path,offset))
+		self.conn.commit()
+
+	def addTransaction(self,fileKey,offset,id,start,end,response,operation):
+		if response.isdigit():
+			response=int(response)
+		else:
+			response=0
+		self.rows.append((fileKey,offset,id,start,end,end - start,response,operation))
+		if len(self.rows) >= self.batchSize:
+			self.flush()
+
+	def addReset(self,fileKey,offset,stamp,id):
+		self.resetRows.append((fileKey,offset,stamp,id))
+		if len(self.resetRows) >= self.batchSize:
+			self.flush()
+
+	#
+	# Write buffered rows, rows already there are left as they are
+	#
+	def flush(self):
+		if self.rows:
+			before=self.conn.total_changes
+			self.conn.executemany("INSERT OR IGNORE INTO transactions VALUES (?,?,?,?,?,?,?,?)",self.rows)
+			self.inserted+=self.conn.total_changes - before
+			self.rows=[]
+		if self.resetRows:
+			self.conn.executemany("INSERT OR IGNORE INTO resets VALUES (?,?,?,?)",self.resetRows)
+			self.resetRows=[]
+		self.conn.commit()
+
+	def close(self):
+		self.flush()
+		self.conn.close()
+
+	#
+	# Queries, start and end limit the time range when set
+	#
+	def getRange(self,start,end,column="start"):
+		return (column + " >= ? AND " + column + " < ?",(start if start is not None else 0,end if end is not None else 2 ** 62))
+
+	def summary(self,start=None,end=None):
+		where,args=self.getRange(start,end)
+		return self.conn.execute("SELECT COUNT(*), SUM(response < 200 OR response >= 400), AVG(elapsed), MAX(elapsed), MIN(start), MAX(end) FROM transactions WHERE " + where,args).fetchone()
+
+	def slowest(self,count,start=None,end=None):
+		where,args=self.getRange(start,end)
+		return self.conn.execute("SELECT id, start, end, response, elapsed, operation FROM transactions WHERE " + where + " ORDER BY elapsed DESC LIMIT ?",args + (count,)).fetchall()
+
+	#
+	# (hour, transactions, errors, average, max, resets) by hour
+	#
+	def hourly(self,start=None,end=None):
+		where,args=self.getRange(start,end)
+		rows=self.conn.execute("SELECT start / ?, COUNT(*), SUM(response < 200 OR response >= 400), AVG(elapsed), MAX(elapsed) FROM transactions WHERE " + where + " GROUP BY 1 ORDER BY 1",(HOUR,) + args).fetchall()
+		where,args=self.getRange(start,end,"stamp")
+		resets=dict(self.conn.execute("SELECT stamp / ?, COUNT(*) FROM resets WHERE " + where + " GROUP BY 1",(HOUR,) + args).fetchall())
+		return [(hour * HOUR,count,errors,avg,high,resets.get(hour,0)) for hour,count,errors,avg,high in rows]
+
+	#
+	# Resets by the operation of the last transaction with the same id
+	# in the same file started before it, with how often that operation
+	# sees one in the same time range
+	#
+	def resetCorrelation(self,start=None,end=None):
+		where,args=self.getRange(start,end,"r.stamp")
+		totalWhere,totalArgs=self.getRange(start,end)
+		# Ids are reused, only the nearest transaction before the reset is its own
+		return self.conn.execute("SELECT t.operation, COUNT(*), AVG(t.elapsed), o.total FROM resets r JOIN transactions t ON t.filekey=r.filekey AND t.offset="
+			"(SELECT p.offset FROM transactions p WHERE p.filekey=r.filekey AND p.id=r.id AND p.start <= r.stamp ORDER BY p.start DESC, p.offset DESC LIMIT 1)"
+			" JOIN (SELECT operation, COUNT(*) AS total FROM transactions WHERE " + totalWhere + " GROUP BY operation) o ON o.operation=t.operation WHERE " + where + " GROUP BY t.operation ORDER BY 2 DESC",totalArgs + args).fetchall()
@@ -0,0 +1,130 @@
+#!/usr/bin/python
+#
+# Compact column store for parsed transactions
+#
+# Each transaction costs 26 bytes, start and end are epoch
+# microseconds, numeric ids are stored as integers and any other id
+# is interned once and stored as a negative index into the id table.
+# Statistics use numpy when it is installed and plain arrays if not.
+#
+# 19/10/2026	Created
+#
+from array import array
+from datetime import datetime
+import math
+try:
+	import numpy
+except ImportError:
+	numpy=None
+###################################################################
+# 'q' only exists from python 3.3, 'l' is 64 bit on linux
+try:
+	array("q")
+	INT64="q"
+except ValueError:
+	INT64="l"
+###################################################################
+#
+# Format epoch microseconds the same way str(datetime) does
+#
+def formatMicros(micros):
+	return str(datetime.utcfromtimestamp(micros // 1000000).replace(microsecond=int(micros % 1000000)))
+
+class TransactionStore(object):
+
+	def __init__(self):
+		self.ids=array(INT64)
+		self.start=array(INT64)
+		self.end=array(INT64)
+		self.response=array("h")
+		self.idTable=[]
+		self.idIndex={}
+
+	def __len__(self):
+		return len(self.start)
+
+	#
+	# Add a transaction, start and end in epoch microseconds
+	#
+	def add(self,id,start,end,response=""):
+		if id.isdigit():
+			self.ids.append(int(id))
+		else:
+			idx=self.idIndex.get(id)
+			if idx is None:
+				idx=len(self.idTable)
+				self.idTable.append(id)
+				self.idIndex[id]=idx
+			self.ids.append(-1 - idx)
+		self.start.append(start)
+		self.end.append(end)
+		if response.isdigit():
+			self.response.append(int(response))
+		else:
+			self.response.append(0)
+
+	def getId(self,i):
+		value=self.ids[i]
+		if value < 0:
+			return self.idTable[-1 - value]
+		return str(value)
+
+	#
+	# Return transaction i in the same form readFile uses
+	#
+	def row(self,i):
+		response=self.response[i]
+		return {"id":self.getId(i),"in":self.start[i],"out":self.end[i],"elapsed":self.end[i] - self.start[i],"response":str(response) if response else ""}
+
+	def __iter__(self):
+		for i in range(len(self.start)):
+			yield self.row(i)
+
+	#
+	# Elapsed microseconds for every transaction
+	#
+	def elapsed(self):
+		if numpy is not None and len(self.start) > 0:
+			dtype=numpy.dtype("i%d" % self.start.itemsize)
+			return numpy.frombuffer(self.end,dtype=dtype) - numpy.frombuffer(self.start,dtype=dtype)
+		return array(INT64,[e - s for s,e in zip(self.start,self.end)])
+
+	#
+	# Indexes of transactions taking at least minElapsed microseconds
+	#
+	def select(self,minElapsed=0):
+		if minElapsed <= 0:
+			return range(len(self.start))
+		elapsed=self.elapsed()
+		if numpy is not None:
+			return numpy.nonzero(elapsed >= minElapsed)[0].tolist()
+		return [i for i,el in enumerate(elapsed) if el >= minElapsed]
+
+	#
+	# Count of responses that are missing or not 2xx/3xx
+	#
+	def errorCount(self):
+		if numpy is not None and len(self.response) > 0:
+			codes=numpy.frombuffer(self.response,dtype=numpy.int16)
+			return int(numpy.count_nonzero((codes < 200) | (codes >= 400)))
+		return len([c for c in self.response if c < 200 or c >= 400])
+
+	def mean(self):
+		if len(self.start) == 0:
+			return 0
+		if numpy is not None:
+			return float(self.elapsed().mean())
+		return sum(self.elapsed()) / float(len(self.start))
+
+	#
+	# Exact percentiles (nearest rank) in microseconds
+	#
+	def percentiles(self,pList):
+		count=len(self.start)
+		if count == 0:
+			return [0 for p in pList]
+		if numpy is not None:
+			values=numpy.sort(self.elapsed())
+		else:
+			values=sorted(self.elapsed())
+		return [int(values[max(1,int(math.ceil(p / 100.0 * count))) - 1]) for p in pList]
@@ -0,0 +1,222 @@
+#!/usr/bin/python
+#
+# Record extractors for the admin and BPM responses
+#
+# A record is a set of fields under a repeating element, each field
+# a path of tags below it. Paths are in Clark notation, {uri}tag, so
+# they do not depend on the generated prefixes (ax2162, ax220...)
+# that change between AMX versions and between scripts. An extractor
+# compiles its paths once into a tree of tags and takes all fields
+# of a record in one pass over its children, instead of a find() for
+# each field.
+#
+#	for app in xmlExtract.VIEWAPPS.records(root):
+#		app["name"],app["state"]
+#
+# A field that is missing is None.
+#
+# Responses are parsed with fromstring(), with cElementTree on Python 2,
+# else lxml when it is installed, else ElementTree. They all give the
+# same fields. lxml parses fastest but walking its elements from Python
+# is slower, so where cElementTree is there it is quicker overall, see
+# benchParser. XMLPARSER=<backend> in the environment forces one.
+#
+#	root=xmlExtract.fromstring(response.content)
+#
+# 19/10/2026	Created
+# 19/10/2026	Parser backends, cElementTree or lxml when there
+#
+import os
+import re
+import xml.etree.ElementTree as ET
+try:
+	from lxml import etree as LXML
+except ImportError:
+	LXML=None
+try:
+	# Python 2, on 3 ElementTree is already the C one
+	import xml.etree.cElementTree as CET
+except ImportError:
+	CET=None
+###################################################################
+# Namespaces
+###################################################################
+SOAPENV="http://schemas.xmlsoap.org/soap/envelope/"
+TYPES="http://types.core.api.admin.amf.tibco.com/xsd"
+REFERENCE="http://reference.api.admin.amf.tibco.com/xsd"
+ENVSERVICE="http://env.amx.api.admin.amf.tibco.com"
+HOSTSERVICE="http://host.amx.api.admin.amf.tibco.com"
+HOSTXSD="http://host.amx.api.admin.amf.tibco.com/xsd"
+NODESERVICE="http://node.amx.api.admin.amf.tibco.com"
+NODEXSD="http://node.amx.api.admin.amf.tibco.com/xsd"
+APPSERVICE="http://application.amx.api.admin.amf.tibco.com"
+APPXSD="http://application.amx.api.admin.amf.tibco.com/xsd"
+COMPONENTXSD="http://component.amx.api.admin.amf.tibco.com/xsd"
+APPUISERVICE="http://ui.application.amx.api.admin.amf.tibco.com"
+APPUIXSD="http://ui.application.amx.api.admin.amf.tibco.com/xsd"
+DAASERVICE="http://daa.amx.api.admin.amf.tibco.com"
+DAAXSD="http://daa.amx.api.admin.amf.tibco.com/xsd"
+PROCESS="http://www.tibco.com/bx/2009/management/processManagerType"
+###################################################################
+# A tag, or * for any, each with its {uri} kept whole
+TAGS=re.compile(r"(?:\{[^}]*\})?[^/{]+")
+
+def getTags(path):
+	return TAGS.findall(path)
+
+def getBody(service,operation):
+	return "{%s}Body/{%s}%sResponse" % (SOAPENV,service,operation)
+
+###################################################################
+# Parser backends
+###################################################################
+def lxmlFromstring(text):
+	# A parser for each call, lxml parsers cannot be shared by threads
+	return LXML.fromstring(text,LXML.XMLParser(huge_tree=True,resolve_entities=False,no_network=True))
+
+BACKENDS={"ElementTree":ET.fromstring}
+if CET is not None and CET.fromstring is not ET.fromstring:
+	BACKENDS["cElementTree"]=CET.fromstring
+if LXML is not None:
+	BACKENDS["lxml"]=lxmlFromstring
+
+#
+# Available backends, fastest first
+#
+def getBackends():
+	return [name for name in ("cElementTree","lxml","ElementTree") if name in BACKENDS]
+
+def setBackend(name):
+	global BACKEND,PARSE
+	if name not in BACKENDS:
+		raise ValueError("XML parser " + name + " is not available, use one of " + ",".join(getBackends()))
+	BACKEND=name
+	PARSE=BACKENDS[name]
+
+def fromstring(text):
+	if not isinstance(text,bytes):
+		# lxml refuses text that has an encoding declaration
+		text=text.encode("utf-8")
+	return PARSE(text)
+
+BACKEND=None
+PARSE=None
+setBackend(os.environ.get("XMLPARSER") or getBackends()[0])
+
+###################################################################
+class Extractor(object):
+
+	#
+	# path leads from the root, or from the parent record, to each
+	# record element, fields are {name:path} and a field that is an
+	# Extractor gives a list of records, one for each element at its
+	# path
+	#
+	def __init__(self,path,fields):
+		self.path=[None if tag == "*" else tag for tag in getTags(path)]
+		self.fields=fields
+		self.lists=[]
+		self.tree={}
+		for name,field in fields.items():
+			if isinstance(field,Extractor):
+				self.lists.append(name)
+				self.addPath(field.path,name,field)
+			else:
+				self.addPath(getTags(field),name,None)
+
+	def addPath(self,tags,name,extractor):
+		tree=self.tree
+		node=None
+		for tag in tags:
+			node=tree.get(tag)
+			if node is None:
+				node={"fields":[],"lists":[],"children":{}}
+				tree[tag]=node
+			tree=node["children"]
+		if extractor is None:
+			node["fields"].append(name)
+		else:
+			node["lists"].append((name,extractor))
+
+	#
+	# Fields of one record element
+	#
+	def getRecord(self,elem):
+		record=dict.fromkeys(self.fields)
+		for name in self.lists:
+			record[name]=[]
+		self.fill(elem,self.tree,record)
+		return record
+
+	def fill(self,elem,tree,record):
+		for child in elem:
+			node=tree.get(child.tag)
+			if node is None:
+				continue
+			for name in node["fields"]:
+				# First one, like find()
+				if record[name] is None:
+					record[name]=child.text
+			for name,extractor in node["lists"]:
+				record[name].append(extractor.getRecord(child))
+			if node["children"]:
+				self.fill(child,node["children"],record)
+
+	def getElements(self,root):
+		elems=[root]
+		for tag in self.path:
+			elems=[child for elem in elems for child in elem if tag is None or child.tag == tag]
+		return elems
+
+	def records(self,root):
+		for elem in self.getElements(root):
+			yield self.getRecord(elem)
+
+	def first(self,root):
+		for record in self.records(root):
+			return record
+		return None
+
+###################################################################
+# Records of the admin responses
+###################################################################
+T="{%s}" % TYPES
+A="{%s}" % APPXSD
+H="{%s}" % HOSTXSD
+N="{%s}" % NODEXSD
+C="{%s}" % COMPONENTXSD
+U="{%s}" % APPUIXSD
+D="{%s}" % DAAXSD
+P="{%s}" % PROCESS
+# State of an application, in each list of them
+APPFIELDS={"id":T + "id","name":T + "name","state":A + "runtimeStateEnum","sync":A + "synchronization","version":A + "templateVersion"}
+# EnvService getAllEnv
+ENVS=Extractor(getBody(ENVSERVICE,"getAllEnv") + "/*",{"id":T + "id","name":T + "name","description":"{%s}description" % REFERENCE})
+# HostService getHostsOnMachine
+HOSTS=Extractor(getBody(HOSTSERVICE,"getHostsOnMachine") + "/*",{"name":T + "name","status":H + "singletonHost/" + H + "status",
+	"version":H + "singletonHost/" + H + "hpaFeatureVersion","machine":H + "singletonHost/" + H + "machineName","synchronized":H + "singletonHost/" + H + "synchronized"})
+# NodeService getNodesInEnvironment
+NODES=Extractor(getBody(NODESERVICE,"getNodesInEnvironment") + "/{%s}return/" % NODESERVICE + N + "nodeSummary",{"id":T + "id","name":T + "name",
+	"environment":N + "environment/" + T + "name","hostName":N + "hostName","machine":N + "machine","state":N + "state","version":N + "nodeTypeVersion","synchronized":N + "synchronized"})
+# ApplicationService getApplicationRollupDetails
+COMPONENTS=Extractor(getBody(APPSERVICE,"getApplicationRollupDetails") + "/{%s}return/" % APPSERVICE + A + "componentRollupDetails",{"actionStatus":C + "actionStatus",
+	"node":C + "nodeId/" + T + "name","componentPath":C + "componentPath","state":C + "state","version":C + "componentVersion"})
+# ApplicationService getApplicationViewDetails, top level folders and applications
+VIEWFOLDERS=Extractor(getBody(APPSERVICE,"getApplicationViewDetails") + "/{%s}return/" % APPSERVICE + A + "appFolderDesc",{"id":T + "id","name":T + "name"})
+VIEWAPPS=Extractor(getBody(APPSERVICE,"getApplicationViewDetails") + "/{%s}return/" % APPSERVICE + A + "appDesc",APPFIELDS)
+# ApplicationUIService getAppFolderView, folders and applications in a folder
+FOLDERFOLDERS=Extractor(getBody(APPUISERVICE,"getAppFolderView") + "/{%s}return/" % APPUISERVICE + U + "folders",{"id":T + "id","name":T + "name","path":T + "path"})
+FOLDERAPPS=Extractor(getBody(APPUISERVICE,"getAppFolderView") + "/{%s}return/" % APPUISERVICE + U + "applications",APPFIELDS)
+# ApplicationService getApplicationsMappedToNode
+MAPPEDAPPS=Extractor(getBody(APPSERVICE,"getApplicationsMappedToNode") + "/*",{"id":T + "id","name":T + "name"})
+# ApplicationService getApplicationSummaryById, nodeStates has the state on each node
+APPSUMMARY=Extractor(getBody(APPSERVICE,"getApplicationSummaryById") + "/{%s}return" % APPSERVICE,{"state":A + "runtimeStateEnum","folder":A + "folder/" + T + "name",
+	"version":A + "templateVersion","sync":A + "synchronization","nodeStates":Extractor(A + "runtimeStateDetails",{"node":A + "node","state":A + "state"})})
+# DAAService getAllUploadedDAA and deleteDAAS
+DAAS=Extractor(getBody(DAASERVICE,"getAllUploadedDAA") + "/*",{"id":D + "daaId","fileName":D + "daaFileName","used":D + "used","template":D + "applicationTemplateIdVersion"})
+DAADELETED=Extractor(getBody(DAASERVICE,"deleteDAAS") + "/*",{"summary":T + "summary"})
+###################################################################
+# Records of the BPM REST responses
+###################################################################
+# Halted instance query
+HALTED=Extractor(P + "processInstances/" + P + "processInstance",{"id":P + "id","template":P + "processQName/" + P + "processName"})
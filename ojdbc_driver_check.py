@@ -8,6 +8,8 @@
 #
 #################################################################
 # 20/10/2022	1.0		Created (copied from appStatus.py)
+# 19/10/2026	1.1		Streamed parse, components from a list or a regex
+# 19/10/2026	1.2		Fleet mode, many files in a process pool with a result cache
 #################################################################
 from time import time
 import sys
@@ -16,6 +18,11 @@ import getopt
 import signal
 import datetime
 import logging
+import re
+import glob
+import json
+import hashlib
+import multiprocessing
 import xml.etree.ElementTree as ET
 from includes import includeFunctions
 #################################################################
@@ -48,12 +55,148 @@ def doHelp():
 	print
 	print("--help -h            This Page")
 	print("--file,-f            The xmi file to use")
+	print("--component,-c       Comma separated list of component ids, default " + ORACLEJDBC)
+	print("--regex,-r           Regex the component ids must match, instead of a list")
+	print("--all,-a             Every release unit")
+	print
+	print("Fleet mode, a version matrix for many xmi files")
+	print("--fleet,-F <glob>    Xmi files matching the glob, can be given more than once")
+	print("--list,-l <file>     Xmi files listed in a file, one per line")
+	print("--processes,-p <n>   Files parsed at the same time, default number of cpus")
+	print("--cache,-C <file>    Release units cache, default " + CACHEFILE)
+	print("                     Files with the same mtime and size, or hash, are not parsed again")
+	print
+
+#################################################################
+# Yield (componentID,version) of the release units in an xmi file
+# that match. The file is parsed as a stream, each element is
+# dropped from its parent once it has ended so memory does not
+# depend on the size of the file.
+#################################################################
+def getReleaseUnits(fileName,match):
+	stack=[]
+	for event,elem in ET.iterparse(fileName,events=("start","end")):
+		if event == "start":
+			stack.append(elem)
+			continue
+		stack.pop()
+		# Tags are not namespaced in machine.xmi but allow for it
+		tag=elem.tag.rpartition("}")[2]
+		if tag == "releaseUnits" and stack and stack[-1].tag.rpartition("}")[2] == "installations":
+			componentID=elem.attrib.get("componentID")
+			version=elem.attrib.get("version")
+			if componentID is not None and version is not None and match(componentID):
+				yield (componentID,version)
+		if stack:
+			stack[-1].remove(elem)
+		elem.clear()
+
+#################################################################
+# sha1 of a file read in blocks
+#################################################################
+def getFileHash(fileName):
+	sha=hashlib.sha1()
+	with open(fileName,"rb") as f:
+		while True:
+			block=f.read(1048576)
+			if not block:
+				break
+			sha.update(block)
+	return sha.hexdigest()
+
+def matchAll(componentID):
+	return True
+
+#################################################################
+# Fleet worker, returns the cache entry of a file with every release
+# unit in it. units is None when the hash is knownHash, the units
+# already cached are still good then.
+#################################################################
+def scanFleetFile(args):
+	fileName,knownHash=args
+	try:
+		st=os.stat(fileName)
+		entry={"mtime":st.st_mtime,"size":st.st_size,"sha1":getFileHash(fileName),"units":None}
+		if entry["sha1"] != knownHash:
+			entry["units"]=list(getReleaseUnits(fileName,matchAll))
+		return (fileName,entry,None)
+	except Exception as ex:
+		return (fileName,None,str(ex))
+
+#################################################################
+# Release units of every file in the fleet, as a list of
+# (fileName,units,status). Files are only parsed when the cache
+# does not already have them.
+#################################################################
+def scanFleet(files,cacheFile,processes):
+	cache={}
+	if os.path.exists(cacheFile):
+		try:
+			with open(cacheFile) as f:
+				cache=json.load(f)
+		except Exception as ex:
+			thisLogger.warning("Ignoring cache " + cacheFile + ", " + str(ex))
+	results={}
+	todo=[]
+	for fileName in files:
+		cached=cache.get(fileName)
+		try:
+			st=os.stat(fileName)
+		except OSError as ex:
+			results[fileName]=(None,"error " + str(ex))
+			continue
+		if cached is not None and cached["mtime"] == st.st_mtime and cached["size"] == st.st_size:
+			results[fileName]=(cached["units"],"cached")
+		else:
+			todo.append((fileName,cached["sha1"] if cached is not None else None))
+	if todo:
+		pool=multiprocessing.Pool(max(1,min(processes,len(todo))))
+		try:
+			for fileName,entry,error in pool.imap_unordered(scanFleetFile,todo):
+				if entry is None:
+					results[fileName]=(None,"error " + error)
+					continue
+				if entry["units"] is None:
+					entry["units"]=cache[fileName]["units"]
+					status="unchanged"
+				else:
+					status="parsed"
+				cache[fileName]=entry
+				results[fileName]=(entry["units"],status)
+		finally:
+			pool.close()
+			pool.join()
+		with open(cacheFile,"w") as f:
+			json.dump(cache,f)
+	return [(fileName,results[fileName][0],results[fileName][1]) for fileName in files]
 
+#################################################################
+# Print components against machines, Mn are the files in order
+#################################################################
+def printFleet(fleet,match):
+	includeFunctions.logHeader("%-4s %-10s %s" % ("","Status","Xmi File"))
+	versions={}
+	for idx,(fileName,units,status) in enumerate(fleet):
+		thisLogger.info("%-4s %-10s %s" % ("M" + str(idx + 1),status,fileName))
+		for componentID,version in units or []:
+			if match(componentID):
+				byFile=versions.setdefault(componentID,{})
+				if version not in byFile.setdefault(idx,[]):
+					byFile[idx].append(version)
+	thisLogger.info("")
+	rows=[[componentID] + ["/".join(versions[componentID].get(idx,["-"])) for idx in range(len(fleet))] for componentID in sorted(versions)]
+	width=max([len(cell) for row in rows for cell in row[1:]] + [3]) + 2
+	head="%-50s" + ("%-" + str(width) + "s") * len(fleet)
+	includeFunctions.logHeader(head % tuple(["Component Id"] + ["M" + str(idx + 1) for idx in range(len(fleet))]))
+	for row in rows:
+		thisLogger.info(head % tuple(row))
+	thisLogger.info("")
+	thisLogger.info("Components       : " + str(len(versions)))
 
 #################################################################
 # START HERE
 #################################################################
-VERSION="1.0"
+VERSION="1.2"
 #
 SCRIPTNAME=os.path.basename(__file__)
 DIRNAME=os.path.dirname(__file__)
@@ -69,6 +212,8 @@ else:
 	print("Cannot find amxctrl.py, using defaults")
 	cfgFile=False
 
+ORACLEJDBC="com.tibco.tpshell.oracle.jdbc.feature"
+CACHEFILE="ojdbc_driver_check.cache"
 LINEC=95
 LINE=("=" * LINEC)
 #################################################################
@@ -83,12 +228,19 @@ if __name__ == '__main__':
 	#
 	argv=sys.argv[1:]
 	try:	
-		opts,args=getopt.getopt(argv,"hf:",["help","file"])
+		opts,args=getopt.getopt(argv,"hf:c:r:aF:l:p:C:",["help","file=","component=","regex=","all","fleet=","list=","processes=","cache="])
 	except:
 		doHelp()
 		exit(1)	
 	#
 	XMIFILE="/produits/tibco/amx_home/tools/machinemodel/shared/1.0.0/machine.xmi"
+	components=[ORACLEJDBC]
+	componentRegex=None
+	allUnits=False
+	fleetFiles=[]
+	fleetMode=False
+	processes=multiprocessing.cpu_count()
+	cacheFile=CACHEFILE
 	#
 	for opt, arg in opts:
 		if opt == '-h':
@@ -96,45 +248,81 @@ if __name__ == '__main__':
 			sys.exit()
 		elif opt in ("-f","--file"):
 			XMIFILE=arg
+		elif opt in ("-c","--component"):
+			components=[c.strip() for c in arg.split(",") if c.strip()]
+		elif opt in ("-r","--regex"):
+			componentRegex=arg
+		elif opt in ("-a","--all"):
+			allUnits=True
+		elif opt in ("-F","--fleet"):
+			fleetMode=True
+			fleetFiles.extend(sorted(glob.glob(arg)))
+		elif opt in ("-l","--list"):
+			fleetMode=True
+			try:
+				with open(arg) as f:
+					fleetFiles.extend([line.strip() for line in f if line.strip() and not line.startswith("#")])
+			except IOError as ex:
+				print("Cannot read " + arg + ", " + str(ex))
+				exit(1)
+		elif opt in ("-p","--processes"):
+			processes=int(arg)
+		elif opt in ("-C","--cache"):
+			cacheFile=arg
 
 	#
 	now = datetime.datetime.now()
 	thisLogger.info(LINE)
 	thisLogger.info(SCRIPTNAME + " " + VERSION + " " + now.strftime("%Y-%m-%d %H:%M:%S"))
 	thisLogger.info(LINE)
-	thisLogger.info("Machine XMI File : " + XMIFILE)
+	if fleetMode:
+		# Same file from a glob and a list only once, keeping the order
+		seen=set()
+		fleetFiles=[fileName for fileName in fleetFiles if not (fileName in seen or seen.add(fileName))]
+		thisLogger.info("Machine XMI Files: " + str(len(fleetFiles)))
+	else:
+		thisLogger.info("Machine XMI File : " + XMIFILE)
+	if allUnits:
+		match=lambda componentID: True
+		thisLogger.info("Components       : all")
+	elif componentRegex is not None:
+		try:
+			match=re.compile(componentRegex).search
+		except re.error as ex:
+			thisLogger.error("Invalid regex " + componentRegex + ", " + str(ex))
+			exit(1)
+		thisLogger.info("Components       : matching " + componentRegex)
+	else:
+		wanted=set(components)
+		match=lambda componentID: componentID in wanted
+		thisLogger.info("Components       : " + ",".join(components))
 	thisLogger.info("")
 	#
-	if os.path.exists(XMIFILE):
-		try:
-			with open(XMIFILE) as xmif:
-				machineXMI=xmif.read()
-		except Exception as ex:
-			thisLogger.error("Error trying to read " +XMIFILE+", "+str(ex))
-			exit(1)	
+	if fleetMode:
+		if not fleetFiles:
+			thisLogger.error("No xmi files found")
+			exit(1)
+		printFleet(scanFleet(fleetFiles,cacheFile,processes),match)
+		thisLogger.info("")
+		includeFunctions.logHeader("The End")
+		sys.exit()
 
-	else:
+	if not os.path.exists(XMIFILE):
 		thisLogger.error("The file " + XMIFILE + " does not exist")
 		exit(1)	
 
-	root=ET.fromstring(machineXMI)
-	mm_ns={ "machinemodel":"http://xsd.tns.tibco.com/corona/models/installation/machinemodel"}
-	# Get all releaseUnits with a given component type
-	releaseUnits=root.findall('./installations/releaseUnits[@componentID="com.tibco.tpshell.oracle.jdbc.feature"]')
-	#
 	head="%-50s%-30s"
 	includeFunctions.logHeader(head % ("Component Id","Version"))
-	for releaseUnit in releaseUnits:
-		version=None
-		componentID=None
-		if "version" in releaseUnit.attrib:
-			version=releaseUnit.attrib["version"]
-
-		if "componentID" in releaseUnit.attrib:
-			componentID=releaseUnit.attrib["componentID"]
-
-		if componentID is not None and version is not None:
+	count=0
+	try:
+		for componentID,version in getReleaseUnits(XMIFILE,match):
 			thisLogger.info(head % (componentID,version))
+			count+=1
+	except Exception as ex:
+		thisLogger.error("Error trying to read " +XMIFILE+", "+str(ex))
+		exit(1)	
 	
+	thisLogger.info("")
+	thisLogger.info("Release units    : " + str(count))
 	thisLogger.info("")
 	includeFunctions.logHeader("The End")
\ No newline at end of file
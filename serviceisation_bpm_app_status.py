@@ -5,14 +5,15 @@
 #
 from __future__ import print_function
 import timeit
-import requests
 import sys
 import getopt
 import os
-import xml.etree.ElementTree as ET
-
-
-from requests.auth import HTTPBasicAuth
+import atexit
+import logging
+from includes.callStats import CallStats
+from includes import xmlExtract
+from includes import adminClient
+from includes import runDeadline
 
 
 #################################################################
@@ -52,18 +53,7 @@ def progressBar(iterable, prefix = '', suffix = '', decimals = 1, length = 100,
 # Call amx admin and get response
 #################################################################
 def do_call(endpoint, action, payload, content="text/xml"):
-    url = AMXADMINURL + "/amxadministrator.httpbasic/services/" + endpoint
-    headers = {'content-type': content, "SOAPAction": "urn:" + action}
-    # body="""<soapenv:Envelope xmlns:soapenv="http://schemas.xmlsoap.org/soap/envelope/"
-    # xmlns:app="http://application.amx.api.admin.amf.tibco.com"
-    # xmlns:xsd="http://types.core.api.admin.amf.tibco.com/xsd"> <soapenv:Header/> <soapenv:Body>""" + body +
-    # "</soapenv:Body></soapenv:Envelope>"
-    try:
-        response = requests.post(url, data=payload, headers=headers, auth=HTTPBasicAuth(AMXADMINUSER, AMXADMINPASSWD))
-        return response.content
-    except Exception as rex:
-        print ('Error calling ' + url + ' ' + str(rex))
-        return None
+    return CLIENT.call(endpoint, action, payload, content)
 
 
 #################################################################
@@ -99,17 +89,32 @@ def do_env_call(action, msg_body):
 
 
 #################################################################
-# Setup namespace dictionaries
+# Get the state of an application on the node, None if it is
+# ignored, this runs on a worker of the client pipeline
 #################################################################
-ns_apps = {"ax2161": "http://application.amx.api.admin.amf.tibco.com/xsd",
-           "ax2162": "http://types.core.api.admin.amf.tibco.com/xsd",
-           "ax2164": "http://application.amx.api.admin.amf.tibco.com/xsd",
-           "soapenv": "http://schemas.xmlsoap.org/soap/envelope/",
-           "ns": "http://application.amx.api.admin.amf.tibco.com"}
-ns_env = {"soapenv": "http://schemas.xmlsoap.org/soap/envelope/", "ns": "http://env.amx.api.admin.amf.tibco.com",
-          "ax277": "http://types.core.api.admin.amf.tibco.com/xsd"}
-ns_node = {"soapenv": "http://schemas.xmlsoap.org/soap/envelope/", "ns": "http://node.amx.api.admin.amf.tibco.com",
-           "ax219": "http://types.core.api.admin.amf.tibco.com/xsd", "ax226": "http://node.amx.api.admin.amf.tibco.com"}
+def get_app_status(app):
+    app_id = app["id"]
+    app_name = app["name"]
+    if app_id is None or app_name == 'amx.bpm.apacheds' or app_name == 'com.tibco.amx.platform':
+        return None
+    body = "<app:getApplicationSummaryById><app:applicationId><xsd:id>" + app_id + "</xsd:id></app:applicationId" \
+                                                                                  "></app" \
+                                                                                  ":getApplicationSummaryById> "
+    app_info = do_app_call("getApplicationSummaryById", body)
+    if app_info is None:
+        return 'UNKNOWN'
+    summary = xmlExtract.APPSUMMARY.first(xmlExtract.fromstring(app_info))
+    if summary is None:
+        return 'UNKNOWN'
+    # State on this node, else the state of the application
+    status = summary["state"]
+    for nodeState in summary["nodeStates"]:
+        if nodeState["node"] == nodeName:
+            status = nodeState["state"]
+            break
+    return status.upper()
+
+
 #################################################################
 # Admin Details
 #################################################################
@@ -126,11 +131,17 @@ stopped = []
 incomplete = []
 ignored = []
 apps = []
+# Latency of each admin call, written as JSON when the script exits
+CALLSTATS = CallStats()
+atexit.register(CALLSTATS.writeJSON, os.path.basename(__file__).replace(".py", ".calls.json"))
+CLIENT = None
+DEADLINE = None
 
 if __name__ == '__main__':
     short_options = "a:u:p:n:"
     long_options = ["admin_url=", "user=", "pwd=", "node"]
-    argument_list = sys.argv[1:]
+    # --deadline <seconds> bounds the whole check
+    argument_list, DEADLINE = runDeadline.deadlineSetup(sys.argv[1:])
 
     try:
         options, remainder = getopt.getopt(argument_list, short_options, long_options)
@@ -152,6 +163,11 @@ if __name__ == '__main__':
         print ('ERROR: ' + str(err))
         sys.exit(1)
 
+    # Errors of the admin calls on the console, as they were printed
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    CLIENT = adminClient.AdminClient(AMXADMINURL + "/amxadministrator", AMXADMINUSER, AMXADMINPASSWD, callStats=CALLSTATS, basicAuth=True,
+                                     timeouts=runDeadline.getTimeouts(), deadline=DEADLINE)
+
 #
 # Get BPM Environment, assume containe 'BPM'
 #
@@ -159,11 +175,10 @@ try:
     envInfo = do_env_call("getAllEnv", "")
 
     if envInfo is not None:
-        root = ET.fromstring(envInfo)
-        for env in root.findall("./soapenv:Body/ns:getAllEnvResponse/", ns_env):
-            name = env.find("./ax277:name", ns_env).text
-            if "BPM" in name:
-                envId = env.find("./ax277:id", ns_env).text
+        root = xmlExtract.fromstring(envInfo)
+        for env in xmlExtract.ENVS.records(root):
+            if "BPM" in env["name"]:
+                envId = env["id"]
     else:
         print ('no BPM Env Info')
     #
@@ -182,13 +197,12 @@ try:
                                                                                     ":getNodesInEnvironment> "
         nodeInfo = do_node_call("getNodesInEnvironment", body)
         if nodeInfo is not None:
-            root = ET.fromstring(nodeInfo)
-            for node in root.findall("./soapenv:Body/ns:getNodesInEnvironmentResponse/ns:return/", ns_node):
-                if "nodeSummary" in node.tag:
-                    nodeName = node.find("./ax219:name", ns_node).text
-                    nodeId = node.find("./ax219:id", ns_node).text
-                    if nodeName == AMXBPMNODE:
-                        break
+            root = xmlExtract.fromstring(nodeInfo)
+            for node in xmlExtract.NODES.records(root):
+                nodeName = node["name"]
+                nodeId = node["id"]
+                if nodeName == AMXBPMNODE:
+                    break
     #
     # Get id of amx.bpm.app
     # from list of apps on node
@@ -197,48 +211,32 @@ try:
                                                                                   ":getApplicationsMappedToNode> "
         appList = do_app_call("getApplicationsMappedToNode", body)
         if appList is not None:
-            root = ET.fromstring(appList)
+            root = xmlExtract.fromstring(appList)
             # app = root.find(
             #     './soapenv:Body/ns:getApplicationsMappedToNodeResponse/ns:return[ax2162:name="amx.bpm.app"]',
             #     ns_apps)
-            apps = root.findall(
-                './soapenv:Body/ns:getApplicationsMappedToNodeResponse/ns:return',
-                ns_apps)
+            apps = list(xmlExtract.MAPPEDAPPS.records(root))
 
             if apps is not None:
                 print ('{}{}{}'.format('Found ',len(apps),' apps to check'))
                 init_time = timeit.default_timer()
+                statuses = CLIENT.pipeline(apps, get_app_status)
                 for app in progressBar(apps, prefix = 'Progress:', suffix = 'Complete', length = 50, start_time = init_time):
                 # for app in apps:
-                    if app is not None:
-                        # Get App Status
-                        app_id = app.find("./ax2162:id", ns_apps).text
-                        app_name = app.find("./ax2162:name", ns_apps).text
-
-                        if app_id is not None and app_name != 'amx.bpm.apacheds' and app_name != 'com.tibco.amx.platform':
-                            body = "<app:getApplicationSummaryById><app:applicationId><xsd:id>" + app_id + "</xsd:id></app:applicationId" \
-                                                                                                          "></app" \
-                                                                                                          ":getApplicationSummaryById> "
-                            app_info = do_app_call("getApplicationSummaryById", body)
-
-                            if app_info is not None:
-                                root = ET.fromstring(app_info)
-
+                    # Get App Status
+                    app_name = app["name"]
+                    status = next(statuses)
 
-                            st = root.find('./soapenv:Body/ns:getApplicationSummaryByIdResponse/ns:return/ax2164:runtimeStateDetails[ax2164:node="'+nodeName+'"]/ax2164:state', ns_apps)
-                            if st is None:
-                                st = root.find('./soapenv:Body/ns:getApplicationSummaryByIdResponse/ns:return/ax2164:runtimeStateEnum', ns_apps)
-                            status = st.text.upper()
-
-                            if status == 'RUNNING':
-                                running.append(app_name)
-                            else:
-                                if status == 'STOPPED':
-                                    stopped.append(app_name)
-                                else:
-                                    incomplete.append(app_name)
+                    if status is not None:
+                        if status == 'RUNNING':
+                            running.append(app_name)
                         else:
-                            ignored.append(app_name)
+                            if status == 'STOPPED':
+                                stopped.append(app_name)
+                            else:
+                                incomplete.append(app_name)
+                    else:
+                        ignored.append(app_name)
                 print ('running: %d stopped: %d incomplete: %d ignored: %d' % (len(running), len(stopped), len(incomplete), len(ignored)))
         else:
             print ('NO APPS')
@@ -249,6 +247,8 @@ try:
                 error_message = error_message + "\nStopped application: "+app
             for app in incomplete:
                 error_message = error_message + "\nIncomplete application: "+app
+            if DEADLINE.getMark():
+                error_message = error_message + "\nRun deadline passed, states not all known"
             sys.exit(error_message)
         else:
             print ('BPM node ready for application use')